@@ -1,9 +1,30 @@
+import html
+
 import streamlit as st
 import pandas as pd
 import altair as alt
 
-from nlp.report_builder import build_report
-from nlp.loaders import load_job_embeddings, load_company_embeddings
+from nlp.report_builder import (
+    iter_report_sections,
+    preview_fit_scores,
+    ANALYSIS_PROFILES,
+    DEFAULT_PROFILE,
+)
+from nlp.incremental import AnalysisState
+from nlp.recommendation import score_companies
+from nlp.job_graph import similar_jobs
+from nlp.keyword_catalog import rank_jobs_by_coverage
+from nlp.sparse_index import hybrid_search
+from nlp.similarity import l2_normalize
+from nlp.embedding import get_sbert_model, static_model_available
+from nlp.artifacts import generation, start_artifact_watcher
+from nlp.loaders import (
+    load_job_meta,
+    load_company_meta,
+    build_job_tree,
+    load_job_index,
+    load_company_index,
+)
 
 
 # 페이지 설정
@@ -19,24 +40,32 @@ st.markdown(
 
 
 # 데이터 로드 (캐싱)
-@st.cache_data
-def load_data():
-    return load_job_embeddings(), load_company_embeddings()
-
-
-jobs, companies = load_data()
-
-
-# 직무 필터링 구조 생성
-job_tree = {}
-
-for job_cd, job in jobs.items():
-    top = job.get("top_nm", "기타")
-    mid = job.get("aptit_name", "기타")
-
-    job_tree.setdefault(top, {})
-    job_tree[top].setdefault(mid, [])
-    job_tree[top][mid].append(job_cd)
+# cache_resource는 pickle/복사 없이 같은 객체를 모든 rerun·세션이 공유한다.
+# max_entries=1: version이 바뀌면 이전 카탈로그는 버린다 (버전별로 쌓이지 않도록)
+@st.cache_resource(max_entries=1)
+def load_catalog(version):
+    """
+    드롭다운용 메타데이터와 미리 만든 직무 트리 (임베딩 제외).
+    version(artifacts.generation)이 바뀌면 (야간 빌드 재게시, online_store 추가) 다시 만든다.
+    version은 watcher 스레드가 올리는 카운터라 rerun마다 파일을 읽지 않는다.
+    """
+    jobs = load_job_meta()
+    return jobs, build_job_tree(jobs), load_company_meta()
+
+
+@st.cache_resource
+def load_resources():
+    """
+    SBERT 모델과 직무/기업 벡터 인덱스 (프로세스 당 1회 로드).
+    data 디렉터리 감시 스레드도 여기서 한 번 시작 → 산출물이 다시 게시되면
+    백그라운드에서 새로 로드한 뒤 참조만 교체 (재시작 불필요)
+    """
+    start_artifact_watcher()
+    return get_sbert_model(), load_job_index(), load_company_index()
+
+
+load_resources()
+jobs, job_tree, companies = load_catalog(generation())
 
 
 # UI: 직무 선택
@@ -60,6 +89,16 @@ with col3:
         format_func=lambda x: jobs[x]["job_nm"]
     )
 
+# 미리 계산한 직무 이웃 그래프에서 조회 (O(K))
+related = [r for r in similar_jobs(job_id, k=5) if r["job_id"] in jobs]
+if related:
+    st.caption(
+        "비슷한 직무: " + ", ".join(jobs[r["job_id"]]["job_nm"] for r in related)
+    )
+
+recommend_jobs = st.checkbox("분석 후 전체 직무와 키워드 커버리지 비교", value=False)
+search_jobs = st.checkbox("분석 후 자기소개서와 가까운 직무 검색 (용어 + 의미)", value=False)
+
 
 # UI: 기업 선택
 st.subheader("기업 선택")
@@ -70,6 +109,12 @@ company_id = st.selectbox(
     format_func=lambda x: companies[x]["company_name"]
 )
 
+compare_ids = st.multiselect(
+    "함께 비교할 기업 (선택)",
+    [cid for cid in companies.keys() if cid != company_id],
+    format_func=lambda x: companies[x]["company_name"]
+)
+
 
 # 자기소개서 입력
 st.subheader("자기소개서 입력")
@@ -81,43 +126,38 @@ essay_text = st.text_area(
 )
 
 
-# 분석 실행
-st.markdown("---")
-
-if st.button("분석하기"):
-    if not essay_text.strip():
-        st.warning("자기소개서를 입력해주세요.")
-        st.stop()
-
-    with st.spinner("자기소개서를 분석 중입니다..."):
-        report = build_report(
-            essay_text=essay_text,
-            job_id=job_id,
-            company_id=company_id
-        )
+# 실시간 미리보기 (정적 임베딩 근사치, 입력이 바뀔 때마다 갱신)
+if static_model_available() and st.toggle("실시간 적합도 미리보기", value=True):
+    preview = preview_fit_scores(essay_text, job_id, company_id) if essay_text.strip() else None
 
-    st.success("분석 완료")
-    st.markdown("---")
+    if preview is not None:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("직무 적합도 (미리보기)", f"{preview['job_fit']}점")
+        with col2:
+            st.metric("기업 적합도 (미리보기)", f"{preview['company_fit']}점")
+        st.caption("미리보기는 경량 인코더로 계산한 근사치입니다. 정확한 결과는 '분석하기'를 눌러 확인하세요.")
 
-# 전체 요약 (점수만 컬럼)
-st.subheader("전체 분석 요약")
 
-sim = report["similarity"]
+# 섹션별 렌더링
+def render_similarity(sim):
+    # 전체 요약 (점수만 컬럼)
+    st.subheader("전체 분석 요약")
 
-col1, col2 = st.columns(2)
+    col1, col2 = st.columns(2)
 
-with col1:
-    st.metric("직무 적합도", f"{sim['job_fit']}점")
+    with col1:
+        st.metric("직무 적합도", f"{sim['job_fit']}점")
 
-with col2:
-    st.metric("기업 적합도", f"{sim['company_fit']}점")
+    with col2:
+        st.metric("기업 적합도", f"{sim['company_fit']}점")
 
-if sim["job_fit"] >= 70:
-    st.success("지원 직무와 매우 잘 맞는 경험이 드러납니다.")
-elif sim["job_fit"] >= 50:
-    st.info("직무와 연결되는 경험은 있으나 핵심 역량 표현이 부족합니다.")
-else:
-    st.warning("직무 요구 역량과의 연결성이 낮아 보완이 필요합니다.")
+    if sim["job_fit"] >= 70:
+        st.success("지원 직무와 매우 잘 맞는 경험이 드러납니다.")
+    elif sim["job_fit"] >= 50:
+        st.info("직무와 연결되는 경험은 있으나 핵심 역량 표현이 부족합니다.")
+    else:
+        st.warning("직무 요구 역량과의 연결성이 낮아 보완이 필요합니다.")
 
     #  직무·기업 적합도 해석
     st.subheader("직무·기업 적합도 해석")
@@ -133,10 +173,14 @@ else:
     )
 
 
+def render_keyword_coverage(kc):
     #  직무 핵심 역량 커버리지
     st.subheader("직무 핵심 역량 커버리지")
 
-    kc = report["keyword_coverage"]
+    if not kc:
+        st.info("키워드 커버리지를 계산할 수 없습니다.")
+        return
+
     group_cov = kc["group_coverage"]
 
     df = pd.DataFrame({
@@ -174,26 +218,51 @@ else:
     for rec in kc.get("recommended_phrases", [])[:5]:
         st.write("•", rec)
 
+    if kc.get("highlights"):
+        st.write("본문에 직접 등장한 핵심 키워드:")
+        for item in kc["highlights"]:
+            st.markdown(highlight_spans(item["sentence"], item["spans"]), unsafe_allow_html=True)
+
+
+def highlight_spans(sentence, spans):
+    """[start, end, keyword] span을 <mark>로 감싼 HTML (겹치는 span은 앞의 것 우선)"""
+    parts = []
+    cursor = 0
+    for start, end, _ in sorted(spans):
+        if start < cursor:
+            continue
+        parts.append(html.escape(sentence[cursor:start]))
+        parts.append(f"<mark>{html.escape(sentence[start:end])}</mark>")
+        cursor = end
+    parts.append(html.escape(sentence[cursor:]))
+    return "- " + "".join(parts)
+
 
+def render_repetition(rep):
     #  반복 표현 분석
     st.subheader("반복 표현 분석")
 
-    rep = report["repetition"]
-
     if rep["repeated_words"]:
         st.write("반복 사용된 단어:")
         for w, c in rep["repeated_words"].items():
             st.write(f"- '{w}' : {c}회")
 
+    if rep.get("semantic_duplicates"):
+        st.write("의미가 겹치는 문장:")
+        for cluster in rep["semantic_duplicates"]:
+            st.write(f"- (유사도 {cluster['max_similarity']})")
+            for sent in cluster["sentences"]:
+                st.write(f"    - {sent}")
+
     st.write("문장 스타일 개선 제안:")
     for s in rep["suggestions"]:
         st.write("•", s)
 
 
+def render_star(star):
     #  STAR 구조 분석
     st.subheader("STAR 구조 분석")
 
-    star = report["star_analysis"]
     count = {"S": 0, "T": 0, "A": 0, "R": 0}
 
     for _, label in star:
@@ -217,4 +286,177 @@ else:
 
     st.write("문장별 분석:")
     for sent, label in star:
-        st.write(f"[{label}] {sent}")
\ No newline at end of file
+        st.write(f"[{label}] {sent}")
+
+
+def render_company_comparison(ranked):
+    #  기업별 적합도 비교
+    st.subheader("기업별 적합도 비교")
+
+    df = pd.DataFrame({
+        "기업": [companies[r["company_id"]]["company_name"] for r in ranked],
+        "기업 적합도": [r["company_fit"] for r in ranked],
+    })
+
+    chart = (
+        alt.Chart(df)
+        .mark_bar()
+        .encode(
+            y=alt.Y("기업", sort=None),
+            x=alt.X("기업 적합도", scale=alt.Scale(domain=[0, 100])),
+            tooltip=["기업 적합도"]
+        )
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+    for r in ranked:
+        with st.expander(f"{r['rank']}위 {companies[r['company_id']]['company_name']} ({r['company_fit']}점)"):
+            st.write("근거 문장:")
+            for ev in r["evidence"]:
+                st.write(f"- {ev['sentence']} (유사도 {ev['similarity']})")
+
+
+def render_job_ranking(ranked):
+    #  키워드 커버리지가 높은 직무 (카탈로그 전체)
+    st.subheader("키워드 커버리지가 높은 직무")
+
+    ranked = [r for r in ranked if r["job_id"] in jobs]
+    if not ranked:
+        st.caption("키워드 카탈로그가 준비되지 않아 직무 비교를 건너뛰었습니다.")
+        return
+
+    df = pd.DataFrame({
+        "직무": [jobs[r["job_id"]]["job_nm"] for r in ranked],
+        "키워드 커버리지": [r["coverage_score"] for r in ranked],
+    })
+
+    chart = (
+        alt.Chart(df)
+        .mark_bar()
+        .encode(
+            y=alt.Y("직무", sort=None),
+            x=alt.X("키워드 커버리지", scale=alt.Scale(domain=[0, 100])),
+            tooltip=["키워드 커버리지"]
+        )
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+    for r in ranked:
+        with st.expander(f"{r['rank']}위 {jobs[r['job_id']]['job_nm']} ({r['coverage_score']}%)"):
+            for group, cov in r["group_coverage"].items():
+                st.write(f"- {group}: {cov}%")
+            if r["top_missing"]:
+                st.write("부족한 키워드: " + ", ".join(r["top_missing"]))
+
+
+def render_job_search(results):
+    #  BM25 + dense 하이브리드 직무 검색 (점수에 기여한 용어 포함)
+    st.subheader("자기소개서와 가까운 직무")
+
+    results = [r for r in results if r["job_id"] in jobs]
+    if not results:
+        st.caption("검색된 직무가 없습니다.")
+        return
+
+    for r in results:
+        dense = "" if r["dense"] is None else f", 의미 유사도 {r['dense']}"
+        with st.expander(f"{r['rank']}위 {jobs[r['job_id']]['job_nm']} (점수 {r['score']}{dense})"):
+            if r["terms"]:
+                st.write("일치한 용어: " + ", ".join(
+                    f"{t['term']} ({t['contribution']})" for t in r["terms"]
+                ))
+
+
+# 화면에 그릴 섹션 (적합도 → 커버리지 → 반복 → STAR 순으로 준비됨)
+SECTION_RENDERERS = {
+    "similarity": render_similarity,
+    "keyword_coverage": render_keyword_coverage,
+    "repetition": render_repetition,
+    "star_analysis": render_star,
+}
+
+
+# 분석 실행
+st.markdown("---")
+
+profile = st.radio(
+    "분석 모드",
+    list(ANALYSIS_PROFILES.keys()),
+    index=list(ANALYSIS_PROFILES.keys()).index(DEFAULT_PROFILE),
+    format_func=lambda x: {"fast": "빠르게", "standard": "기본", "full": "정밀"}.get(x, x),
+    horizontal=True,
+)
+
+if st.button("분석하기"):
+    if not essay_text.strip():
+        st.warning("자기소개서를 입력해주세요.")
+        st.stop()
+
+    # 세션별 직전 분석 상태 (수정된 문장만 다시 분석)
+    if "analysis_state" not in st.session_state:
+        st.session_state["analysis_state"] = AnalysisState()
+
+    status = st.empty()
+    status.info("자기소개서를 분석 중입니다...")
+
+    # 섹션 자리를 순서대로 먼저 잡아두고, 계산이 끝나는 대로 채운다
+    slots = {name: st.empty() for name in SECTION_RENDERERS}
+    for slot in slots.values():
+        slot.caption("분석 중...")
+
+    for name, result in iter_report_sections(
+        essay_text=essay_text,
+        job_id=job_id,
+        company_id=company_id,
+        state=st.session_state["analysis_state"],
+        profile=profile,
+    ):
+        if name in SECTION_RENDERERS:
+            with slots[name].container():
+                SECTION_RENDERERS[name](result)
+        elif name == "meta":
+            meta = result
+
+    # 프로필/시간 예산으로 생략된 섹션 표시
+    for name in meta["skipped_by_profile"] + meta["skipped_by_budget"]:
+        if name in slots:
+            slots[name].caption("이번 분석 모드에서는 생략된 항목입니다.")
+
+    # 여러 기업 비교 (이미 계산한 문장 임베딩 재사용, 행렬곱 한 번)
+    if compare_ids:
+        state = st.session_state["analysis_state"]
+        render_company_comparison(score_companies(
+            essay_text,
+            company_ids=[company_id] + compare_ids,
+            sentences=state.sentences,
+            sentence_embeddings=state.embeddings,
+        ))
+
+    # 카탈로그 전체 직무 커버리지 순위 (같은 문장 임베딩 재사용)
+    if recommend_jobs:
+        state = st.session_state["analysis_state"]
+        render_job_ranking(rank_jobs_by_coverage(
+            state.sentences,
+            state.embeddings,
+            top_k=10,
+        ))
+
+    # 직무 설명 BM25 + 자소서 평균 벡터 dense 점수 융합 검색
+    if search_jobs:
+        state = st.session_state["analysis_state"]
+        essay_vector = state.essay_vector
+        render_job_search(hybrid_search(
+            essay_text,
+            essay_vector=None if essay_vector is None else l2_normalize(essay_vector),
+            top_k=10,
+        ))
+
+    status.success(f"분석 완료 ({meta['elapsed_ms']}ms)")
+
+    # 모델 최대 길이를 넘어 나눠서 인코딩한 문장 / 배치 패딩 비율
+    encoding = meta.get("encoding", {})
+    if encoding.get("truncated_sentences"):
+        st.caption(
+            f"긴 문장 {encoding['truncated_sentences']}개는 잘리지 않도록 나눠서 분석했습니다 "
+            f"(패딩 비율 {encoding.get('padding_ratio', 0.0):.1%})."
+        )
@@ -0,0 +1,442 @@
+"""
+ann_index.py
+
+순수 NumPy 근사 최근접 이웃(ANN) 인덱스.
+
+- ExactIndex : 정규화된 행렬과의 행렬곱 + top-k (정답 기준, 작은 집합용)
+               QuantizedMatrix를 넘기면 float32로 복원하지 않고 압축된 형식 그대로 점수 계산
+- IVFIndex   : 구면 k-means 거친 양자화기(coarse quantizer)로 벡터를 nlist개 리스트에 나누고,
+               질의와 가까운 nprobe개 리스트만 훑는다
+               pq_m > 0 이면 리스트 중심과의 잔차(residual)를 곱 양자화(PQ) 코드(uint8 × pq_m)로
+               저장하고, 질의·중심 내적 + 질의별 lookup table 합으로 내적을 근사한다
+               (메모리 ↓, 정확도 ↓)
+- 두 인덱스 모두 search(queries, k) → (scores, positions) 인터페이스가 같아서
+  호출부는 similarity.cosine_scores 대신 인덱스만 바꿔 끼우면 된다
+- nprobe(훑는 리스트 수)로 recall / 속도를 조절 (selfintro_app/scripts/bench_ann_index.py)
+- 직무 / 키워드 인덱스는 data/job_ann_index.npz, data/keyword_ann_index.npz 로 저장
+  (selfintro_app/scripts/build_ann_index.py). 파일이 없거나 id 목록이 현재 임베딩과
+  다르면 ExactIndex로 대체한다.
+- online_store로 행이 추가되면 저장된 IVF에 새 행만 add()로 넣는다 (k-means 재학습 없음)
+- 저장된 인덱스 파일이 다시 게시되면 artifacts watcher가 새로 로드해 교체하고,
+  검색 인덱스는 (임베딩 인덱스, 저장된 IVF) 조합이 바뀔 때만 다시 만든다
+
+모든 점수는 정규화된 벡터의 내적(= 코사인)이다.
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from nlp.artifacts import atomic_write, hot_artifact
+from nlp.quantization import QuantizedMatrix
+from nlp.similarity import l2_normalize
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "selfintro_app" / "scripts" / "data"
+JOB_ANN_PATH = DATA_DIR / "job_ann_index.npz"
+KEYWORD_ANN_PATH = DATA_DIR / "keyword_ann_index.npz"
+
+# 기본 설정
+DEFAULT_NPROBE = 8
+KMEANS_ITERS = 20
+PQ_CODEBOOK_SIZE = 256
+
+# 한 번에 처리할 질의/벡터 행 수 (메모리 상한)
+SEARCH_CHUNK_SIZE = 4096
+
+
+def _top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(n, m) 점수 → 행별 상위 k개 (점수 내림차순)"""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        empty = np.zeros((scores.shape[0], 0))
+        return empty.astype(np.float32), empty.astype(np.int64)
+
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return np.take_along_axis(top_scores, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+
+class ExactIndex:
+    """정확 검색 (brute-force 행렬곱, QuantizedMatrix면 압축 형식 그대로)"""
+
+    def __init__(self, matrix: Union[np.ndarray, QuantizedMatrix], ids: Optional[Sequence] = None):
+        if not isinstance(matrix, QuantizedMatrix):
+            matrix = QuantizedMatrix("float32", l2_normalize(matrix))
+        self.store = matrix
+        self.ids = None if ids is None else list(ids)
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def scores(self, queries: np.ndarray) -> np.ndarray:
+        """(nq, n) 전체 코사인"""
+        return self.store.scores(queries)
+
+    def search(self, queries: np.ndarray, k: int = 10, **_) -> Tuple[np.ndarray, np.ndarray]:
+        queries = l2_normalize(np.atleast_2d(queries))
+        scores, positions = [], []
+        for start in range(0, len(queries), SEARCH_CHUNK_SIZE):
+            s, p = _top_k(self.store.scores(queries[start:start + SEARCH_CHUNK_SIZE]), k)
+            scores.append(s)
+            positions.append(p)
+        return np.vstack(scores), np.vstack(positions)
+
+
+# k-means (구면: 정규화된 벡터, 내적 기준 할당)
+
+def spherical_kmeans(
+    x: np.ndarray,
+    n_clusters: int,
+    iters: int = KMEANS_ITERS,
+    seed: int = 0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """정규화된 x → (centroids (n_clusters, dim), assign (n,))"""
+    rng = np.random.default_rng(seed)
+    n_clusters = min(n_clusters, len(x))
+    centroids = x[rng.choice(len(x), n_clusters, replace=False)].copy()
+
+    assign = np.zeros(len(x), dtype=np.int64)
+    for _ in range(iters):
+        assign = _assign(x, centroids)
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, x)
+        counts = np.bincount(assign, minlength=n_clusters)
+
+        # 빈 클러스터는 임의의 점으로 다시 시작
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = x[rng.choice(len(x), int(empty.sum()), replace=False)]
+
+        centroids = l2_normalize(sums)
+
+    return centroids, _assign(x, centroids)
+
+
+def _assign(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    out = np.empty(len(x), dtype=np.int64)
+    for start in range(0, len(x), SEARCH_CHUNK_SIZE):
+        out[start:start + SEARCH_CHUNK_SIZE] = (x[start:start + SEARCH_CHUNK_SIZE] @ centroids.T).argmax(axis=1)
+    return out
+
+
+def _kmeans_l2(x: np.ndarray, n_clusters: int, iters: int, rng) -> np.ndarray:
+    """PQ 코드북용 유클리드 k-means (부분 벡터는 정규화하지 않는다)"""
+    n_clusters = min(n_clusters, len(x))
+    centroids = x[rng.choice(len(x), n_clusters, replace=False)].copy()
+    for _ in range(iters):
+        codes = _encode_l2(x, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, codes, x)
+        counts = np.bincount(codes, minlength=n_clusters)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
+
+
+def _encode_l2(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    # ||x - c||^2 = ||x||^2 - 2 x·c + ||c||^2 → x·c - ||c||^2/2 최대인 c
+    scores = x @ centroids.T - 0.5 * (centroids ** 2).sum(axis=1)
+    return scores.argmax(axis=1)
+
+
+# IVF (+PQ)
+
+class IVFIndex:
+    """
+    centroids     : (nlist, dim) 거친 양자화기
+    list_offsets  : (nlist + 1,) 리스트별 구간 (CSR)
+    list_ids      : 리스트 순서로 정렬한 원래 행 위치 (int32)
+    vectors       : 리스트 순서 정규화 벡터 (IVF-Flat) — PQ 사용 시 None
+    codebooks     : (pq_m, 256, dim / pq_m) 잔차 PQ 코드북 — IVF-Flat이면 None
+    codes         : (n, pq_m) uint8 PQ 코드 (리스트 순서)
+    ids           : 원래 행 위치 → id (저장된 인덱스가 현재 임베딩과 맞는지 확인용)
+    """
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        list_offsets: np.ndarray,
+        list_ids: np.ndarray,
+        vectors: Optional[np.ndarray] = None,
+        codebooks: Optional[np.ndarray] = None,
+        codes: Optional[np.ndarray] = None,
+        nprobe: int = DEFAULT_NPROBE,
+        ids: Optional[Sequence] = None,
+    ):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.list_offsets = np.asarray(list_offsets, dtype=np.int64)
+        self.list_ids = np.asarray(list_ids, dtype=np.int32)
+        self.vectors = None if vectors is None else np.asarray(vectors, dtype=np.float32)
+        self.codebooks = None if codebooks is None else np.asarray(codebooks, dtype=np.float32)
+        self.codes = None if codes is None else np.asarray(codes, dtype=np.uint8)
+        self.nprobe = nprobe
+        self.ids = None if ids is None else list(ids)
+
+    def __len__(self) -> int:
+        return len(self.list_ids)
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def uses_pq(self) -> bool:
+        return self.codes is not None
+
+    @classmethod
+    def build(
+        cls,
+        matrix: np.ndarray,
+        nlist: Optional[int] = None,
+        pq_m: int = 0,
+        nprobe: int = DEFAULT_NPROBE,
+        iters: int = KMEANS_ITERS,
+        seed: int = 0,
+        ids: Optional[Sequence] = None,
+    ) -> "IVFIndex":
+        """
+        nlist 기본값은 sqrt(n). pq_m > 0 이면 dim을 pq_m개 부분 공간으로 나눠 PQ 코드로 저장.
+        """
+        x = l2_normalize(matrix)
+        n, dim = x.shape
+        nlist = nlist or max(1, int(np.sqrt(n)))
+
+        centroids, assign = spherical_kmeans(x, nlist, iters=iters, seed=seed)
+
+        order = np.argsort(assign, kind="stable")
+        list_offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        list_offsets[1:] = np.cumsum(np.bincount(assign, minlength=len(centroids)))
+
+        if pq_m <= 0:
+            return cls(centroids, list_offsets, order, vectors=x[order], nprobe=nprobe, ids=ids)
+
+        if dim % pq_m != 0:
+            raise ValueError(f"dim({dim})이 pq_m({pq_m})으로 나누어떨어지지 않습니다.")
+
+        rng = np.random.default_rng(seed)
+        sub = dim // pq_m
+        codebooks = np.zeros((pq_m, PQ_CODEBOOK_SIZE, sub), dtype=np.float32)
+        codes = np.zeros((n, pq_m), dtype=np.uint8)
+
+        residuals = x[order] - centroids[assign[order]]
+        for m in range(pq_m):
+            part = residuals[:, m * sub:(m + 1) * sub]
+            book = _kmeans_l2(part, PQ_CODEBOOK_SIZE, iters, rng)
+            codebooks[m, :len(book)] = book
+            codes[:, m] = _encode_l2(part, book)
+
+        return cls(
+            centroids, list_offsets, order,
+            codebooks=codebooks, codes=codes, nprobe=nprobe, ids=ids,
+        )
+
+    def add(self, matrix: np.ndarray, ids: Optional[Sequence] = None) -> "IVFIndex":
+        """
+        새 벡터를 가장 가까운 리스트에 넣은 새 인덱스 (거친 양자화기 / 코드북은 그대로).
+        새 행의 위치는 기존 행 수부터 이어진다.
+        """
+        x = l2_normalize(matrix)
+        assign = _assign(x, self.centroids)
+
+        # 기존 행(리스트 순서) 뒤에 새 행을 붙이고 리스트 번호로 안정 정렬
+        lists = np.concatenate([
+            np.repeat(np.arange(self.nlist), np.diff(self.list_offsets)), assign,
+        ])
+        order = np.argsort(lists, kind="stable")
+
+        list_ids = np.concatenate([
+            self.list_ids, np.arange(len(self), len(self) + len(x), dtype=np.int32),
+        ])[order]
+        list_offsets = np.zeros(self.nlist + 1, dtype=np.int64)
+        list_offsets[1:] = np.cumsum(np.bincount(lists, minlength=self.nlist))
+
+        new_ids = None if self.ids is None or ids is None else self.ids + list(ids)
+
+        if not self.uses_pq:
+            vectors = np.vstack([self.vectors, x])[order]
+            return IVFIndex(
+                self.centroids, list_offsets, list_ids,
+                vectors=vectors, nprobe=self.nprobe, ids=new_ids,
+            )
+
+        pq_m, _, sub = self.codebooks.shape
+        residuals = x - self.centroids[assign]
+        codes = np.zeros((len(x), pq_m), dtype=np.uint8)
+        for m in range(pq_m):
+            codes[:, m] = _encode_l2(residuals[:, m * sub:(m + 1) * sub], self.codebooks[m])
+
+        return IVFIndex(
+            self.centroids, list_offsets, list_ids,
+            codebooks=self.codebooks, codes=np.vstack([self.codes, codes])[order],
+            nprobe=self.nprobe, ids=new_ids,
+        )
+
+    def _candidate_rows(self, probe: np.ndarray):
+        """훑을 리스트들의 행 위치와 행별 리스트 번호"""
+        starts, stops = self.list_offsets[probe], self.list_offsets[probe + 1]
+        rows = np.concatenate([np.arange(s, e) for s, e in zip(starts, stops)])
+        return rows, np.repeat(probe, stops - starts)
+
+    def _scores(
+        self,
+        query: np.ndarray,
+        rows: np.ndarray,
+        row_lists: np.ndarray,
+        centroid_scores: np.ndarray,
+    ) -> np.ndarray:
+        if not self.uses_pq:
+            return self.vectors[rows] @ query
+
+        # q·x ≈ q·c + Σ_m lut[m, code_m]  (lut = 질의 부분 벡터 × 잔차 코드북)
+        pq_m, _, sub = self.codebooks.shape
+        lut = np.einsum("mcs,ms->mc", self.codebooks, query.reshape(pq_m, sub))
+        return centroid_scores[row_lists] + lut[np.arange(pq_m), self.codes[rows]].sum(axis=1)
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        nprobe: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (nq, dim) 질의 → (scores (nq, k), positions (nq, k)).
+        후보가 k개보다 적으면 남는 칸은 score -inf, position -1.
+        """
+        queries = l2_normalize(np.atleast_2d(queries))
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+
+        out_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        out_pos = np.full((len(queries), k), -1, dtype=np.int64)
+
+        centroid_scores = queries @ self.centroids.T
+        probes = _top_k(centroid_scores, nprobe)[1]
+
+        for qi, (query, probe) in enumerate(zip(queries, probes)):
+            rows, row_lists = self._candidate_rows(probe)
+            if len(rows) == 0:
+                continue
+            scores = self._scores(query, rows, row_lists, centroid_scores[qi])
+            top_scores, top = _top_k(scores[None, :], k)
+            n_found = top.shape[1]
+            out_scores[qi, :n_found] = top_scores[0]
+            out_pos[qi, :n_found] = self.list_ids[rows[top[0]]]
+
+        return out_scores, out_pos
+
+
+# 저장 / 로드 (임베딩 산출물과 같은 data 디렉터리)
+
+def save_ann_index(index: IVFIndex, path: Path):
+    arrays = {
+        "centroids": index.centroids,
+        "list_offsets": index.list_offsets,
+        "list_ids": index.list_ids,
+        "nprobe": np.asarray(index.nprobe),
+    }
+    if index.ids is not None:
+        arrays["ids"] = np.asarray(index.ids)
+    if index.uses_pq:
+        arrays["codebooks"] = index.codebooks
+        arrays["codes"] = index.codes
+    else:
+        arrays["vectors"] = index.vectors
+
+    with atomic_write(path) as f:
+        np.savez_compressed(f, **arrays)
+
+
+def load_ann_index(path: Path) -> Optional[IVFIndex]:
+    """저장된 IVF 인덱스 (파일이 없으면 None)"""
+    if not Path(path).exists():
+        return None
+
+    with np.load(path, allow_pickle=False) as data:
+        return IVFIndex(
+            data["centroids"],
+            data["list_offsets"],
+            data["list_ids"],
+            vectors=data["vectors"] if "vectors" in data else None,
+            codebooks=data["codebooks"] if "codebooks" in data else None,
+            codes=data["codes"] if "codes" in data else None,
+            nprobe=int(data["nprobe"]),
+            ids=data["ids"].tolist() if "ids" in data else None,
+        )
+
+
+@hot_artifact(JOB_ANN_PATH)
+def _load_saved_job_ann() -> Optional[IVFIndex]:
+    return load_ann_index(JOB_ANN_PATH)
+
+
+@hot_artifact(KEYWORD_ANN_PATH)
+def _load_saved_keyword_ann() -> Optional[IVFIndex]:
+    return load_ann_index(KEYWORD_ANN_PATH)
+
+
+def _search_index(ann: Optional[IVFIndex], store: QuantizedMatrix, ids: List):
+    """
+    저장된 IVF가 현재 id 목록의 앞부분과 같으면 (뒤에 추가된 행은 add) IVF, 아니면 정확 검색.
+    정확 검색은 store(압축 형식)를 그대로 쓰고, IVF에 add할 새 행만 float32로 복원한다.
+    """
+    if ann is None or ann.ids is None or ann.ids != list(ids[:len(ann)]):
+        return ExactIndex(store, ids=ids)
+
+    if len(ann) < len(ids):
+        ann = ann.add(store.rows(np.arange(len(ann), len(ids))), ids[len(ann):])
+    return ann
+
+
+@lru_cache(maxsize=1)
+def _job_search_index(job_index, saved):
+    return _search_index(saved, job_index.store, job_index.ids)
+
+
+def load_job_search_index(job_index=None):
+    """
+    직무 임베딩 검색 인덱스 (저장된 IVF가 있으면 IVF, 없으면 정확 검색).
+    loaders.load_job_index()가 새 버전으로 바뀌면 그 버전 기준으로 다시 만든다.
+    job_index를 넘기면 그 버전과 위치가 맞는 검색 인덱스를 돌려준다.
+    """
+    if job_index is None:
+        from nlp.loaders import load_job_index
+
+        job_index = load_job_index()
+    return _job_search_index(job_index, _load_saved_job_ann())
+
+
+@lru_cache(maxsize=1)
+def _keyword_search_index(catalog, saved):
+    return _search_index(saved, catalog.store, catalog.vocab)
+
+
+def load_keyword_search_index():
+    """
+    카탈로그 키워드 어휘 검색 인덱스 (저장된 IVF가 있으면 IVF, 없으면 정확 검색).
+    카탈로그 파일이 없으면 None.
+    """
+    from nlp.keyword_catalog import load_keyword_catalog
+
+    catalog = load_keyword_catalog()
+    if catalog is None:
+        return None
+    return _keyword_search_index(catalog, _load_saved_keyword_ann())
+
+
+def recall_at_k(
+    approx_positions: np.ndarray,
+    exact_positions: np.ndarray,
+) -> float:
+    """정확 검색 top-k 중 근사 검색이 찾은 비율 (질의 평균)"""
+    k = exact_positions.shape[1]
+    if k == 0 or len(exact_positions) == 0:
+        return 1.0
+    hits = [
+        len(set(a.tolist()) & set(e.tolist())) for a, e in zip(approx_positions, exact_positions)
+    ]
+    return float(np.mean(hits) / k)
@@ -0,0 +1,367 @@
+"""
+artifacts.py
+
+data 디렉터리 산출물의 원자적 게시(publish)와, 실행 중인 프로세스의 무중단 교체.
+
+쓰는 쪽
+- atomic_write(path) : 같은 디렉터리의 임시 파일에 쓰고 fsync → os.replace
+                       읽는 쪽은 항상 이전 파일 또는 새 파일 전체만 본다 (반쯤 쓴 파일 없음)
+- 게시할 때마다 같은 디렉터리 artifacts_manifest.json 에 파일별 version(단조 증가)과
+  게시 시각을 기록 → artifact_version(path)
+- content_signature(path) : 파일 내용 해시. 다른 파일에서 만든 산출물(저장 형식 변형, 직무 그래프)에
+                            원본 서명을 함께 저장해 두고, 로드할 때 원본과 다르면 버린다
+                            (복사 배포처럼 manifest를 거치지 않은 교체도 잡힌다)
+
+읽는 쪽
+- hot_artifact(*paths) : 인자 없는 로더를 감싸 현재 값을 참조 하나로 보관
+                         (lru_cache(maxsize=None) 대체, cache_clear 호환)
+- start_artifact_watcher() : 데몬 스레드가 감시 파일 stat을 주기적으로 확인하고,
+                             바뀐 산출물의 로더만 백그라운드에서 새로 만든 뒤 참조를 교체
+  처리 중인 요청은 이미 받아 둔 이전 객체로 끝까지 진행한다
+- 새로 만들다 실패하면(깨진 파일 등) 이전 값을 유지하고 다음 변경 때 다시 시도
+- watch_files(*paths) : 로더 없이 변경만 감시할 파일 (online_store delta 등)
+- derived_artifact(*sources) : 다른 로더들의 결과로 만드는 값 (원본 + online_store delta 병합 등)
+                               원천 객체가 하나라도 바뀌었을 때만 다시 만든다
+- generation() : watcher가 교체 / 변경을 볼 때마다 1씩 오르는 카운터
+                 UI 캐시 키로 쓴다 (rerun마다 파일을 읽거나 stat 하지 않는다)
+
+파일 잠금은 POSIX에서는 fcntl.flock, Windows에서는 msvcrt.locking을 쓴다.
+"""
+
+from __future__ import annotations
+import functools
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "artifacts_manifest.json"
+
+# 감시 주기 (초)
+WATCH_INTERVAL_SECONDS = float(os.environ.get("NLP_ARTIFACT_POLL_SECONDS", "5"))
+
+PathLike = Union[str, Path]
+
+
+# 쓰기
+
+@contextmanager
+def file_lock(path: PathLike):
+    """<path>.lock 파일에 대한 배타 잠금 (프로세스 간 쓰기 순서 보장)"""
+    path = Path(path)
+    with open(path.with_name(path.name + ".lock"), "w") as lock:
+        _lock_file(lock)
+        try:
+            yield
+        finally:
+            _unlock_file(lock)
+
+
+def _lock_file(lock):
+    if fcntl is not None:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        return
+
+    # msvcrt.LK_LOCK은 10초 동안 재시도한 뒤 OSError → 잠길 때까지 반복
+    while True:
+        try:
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+
+def _unlock_file(lock):
+    if fcntl is not None:
+        fcntl.flock(lock, fcntl.LOCK_UN)
+    else:
+        lock.seek(0)
+        msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def _replace_atomically(path: Path, mode: str, encoding: Optional[str]):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+@contextmanager
+def atomic_write(path: PathLike, mode: str = "wb", encoding: Optional[str] = None):
+    """
+    with atomic_write(path) as f: np.savez_compressed(f, ...)
+    with atomic_write(path, "w", encoding="utf-8") as f: json.dump(..., f)
+
+    블록이 예외 없이 끝났을 때만 path를 교체하고 manifest version을 올린다.
+    """
+    path = Path(path)
+    with _replace_atomically(path, mode, encoding) as f:
+        yield f
+    _stamp(path)
+
+
+def _manifest_path(path: Path) -> Path:
+    return path.parent / MANIFEST_NAME
+
+
+def read_manifest(directory: PathLike) -> dict:
+    manifest = Path(directory) / MANIFEST_NAME
+    if not manifest.exists():
+        return {}
+    with open(manifest, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _stamp(path: Path):
+    manifest_path = _manifest_path(path)
+    with file_lock(manifest_path):
+        manifest = read_manifest(path.parent)
+        entry = manifest.get(path.name, {})
+        manifest[path.name] = {
+            "version": int(entry.get("version", 0)) + 1,
+            "published_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        }
+        with _replace_atomically(manifest_path, "w", "utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def artifact_version(path: PathLike) -> int:
+    """게시된 version (atomic_write로 쓴 적이 없으면 0)"""
+    path = Path(path)
+    return int(read_manifest(path.parent).get(path.name, {}).get("version", 0))
+
+
+def content_signature(path: PathLike) -> str:
+    """파일 내용의 sha1 (파일이 없으면 빈 문자열)"""
+    digest = hashlib.sha1()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return ""
+    return digest.hexdigest()
+
+
+# 읽기
+
+_UNSET = object()
+
+
+def _stat(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class HotArtifact:
+    """
+    감시 파일이 바뀌면 새로 로드해 참조만 교체하는 로더 래퍼.
+    첫 호출은 호출한 스레드에서 로드, 이후 교체는 reload()(보통 watcher 스레드)에서.
+    """
+
+    def __init__(self, loader: Callable, paths: Tuple[PathLike, ...]):
+        functools.update_wrapper(self, loader)
+        self._loader = loader
+        self.paths = [Path(p) for p in paths]
+        self._value = _UNSET
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        value = self._value
+        if value is _UNSET:
+            with self._lock:
+                if self._value is _UNSET:
+                    self._signature = self.signature()
+                    self._value = self._loader()
+                value = self._value
+        return value
+
+    def signature(self) -> tuple:
+        return tuple(_stat(p) for p in self.paths)
+
+    @property
+    def loaded(self) -> bool:
+        return self._value is not _UNSET
+
+    def changed(self) -> bool:
+        return self.loaded and self.signature() != self._signature
+
+    def reload(self) -> bool:
+        """새 값을 만든 뒤 교체 (실패하면 이전 값 유지)"""
+        signature = self.signature()
+        try:
+            value = self._loader()
+        except Exception:
+            logger.exception("산출물 다시 로드 실패 (이전 버전 유지): %s", self.__name__)
+            # 같은 (깨진) 파일로 매 주기 다시 시도하지 않도록 stat만 기록
+            with self._lock:
+                self._signature = signature
+            return False
+
+        with self._lock:
+            self._value = value
+            self._signature = signature
+        _bump_generation()
+        logger.info("산출물 교체 완료: %s", self.__name__)
+        return True
+
+    def cache_clear(self):
+        with self._lock:
+            self._value = _UNSET
+            self._signature = None
+
+
+_REGISTRY: List[HotArtifact] = []
+
+# 로더 없이 변경만 감시하는 파일 → 마지막으로 본 stat
+_WATCHED: Dict[Path, Optional[Tuple[int, int, int]]] = {}
+
+_GENERATION = 0
+_GENERATION_LOCK = threading.Lock()
+
+
+def _bump_generation():
+    global _GENERATION
+    with _GENERATION_LOCK:
+        _GENERATION += 1
+
+
+def generation() -> int:
+    """watcher가 산출물 교체 / 감시 파일 변경을 본 횟수 (변경 감지용 캐시 키, 파일 I/O 없음)"""
+    return _GENERATION
+
+
+def hot_artifact(*paths: PathLike) -> Callable[[Callable], HotArtifact]:
+    """@hot_artifact(X_PATH) — paths 중 하나라도 바뀌면 watcher가 다시 로드"""
+
+    def decorator(loader: Callable) -> HotArtifact:
+        artifact = HotArtifact(loader, paths)
+        _REGISTRY.append(artifact)
+        return artifact
+
+    return decorator
+
+
+def watch_files(*paths: PathLike):
+    """로더 없이 변경만 감시 (바뀌면 generation()이 오른다)"""
+    for path in paths:
+        path = Path(path)
+        _WATCHED.setdefault(path, _stat(path))
+
+
+class DerivedArtifact:
+    """
+    원천 로더들의 현재 값으로 만든 값을 보관하는 래퍼.
+    원천이 돌려준 객체가 모두 이전과 같은 객체(is)면 이전 결과를 그대로 반환한다.
+    """
+
+    def __init__(self, build: Callable, sources: Tuple[Callable, ...]):
+        functools.update_wrapper(self, build)
+        self._build = build
+        self.sources = sources
+        self._cached: Optional[Tuple[tuple, object]] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _matches(cached, inputs: tuple) -> bool:
+        return cached is not None and all(a is b for a, b in zip(cached[0], inputs))
+
+    def __call__(self):
+        inputs = tuple(source() for source in self.sources)
+        cached = self._cached
+        if self._matches(cached, inputs):
+            return cached[1]
+
+        with self._lock:
+            cached = self._cached
+            if not self._matches(cached, inputs):
+                cached = self._cached = (inputs, self._build(*inputs))
+            return cached[1]
+
+    def cache_clear(self):
+        with self._lock:
+            self._cached = None
+
+
+def derived_artifact(*sources: Callable) -> Callable[[Callable], DerivedArtifact]:
+    """@derived_artifact(load_a, load_b) — def f(a, b): ... 를 인자 없는 로더 f()로 감싼다"""
+
+    def decorator(build: Callable) -> DerivedArtifact:
+        return DerivedArtifact(build, sources)
+
+    return decorator
+
+
+def reload_changed() -> List[str]:
+    """바뀐 산출물만 다시 로드하고 교체된 로더 / 바뀐 감시 파일 이름을 반환"""
+    reloaded = []
+    for artifact in list(_REGISTRY):
+        if artifact.changed() and artifact.reload():
+            reloaded.append(artifact.__name__)
+
+    for path, signature in list(_WATCHED.items()):
+        current = _stat(path)
+        if current != signature:
+            _WATCHED[path] = current
+            _bump_generation()
+            reloaded.append(path.name)
+    return reloaded
+
+
+class ArtifactWatcher(threading.Thread):
+    """interval초마다 reload_changed()를 실행하는 데몬 스레드"""
+
+    def __init__(self, interval: float = WATCH_INTERVAL_SECONDS):
+        super().__init__(name="artifact-watcher", daemon=True)
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                reload_changed()
+            except Exception:
+                logger.exception("산출물 감시 중 오류")
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_WATCHER: Optional[ArtifactWatcher] = None
+_WATCHER_LOCK = threading.Lock()
+
+
+def start_artifact_watcher(interval: float = WATCH_INTERVAL_SECONDS) -> ArtifactWatcher:
+    """프로세스 당 하나의 watcher 스레드 (이미 실행 중이면 그대로 반환)"""
+    global _WATCHER
+    with _WATCHER_LOCK:
+        if _WATCHER is None or not _WATCHER.is_alive():
+            _WATCHER = ArtifactWatcher(interval)
+            _WATCHER.start()
+        return _WATCHER
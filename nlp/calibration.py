@@ -0,0 +1,188 @@
+"""
+calibration.py
+
+직무·기업별 anchor 테이블 기반 적합도 점수 보정 모듈.
+
+- 오프라인: selfintro_app/scripts/build_calibration_anchors.py 가 참조 자소서 집합의
+  직무/기업별 raw 코사인 분포에서 low / mid / high 분위수를 구해
+  data/calibration_anchors.npz 로 저장 (id 배열 + (n, 3) float32 배열)
+- 온라인: id → anchor 행을 배열 인덱싱으로 모아 similarity.calibrate_scores 한 번으로 보정
+- 테이블 파일이 없거나 id가 없으면 job_anchor_config의 DEFAULT anchor 사용
+- 참조 자소서 집합(data/reference_essays.json)이 없으면 anchor를 만들지 않는다
+  (직무 설명 등 다른 분포로 대체하면 모든 적합도 점수가 조용히 바뀌므로)
+
+(자소서 수, 직무 수) raw 유사도 행렬을 Python 루프 없이 한 번에 점수로 바꾼다.
+"""
+
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from nlp.artifacts import atomic_write, hot_artifact
+from nlp.similarity import DEFAULT_ANCHOR, calibrate_scores
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "selfintro_app" / "scripts" / "data"
+CALIBRATION_PATH = DATA_DIR / "calibration_anchors.npz"
+
+# 실제 지원자 자소서 참조 집합 (문자열 또는 {"text": ...} 리스트)
+REFERENCE_PATH = DATA_DIR / "reference_essays.json"
+
+ANCHOR_KINDS = ("job", "company")
+ANCHOR_FIELDS = ("low", "mid", "high")
+
+# 참조 분포에서 low / mid / high로 쓸 분위수
+ANCHOR_QUANTILES = (0.10, 0.50, 0.90)
+
+# low < mid < high 가 되도록 보장하는 최소 간격 (0 나눗셈 방지)
+MIN_ANCHOR_GAP = 1e-3
+
+
+def _default_row() -> np.ndarray:
+    return np.array([DEFAULT_ANCHOR[f] for f in ANCHOR_FIELDS], dtype=np.float64)
+
+
+class AnchorTable:
+    """
+    id 리스트와 (n, 3) [low, mid, high] anchor 배열을 함께 보관하는 읽기 전용 테이블.
+    """
+
+    def __init__(self, ids: Sequence, anchors: np.ndarray):
+        self.ids = list(ids)
+        self.anchors = np.asarray(anchors, dtype=np.float32).reshape(len(self.ids), 3)
+        self._positions = {item_id: pos for pos, item_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, item_id) -> bool:
+        return item_id in self._positions
+
+    def lookup(self, ids: Sequence) -> np.ndarray:
+        """
+        ids 순서대로 (len(ids), 3) anchor 배열. 테이블에 없는 id는 DEFAULT 행.
+        (저장은 float32, 반환은 float64 → 단건 / 배치 보정 결과가 같다)
+        """
+        rows = np.empty((len(ids), 3), dtype=np.float64)
+        rows[:] = _default_row()
+
+        found = [(i, self._positions[item_id]) for i, item_id in enumerate(ids) if item_id in self._positions]
+        if found:
+            dst, src = zip(*found)
+            rows[list(dst)] = self.anchors[list(src)]
+        return rows
+
+    def get(self, item_id) -> Dict[str, float]:
+        row = self.lookup([item_id])[0]
+        return {field: float(value) for field, value in zip(ANCHOR_FIELDS, row)}
+
+
+# 참조 자소서
+
+def load_reference_essays(path: Optional[Path] = None) -> List[str]:
+    """
+    참조 자소서 텍스트 리스트 (파일이 없으면 빈 리스트).
+    anchor 생성 / 양자화 정확도 리포트가 같은 집합을 쓴다.
+    """
+    path = Path(path or REFERENCE_PATH)
+    if not path.exists():
+        return []
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    essays = [item["text"] if isinstance(item, dict) else item for item in data]
+    return [e for e in essays if e and e.strip()]
+
+
+# 분포 → anchor
+
+def derive_anchors(
+    sims: np.ndarray,
+    quantiles: Sequence[float] = ANCHOR_QUANTILES,
+) -> np.ndarray:
+    """
+    (참조 자소서 수, 대상 수) raw 유사도 행렬 → 대상별 (n, 3) anchor.
+    열(대상)마다 분위수를 구하고 low < mid < high 가 되도록 간격을 맞춘다.
+    """
+    sims = np.asarray(sims, dtype=np.float64)
+    anchors = np.quantile(sims, quantiles, axis=0).T
+
+    anchors[:, 1] = np.maximum(anchors[:, 1], anchors[:, 0] + MIN_ANCHOR_GAP)
+    anchors[:, 2] = np.maximum(anchors[:, 2], anchors[:, 1] + MIN_ANCHOR_GAP)
+    return anchors.astype(np.float32)
+
+
+def save_anchor_tables(tables: Dict[str, AnchorTable], path: Optional[Path] = None, **meta):
+    arrays = {}
+    for kind, table in tables.items():
+        arrays[f"{kind}_ids"] = np.asarray(table.ids)
+        arrays[f"{kind}_anchors"] = table.anchors
+    for key, value in meta.items():
+        arrays[f"meta_{key}"] = np.asarray(value)
+
+    with atomic_write(path or CALIBRATION_PATH) as f:
+        np.savez_compressed(f, **arrays)
+
+
+@hot_artifact(CALIBRATION_PATH)
+def load_anchor_tables() -> Dict[str, AnchorTable]:
+    """
+    저장된 anchor 테이블 (프로세스 당 한 번 로드, 파일이 다시 게시되면 watcher가 교체).
+    파일이 없으면 빈 테이블 → 모든 id가 DEFAULT anchor를 쓴다.
+    """
+    tables = {kind: AnchorTable([], np.zeros((0, 3))) for kind in ANCHOR_KINDS}
+
+    if not CALIBRATION_PATH.exists():
+        return tables
+
+    with np.load(CALIBRATION_PATH, allow_pickle=False) as data:
+        for kind in ANCHOR_KINDS:
+            if f"{kind}_ids" in data:
+                tables[kind] = AnchorTable(data[f"{kind}_ids"].tolist(), data[f"{kind}_anchors"])
+
+    return tables
+
+
+def get_job_anchor(job_id) -> Dict[str, float]:
+    return load_anchor_tables()["job"].get(job_id)
+
+
+def get_company_anchor(company_id) -> Dict[str, float]:
+    return load_anchor_tables()["company"].get(company_id)
+
+
+# 배치 보정
+
+def calibrate_batch(
+    sims: np.ndarray,
+    ids: Sequence,
+    kind: str = "job",
+    anchors: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    raw 유사도를 대상별 anchor로 한 번에 보정.
+
+    Parameters
+    ----------
+    sims : np.ndarray
+        (len(ids),) 또는 (자소서 수, len(ids)) raw 코사인 유사도.
+    ids : Sequence
+        sims 마지막 축의 직무/기업 id.
+    kind : str
+        "job" 또는 "company".
+    anchors : np.ndarray, optional
+        미리 lookup 해둔 (len(ids), 3) anchor (반복 호출 시 재사용).
+    """
+    if kind not in ANCHOR_KINDS:
+        raise ValueError(f"지원하지 않는 anchor 종류: {kind}")
+
+    if anchors is None:
+        anchors = load_anchor_tables()[kind].lookup(ids)
+
+    low, mid, high = anchors[:, 0], anchors[:, 1], anchors[:, 2]
+    return calibrate_scores(sims, low, mid, high)
+
@@ -3,38 +3,56 @@ embedding.py
 
 SBERT 기반 한국어 문장/문서 임베딩 유틸 모듈.
 
-- 한국어 문장을 kss로 분리
+- 한국어 문장을 kss로 분리 (nlp.segmentation)
 - Sentence-BERT(ko-sroberta-multitask) 로드 (lazy loading)
 - 문장 리스트 → 임베딩 벡터 (numpy array)
 - 문서 전체 임베딩 = 문장 임베딩 평균
+- 실시간 미리보기용 정적 임베딩 인코더 (model_name=STATIC_MODEL_NAME)
 
 이 모듈은 프로젝트 전체 NLP 분석의 '벡터 뇌' 역할
 """
 
 from __future__ import annotations
 
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 import numpy as np
-import kss
 from sentence_transformers import SentenceTransformer
 
-# 내부 전역 모델 (lazy loading)
+from nlp.segmentation import split_sentences
+from nlp.similarity import l2_normalize
 
-_MODEL: Optional[SentenceTransformer] = None
+from nlp.static_embedding import StaticEmbeddingModel, STATIC_MODEL_PATH
+
+# 내부 전역 모델 (lazy loading, 모델 이름별 1개)
+
+_MODELS: Dict[str, SentenceTransformer] = {}
 
 DEFAULT_MODEL_NAME = "jhgan/ko-sroberta-multitask"
 
+# ko-sroberta-multitask에서 증류한 정적 토큰 임베딩 (미리보기용 근사 인코더)
+STATIC_MODEL_NAME = "static"
+
 
 def get_sbert_model(model_name: str = DEFAULT_MODEL_NAME) -> SentenceTransformer:
     """
     전역 SentenceTransformer 모델을 lazy-loading 방식으로 반환.
     여러 모듈에서 호출해도 실제로는 한 번만 로드되도록 한다.
+
+    model_name=STATIC_MODEL_NAME이면 같은 encode() 인터페이스를 가진
+    StaticEmbeddingModel을 반환한다.
     """
-    global _MODEL
-    if _MODEL is None:
-        _MODEL = SentenceTransformer(model_name)
-    return _MODEL
+    if model_name not in _MODELS:
+        if model_name == STATIC_MODEL_NAME:
+            _MODELS[model_name] = StaticEmbeddingModel.load()
+        else:
+            _MODELS[model_name] = SentenceTransformer(model_name)
+    return _MODELS[model_name]
+
+
+def static_model_available() -> bool:
+    """증류된 정적 임베딩 테이블이 배포되어 있는지 여부"""
+    return STATIC_MODEL_PATH.exists()
 
 
 # 문장 분리 & 전처리
@@ -43,24 +61,141 @@ def split_sentences_ko(text: str) -> List[str]:
     """
     한국어 문단을 문장 단위로 분리.
 
-    - kss를 사용해 문장 분리
+    - kss를 사용해 문장 분리 (nlp.segmentation의 kss 백엔드, 결과 캐시)
     - 공백/개행만 있는 문장은 제거
     """
     if not text:
         return []
 
     # kss가 개행 기준도 처리하므로 굳이 미리 나눌 필요는 없음
-    sents = kss.split_sentences(text)
-    sents = [s.strip() for s in sents if s and s.strip()]
-
-    return sents
+    return split_sentences(text, backend="kss")
 
 # 임베딩 관련 함수
 
+# 한 번에 model.encode에 넘기는 문장 수
+ENCODE_BATCH_SIZE = 32
+
+# 최대 길이를 넘는 문장을 나눌 때 창(window) 사이 겹치는 토큰 수
+CHUNK_OVERLAP = 32
+
+# [CLS] / [SEP] 등 모델이 붙이는 특수 토큰 수
+_SPECIAL_TOKENS = 2
+
+
+def _padding_tokens(lengths: List[int], batch_size: int) -> Tuple[int, int]:
+    """(패딩 토큰 수, 전체 토큰 슬롯 수) — lengths 순서대로 batch_size씩 묶었을 때"""
+    pad = 0
+    slots = 0
+    for i in range(0, len(lengths), batch_size):
+        batch = lengths[i:i + batch_size]
+        width = max(batch)
+        pad += width * len(batch) - sum(batch)
+        slots += width * len(batch)
+    return pad, slots
+
+
+def _token_count(tokenizer, text: str) -> int:
+    return len(tokenizer([text], add_special_tokens=False)["input_ids"][0])
+
+
+def _split_long(tokenizer, ids: List[int], limit: int) -> List[Tuple[str, int]]:
+    """
+    토큰 id 리스트를 limit 길이, CHUNK_OVERLAP만큼 겹치는 창으로 나눈다.
+
+    창은 텍스트로 되돌려 인코딩하므로, 다시 토큰화한 길이가 limit을 넘으면
+    (창이 ## 이어지는 토큰에서 시작하는 등) 넘친 만큼 창을 줄여 잘리지 않게 한다.
+    """
+    windows = []
+    start = 0
+    while True:
+        window = ids[start:start + limit]
+        text = tokenizer.decode(window)
+        n = _token_count(tokenizer, text)
+        while n > limit and len(window) > 1:
+            window = window[:max(1, len(window) - (n - limit))]
+            text = tokenizer.decode(window)
+            n = _token_count(tokenizer, text)
+
+        windows.append((text, n))
+        if start + len(window) >= len(ids):
+            break
+        start += max(1, len(window) - min(CHUNK_OVERLAP, len(window) // 2))
+    return windows
+
+
+def embed_sentences_with_stats(
+    sentences: List[str],
+    model_name: str = DEFAULT_MODEL_NAME,
+    batch_size: int = ENCODE_BATCH_SIZE,
+    normalize: bool = False,
+) -> Tuple[np.ndarray, Dict[str, float]]:
+    """
+    문장을 인코딩하고 (임베딩, 통계)를 반환한다.
+
+    - 모델 최대 길이를 넘는 문장은 겹치는 창으로 나눠 인코딩한 뒤
+      창 길이 가중 평균으로 한 벡터로 합침 (잘림 방지)
+    - 길이순 배치는 SentenceTransformer.encode가 내부에서 하므로 한 번에 넘긴다
+
+    통계: 창으로 나눈(기존이라면 잘렸을) 문장 수, encode의 길이순 배치 기준 패딩 토큰 수 / 비율
+    """
+    if not sentences:
+        return np.zeros((0, 0), dtype=np.float32), {"sentences": 0}
+
+    model = get_sbert_model(model_name)
+    tokenizer = getattr(model, "tokenizer", None)
+    max_len = getattr(model, "max_seq_length", None)
+
+    # 정적 임베딩 등 토크나이저가 없는 인코더는 패딩 개념이 없음
+    if tokenizer is None or not max_len:
+        embs = model.encode(sentences, convert_to_numpy=True)
+        return (l2_normalize(embs) if normalize else embs), {"sentences": len(sentences)}
+
+    limit = max_len - _SPECIAL_TOKENS
+    token_ids = tokenizer(list(sentences), add_special_tokens=False)["input_ids"]
+
+    # 인코딩 단위(piece): (텍스트, 원래 문장 인덱스, 토큰 수)
+    pieces: List[Tuple[str, int, int]] = []
+    truncated = 0
+    for idx, (sent, ids) in enumerate(zip(sentences, token_ids)):
+        if len(ids) <= limit:
+            pieces.append((sent, idx, len(ids)))
+        else:
+            truncated += 1
+            for text, n in _split_long(tokenizer, ids, limit):
+                pieces.append((text, idx, n))
+
+    piece_vecs = model.encode(
+        [text for text, _, _ in pieces],
+        batch_size=batch_size,
+        convert_to_numpy=True,
+    )
+
+    # 창 단위 벡터 → 문장 벡터 (토큰 수 가중 평균)
+    owners = np.array([idx for _, idx, _ in pieces])
+    weights = np.array([max(n, 1) for _, _, n in pieces], dtype=np.float32)
+    embs = np.zeros((len(sentences), piece_vecs.shape[-1]), dtype=np.float32)
+    np.add.at(embs, owners, piece_vecs * weights[:, None])
+    embs /= np.bincount(owners, weights=weights, minlength=len(sentences))[:, None].astype(np.float32)
+
+    # 패딩 통계: encode와 같은 순서(문자 길이 내림차순)로 batch_size씩 묶었을 때
+    order = sorted(range(len(pieces)), key=lambda i: -len(pieces[i][0]))
+    pad, slots = _padding_tokens([min(pieces[i][2], limit) + _SPECIAL_TOKENS for i in order], batch_size)
+
+    stats = {
+        "sentences": len(sentences),
+        "pieces": len(pieces),
+        "truncated_sentences": truncated,
+        "padding_tokens": pad,
+        "padding_ratio": round(pad / slots, 4) if slots else 0.0,
+    }
+    return (l2_normalize(embs) if normalize else embs), stats
+
+
 def embed_sentences(
     sentences: List[str],
     model_name: str = DEFAULT_MODEL_NAME,
     to_numpy: bool = True,
+    normalize: bool = False,
 ) -> np.ndarray:
     """
     문장 리스트를 SBERT 임베딩으로 변환.
@@ -72,20 +207,18 @@ def embed_sentences(
     model_name : str
         사용할 SBERT 모델 이름 (기본: ko-sroberta-multitask).
     to_numpy : bool
-        True이면 numpy.ndarray를 반환.
+        하위 호환용 인자 (항상 numpy.ndarray를 반환).
+    normalize : bool
+        True이면 L2 정규화한 float32 벡터를 반환 (이후 코사인 = 내적).
 
     Returns
     -------
     np.ndarray
         shape = (num_sentences, dim)
-    """
-    if not sentences:
-        # 문장이 없으면 (0, 0)짜리 배열 반환
-        return np.zeros((0, 0), dtype=np.float32)
-
-    model = get_sbert_model(model_name)
-    embs = model.encode(sentences, convert_to_numpy=to_numpy)
 
+    긴 문장 창 분할과 패딩/잘림 통계는 embed_sentences_with_stats 참고.
+    """
+    embs, _ = embed_sentences_with_stats(sentences, model_name=model_name, normalize=normalize)
     return embs
 
 
@@ -124,6 +257,30 @@ def embed_document_mean(
     return sentences, doc_vector, sent_embs
 
 
+def embed_documents_mean(
+    texts: List[str],
+    model_name: str = DEFAULT_MODEL_NAME,
+) -> np.ndarray:
+    """
+    여러 문서 → 문서별 문장 임베딩 평균 (L2 정규화) (문서 수, dim).
+
+    모든 문서의 문장을 한 번에 임베딩한 뒤 문서 경계마다 구간 합으로 평균을 낸다
+    (report_builder의 자소서 벡터와 같은 방식, 오프라인 스크립트용).
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    sentence_lists = [split_sentences(t) or [t] for t in texts]
+    flat = [s for sents in sentence_lists for s in sents]
+    counts = np.array([len(sents) for sents in sentence_lists])
+
+    sentence_embs = embed_sentences(flat, model_name=model_name, normalize=True)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    sums = np.add.reduceat(sentence_embs, starts, axis=0)
+
+    return l2_normalize(sums / counts[:, None])
+
+
 def embed_phrases(
     phrases: List[str],
     model_name: str = DEFAULT_MODEL_NAME,
@@ -132,12 +289,7 @@ def embed_phrases(
     직무/기업 핵심 키워드 등 짧은 phrase 리스트를 임베딩하는 유틸.
     keyword_coverage.py 등에서 재사용하기 좋게 분리해둠.
     """
-    if not phrases:
-        return np.zeros((0, 0), dtype=np.float32)
-
-    model = get_sbert_model(model_name)
-    embs = model.encode(phrases, convert_to_numpy=True)
-    return embs
+    return embed_sentences(phrases, model_name=model_name)
 
 
 # 간단 테스트용 main (옵션)
@@ -0,0 +1,237 @@
+"""
+incremental.py
+
+수정된 자기소개서를 문장 단위로 증분(incremental) 재분석하는 모듈.
+
+- 이전 분석 상태(문장, 임베딩, STAR 라벨, 키워드 유사도)를 세션별로 보관
+- 새 문장 리스트를 이전 리스트와 diff
+- 추가/변경된 문장만 임베딩 + STAR 태깅
+- 문서 평균 벡터는 합계 벡터를 더하고 빼는 방식으로 갱신
+- 인코더(model_name)가 바뀌면 임베딩 공간이 달라지므로 상태를 비우고 전부 다시 계산
+- 키워드 커버리지는 analyze_keyword_coverage와 같이 정확 일치(lexical_matcher)를 먼저 찾고,
+  나머지 키워드만 임베딩해 직무별로 캐시 (키워드 × 문장 유사도는 바뀐 문장 열만 다시 계산)
+"""
+
+from __future__ import annotations
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from nlp.embedding import DEFAULT_MODEL_NAME, embed_sentences, embed_sentences_with_stats
+from nlp.keyword_coverage import (
+    build_coverage_report,
+    keyword_similarity_matrix,
+    load_job_keyword_groups,
+    summarize_keyword_matches,
+)
+from nlp.lexical_matcher import find_keyword_spans
+from nlp.star_detector import label_vectors
+
+
+class AnalysisState:
+    """
+    한 세션(사용자)의 직전 분석 결과.
+    Streamlit에서는 st.session_state에 넣어 rerun 사이에 유지한다.
+    """
+
+    def __init__(self):
+        self.sentences: List[str] = []
+        self.embeddings: Optional[np.ndarray] = None
+        self.star_labels: List[str] = []
+        self.vector_sum: Optional[np.ndarray] = None
+
+        # 문장 / 키워드 임베딩을 만든 인코더
+        self.model_name: str = DEFAULT_MODEL_NAME
+
+        # job_id → {"groups", "rows"(키워드 → 행), "keyword_embeddings", "sims"}
+        # 정확 일치가 없어 임베딩이 필요했던 키워드만 행으로 쌓는다
+        self.keyword_cache: Dict[int, Dict] = {}
+
+        # 마지막 update()에서 새로 계산한 문장 수 / 그 문장들의 인코딩 통계
+        self.last_stats: Dict[str, int] = {}
+        self.last_encode_stats: Dict[str, float] = {}
+
+    # 문서 평균 벡터
+    @property
+    def essay_vector(self) -> Optional[np.ndarray]:
+        if not self.sentences or self.vector_sum is None:
+            return None
+        return self.vector_sum / len(self.sentences)
+
+    @property
+    def star_analysis(self):
+        return list(zip(self.sentences, self.star_labels))
+
+    # 문장 리스트 갱신
+    def update(
+        self,
+        sentences: List[str],
+        model_name: str = DEFAULT_MODEL_NAME,
+    ) -> List[Optional[int]]:
+        """
+        새 문장 리스트로 상태를 갱신한다.
+        model_name이 직전과 다르면 이전 임베딩을 재사용하지 않는다.
+
+        Returns
+        -------
+        List[Optional[int]]
+            새 문장별로 재사용한 이전 문장 인덱스 (새로 계산했으면 None).
+        """
+        if model_name != self.model_name:
+            self.sentences = []
+            self.embeddings = None
+            self.star_labels = []
+            self.vector_sum = None
+            self.keyword_cache = {}
+            self.model_name = model_name
+
+        old_sentences = self.sentences
+        reuse: List[Optional[int]] = [None] * len(sentences)
+
+        matcher = SequenceMatcher(a=old_sentences, b=sentences, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                for offset in range(i2 - i1):
+                    reuse[j1 + offset] = i1 + offset
+
+        added = [j for j, old_idx in enumerate(reuse) if old_idx is None]
+        kept = {old_idx for old_idx in reuse if old_idx is not None}
+        removed = [i for i in range(len(old_sentences)) if i not in kept]
+
+        new_embs = None
+        self.last_encode_stats = {"sentences": 0}
+        if added:
+            new_embs, self.last_encode_stats = embed_sentences_with_stats(
+                [sentences[j] for j in added], model_name=self.model_name, normalize=True
+            )
+
+        if not sentences:
+            self.sentences = []
+            self.embeddings = None
+            self.star_labels = []
+            self.vector_sum = None
+        else:
+            dim = new_embs.shape[1] if new_embs is not None else self.embeddings.shape[1]
+            embeddings = np.zeros((len(sentences), dim), dtype=np.float32)
+            star_labels = [""] * len(sentences)
+
+            for j, old_idx in enumerate(reuse):
+                if old_idx is not None:
+                    embeddings[j] = self.embeddings[old_idx]
+                    star_labels[j] = self.star_labels[old_idx]
+
+            if added:
+                embeddings[added] = new_embs
+                for j, label in zip(added, label_vectors(new_embs)):
+                    star_labels[j] = label
+
+            # 문서 합계 벡터: 삭제된 문장은 빼고, 추가된 문장은 더한다
+            if self.vector_sum is None or not kept:
+                vector_sum = embeddings.sum(axis=0)
+            else:
+                vector_sum = self.vector_sum.copy()
+                if removed:
+                    vector_sum -= self.embeddings[removed].sum(axis=0)
+                if added:
+                    vector_sum += new_embs.sum(axis=0)
+
+            self.sentences = list(sentences)
+            self.embeddings = embeddings
+            self.star_labels = star_labels
+            self.vector_sum = vector_sum
+
+        self._update_keyword_sims(reuse, added)
+
+        self.last_stats = {
+            "sentences": len(sentences),
+            "reused": len(sentences) - len(added),
+            "embedded": len(added),
+            "removed": len(removed),
+        }
+        return reuse
+
+    # 키워드 유사도 열 갱신
+    def _update_keyword_sims(self, reuse: List[Optional[int]], added: List[int]):
+        for entry in self.keyword_cache.values():
+            entry["sims"] = self._merge_columns(
+                entry["sims"], entry["keyword_embeddings"], reuse, added
+            )
+
+    def _merge_columns(
+        self,
+        old_sims: np.ndarray,
+        keyword_embeddings: np.ndarray,
+        reuse: List[Optional[int]],
+        added: List[int],
+    ) -> np.ndarray:
+        sims = np.zeros((len(keyword_embeddings), len(reuse)), dtype=np.float32)
+        if not reuse:
+            return sims
+
+        for j, old_idx in enumerate(reuse):
+            if old_idx is not None:
+                sims[:, j] = old_sims[:, old_idx]
+
+        if added and len(keyword_embeddings):
+            sims[:, added] = keyword_similarity_matrix(
+                keyword_embeddings, self.embeddings[added]
+            )
+        return sims
+
+    # 키워드 커버리지
+    def keyword_coverage(self, job_id: int) -> Dict:
+        """
+        analyze_keyword_coverage와 같은 형식의 결과.
+        정확 일치한 키워드는 임베딩하지 않고, 나머지 중 처음 필요한 키워드만
+        한 번에 임베딩해 직무별로 캐시한다.
+        """
+        if not self.sentences:
+            return {}
+
+        entry = self.keyword_cache.get(job_id)
+        if entry is None:
+            groups = load_job_keyword_groups(job_id)
+            if groups is None:
+                return {}
+
+            entry = {
+                "groups": groups,
+                "rows": {},
+                "keyword_embeddings": np.zeros((0, self.embeddings.shape[1]), dtype=np.float32),
+                "sims": np.zeros((0, len(self.sentences)), dtype=np.float32),
+            }
+            self.keyword_cache[job_id] = entry
+
+        lexical = {
+            name: find_keyword_spans(kws, self.sentences)
+            for name, kws in entry["groups"].items()
+        }
+
+        # 정확 일치가 없는데 아직 임베딩하지 않은 키워드만 모아 한 번에 임베딩
+        new_keywords = list(dict.fromkeys(
+            kw
+            for name, kws in entry["groups"].items()
+            for kw in kws
+            if kw not in lexical[name] and kw not in entry["rows"]
+        ))
+        if new_keywords:
+            new_embs = embed_sentences(new_keywords, model_name=self.model_name, normalize=True)
+            for kw in new_keywords:
+                entry["rows"][kw] = len(entry["rows"])
+            entry["keyword_embeddings"] = np.vstack([entry["keyword_embeddings"], new_embs])
+            entry["sims"] = np.vstack([
+                entry["sims"],
+                keyword_similarity_matrix(new_embs, self.embeddings),
+            ])
+
+        group_matches = {}
+        for name, kws in entry["groups"].items():
+            sims = np.zeros((len(kws), len(self.sentences)), dtype=np.float32)
+            semantic = [i for i, kw in enumerate(kws) if kw not in lexical[name]]
+            if semantic:
+                sims[semantic] = entry["sims"][[entry["rows"][kws[i]] for i in semantic]]
+            group_matches[name] = summarize_keyword_matches(
+                kws, self.sentences, sims, lexical_hits=lexical[name]
+            )
+        return build_coverage_report(group_matches)
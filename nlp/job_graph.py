@@ -0,0 +1,262 @@
+"""
+job_graph.py
+
+오프라인에서 미리 계산한 직무 × 기업 정합도 행렬과 직무 최근접 이웃 그래프.
+
+- alignment  : (직무 수, 기업 수) float16 코사인 유사도 → job_company_sim 조회
+- neighbors  : (직무 수, K) int32 이웃 직무 위치, neighbor_sims : (직무 수, K) float16
+- selfintro_app/scripts/build_job_graph.py 로 생성 → data/job_graph.npz
+- 파일이 없거나 id가 그래프에 없으면 None을 돌려주고, 호출부는 직접 계산으로 대체
+- 만들 때의 직무 / 기업 임베딩 원본 서명을 함께 저장하고, 원본이 그 뒤에 다시 게시되었으면
+  낡은 그래프 대신 현재 인덱스로 다시 계산한다
+- online_store로 추가된 직무 / 기업은 현재 인덱스(loaders.load_job_index 등)에서 벡터를 가져와
+  정합도 행·열과 이웃을 붙인다 (기존 직무의 이웃 목록도 새 직무와 비교해 갱신)
+
+요청마다 직무·기업 벡터 내적을 다시 하지 않고, 비슷한 직무 조회는 O(K)로 끝난다.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from nlp.artifacts import atomic_write, content_signature, derived_artifact, hot_artifact
+from nlp.loaders import COMPANY_EMBED_PATH, JOB_EMBED_PATH, load_company_index, load_job_index
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+JOB_GRAPH_PATH = BASE_DIR / "selfintro_app" / "scripts" / "data" / "job_graph.npz"
+
+# 직무당 저장할 이웃 수
+NEIGHBOR_K = 20
+
+# 직무 × 직무 유사도를 계산할 때 한 번에 처리할 행 수 (메모리 상한)
+GRAPH_CHUNK_SIZE = 1024
+
+
+class JobGraph:
+    """직무·기업 id와 미리 계산한 정합도 행렬 / 이웃 그래프를 함께 보관"""
+
+    def __init__(
+        self,
+        job_ids: Sequence,
+        company_ids: Sequence,
+        alignment: np.ndarray,
+        neighbors: np.ndarray,
+        neighbor_sims: np.ndarray,
+        sources: Sequence[str] = (),
+    ):
+        self.job_ids = list(job_ids)
+        self.company_ids = list(company_ids)
+        self.alignment = np.asarray(alignment, dtype=np.float16)
+        self.neighbors = np.asarray(neighbors, dtype=np.int32)
+        self.neighbor_sims = np.asarray(neighbor_sims, dtype=np.float16)
+        # 만들 때의 (직무, 기업) 임베딩 원본 서명 (graph_sources)
+        self.sources = tuple(sources)
+
+        self._job_pos = {job_id: pos for pos, job_id in enumerate(self.job_ids)}
+        self._company_pos = {cid: pos for pos, cid in enumerate(self.company_ids)}
+
+    def job_company_sim(self, job_id, company_id) -> Optional[float]:
+        """미리 계산한 직무-기업 raw 코사인 (그래프에 없으면 None)"""
+        j = self._job_pos.get(job_id)
+        c = self._company_pos.get(company_id)
+        if j is None or c is None:
+            return None
+        return float(self.alignment[j, c])
+
+    def job_company_sims(self, job_ids: Sequence, company_ids: Sequence) -> Optional[np.ndarray]:
+        """쌍 목록의 raw 코사인 배열 (하나라도 그래프에 없으면 None)"""
+        try:
+            rows = [self._job_pos[j] for j in job_ids]
+            cols = [self._company_pos[c] for c in company_ids]
+        except KeyError:
+            return None
+        return self.alignment[rows, cols].astype(np.float32)
+
+    def similar_jobs(self, job_id, k: int = 10) -> List[Dict]:
+        """이웃 그래프에서 가까운 직무 k개 (유사도 내림차순)"""
+        pos = self._job_pos.get(job_id)
+        if pos is None:
+            return []
+
+        k = min(k, self.neighbors.shape[1])
+        return [
+            {"job_id": self.job_ids[n], "similarity": round(float(s), 4)}
+            for n, s in zip(self.neighbors[pos, :k], self.neighbor_sims[pos, :k])
+        ]
+
+
+    def extend(self, job_index, company_index) -> "JobGraph":
+        """
+        인덱스에는 있고 그래프에는 없는 직무 / 기업을 붙인 새 그래프 (없으면 self).
+        새 행·열만 내적하고, 이웃은 새 직무만 전체와 비교 + 기존 직무는 새 직무와만 비교해 합친다.
+        """
+        new_jobs = [j for j in job_index.ids if j not in self._job_pos]
+        new_companies = [c for c in company_index.ids if c not in self._company_pos]
+        if not new_jobs and not new_companies:
+            return self
+
+        job_ids = self.job_ids + new_jobs
+        company_ids = self.company_ids + new_companies
+        n_jobs, n_companies = len(self.job_ids), len(self.company_ids)
+
+        jobs = _index_rows(job_index, job_ids)
+        companies = _index_rows(company_index, company_ids)
+
+        alignment = np.zeros((len(job_ids), len(company_ids)), dtype=np.float16)
+        alignment[:n_jobs, :n_companies] = self.alignment
+        alignment[:n_jobs, n_companies:] = jobs[:n_jobs] @ companies[n_companies:].T
+        alignment[n_jobs:] = jobs[n_jobs:] @ companies.T
+
+        k = self.neighbors.shape[1] if n_jobs > 1 else NEIGHBOR_K
+        k = max(0, min(k, len(job_ids) - 1))
+        neighbors = np.zeros((len(job_ids), k), dtype=np.int32)
+        neighbor_sims = np.zeros((len(job_ids), k), dtype=np.float32)
+
+        if k and new_jobs:
+            # 기존 직무: 저장된 이웃 + 새 직무 후보 중 top-k
+            cand = np.concatenate([
+                self.neighbors[:, :k],
+                np.broadcast_to(np.arange(n_jobs, len(job_ids)), (n_jobs, len(new_jobs))),
+            ], axis=1)
+            cand_sims = np.concatenate([
+                self.neighbor_sims[:, :k].astype(np.float32),
+                jobs[:n_jobs] @ jobs[n_jobs:].T,
+            ], axis=1)
+            neighbors[:n_jobs], neighbor_sims[:n_jobs] = _top_k(cand, cand_sims, k)
+
+            # 새 직무: 전체 직무와 비교 (자기 자신 제외)
+            sims = jobs[n_jobs:] @ jobs.T
+            sims[np.arange(len(new_jobs)), np.arange(n_jobs, len(job_ids))] = -np.inf
+            cand = np.broadcast_to(np.arange(len(job_ids)), sims.shape)
+            neighbors[n_jobs:], neighbor_sims[n_jobs:] = _top_k(cand, sims, k)
+        elif k:
+            neighbors[:], neighbor_sims[:] = self.neighbors[:, :k], self.neighbor_sims[:, :k]
+
+        return JobGraph(job_ids, company_ids, alignment, neighbors, neighbor_sims, self.sources)
+
+
+def _index_rows(index, ids: Sequence) -> np.ndarray:
+    """ids 순서대로 인덱스 벡터 (인덱스에 없는 id는 0 벡터)"""
+    rows = np.zeros((len(ids), index.store.dim), dtype=np.float32)
+    present = [(i, index.position(item_id)) for i, item_id in enumerate(ids) if item_id in index]
+    if present:
+        dst, src = zip(*present)
+        rows[list(dst)] = index.store.rows(np.asarray(src))
+    return rows
+
+
+def _top_k(candidates: np.ndarray, sims: np.ndarray, k: int):
+    """행별 후보 (위치, 유사도) → 유사도 내림차순 top-k"""
+    top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+    top_sims = np.take_along_axis(sims, top, axis=1)
+    order = np.argsort(-top_sims, axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    return np.take_along_axis(candidates, top, axis=1), np.take_along_axis(top_sims, order, axis=1)
+
+
+# 생성 (오프라인)
+
+def _top_neighbors(job_matrix: np.ndarray, k: int):
+    """정규화된 직무 행렬 → 자기 자신을 뺀 top-k 이웃 (청크 단위 행렬곱)"""
+    n = len(job_matrix)
+    k = max(0, min(k, n - 1))
+    neighbors = np.zeros((n, k), dtype=np.int32)
+    neighbor_sims = np.zeros((n, k), dtype=np.float32)
+    if k == 0:
+        return neighbors, neighbor_sims
+
+    for start in range(0, n, GRAPH_CHUNK_SIZE):
+        stop = min(start + GRAPH_CHUNK_SIZE, n)
+        sims = job_matrix[start:stop] @ job_matrix.T
+        sims[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_sims, axis=1, kind="stable")
+
+        neighbors[start:stop] = np.take_along_axis(top, order, axis=1)
+        neighbor_sims[start:stop] = np.take_along_axis(top_sims, order, axis=1)
+
+    return neighbors, neighbor_sims
+
+
+def build_job_graph(
+    job_index,
+    company_index,
+    k: int = NEIGHBOR_K,
+    sources: Sequence[str] = (),
+) -> JobGraph:
+    """loaders.VectorIndex(정규화된 행렬) 두 개 → JobGraph (sources: 인덱스를 만든 원본 서명)"""
+    alignment = job_index.matrix @ company_index.matrix.T
+    neighbors, neighbor_sims = _top_neighbors(job_index.matrix, k)
+    return JobGraph(job_index.ids, company_index.ids, alignment, neighbors, neighbor_sims, sources)
+
+
+def graph_sources() -> tuple:
+    """그래프를 만드는 직무 / 기업 임베딩 원본의 현재 내용 서명"""
+    return content_signature(JOB_EMBED_PATH), content_signature(COMPANY_EMBED_PATH)
+
+
+def save_job_graph(graph: JobGraph, path: Optional[Path] = None):
+    """graph.sources가 비어 있으면 저장 시점의 원본 서명을 기록"""
+    with atomic_write(path or JOB_GRAPH_PATH) as f:
+        np.savez_compressed(
+            f,
+            job_ids=np.asarray(graph.job_ids),
+            company_ids=np.asarray(graph.company_ids),
+            alignment=graph.alignment,
+            neighbors=graph.neighbors,
+            neighbor_sims=graph.neighbor_sims,
+            sources=np.asarray(graph.sources or graph_sources()),
+        )
+
+
+@hot_artifact(JOB_GRAPH_PATH)
+def _load_base_job_graph() -> Optional[JobGraph]:
+    """저장된 그래프 (프로세스 당 한 번 로드, 파일이 없으면 None, 다시 게시되면 교체)"""
+    if not JOB_GRAPH_PATH.exists():
+        return None
+
+    with np.load(JOB_GRAPH_PATH, allow_pickle=False) as data:
+        return JobGraph(
+            data["job_ids"].tolist(),
+            data["company_ids"].tolist(),
+            data["alignment"],
+            data["neighbors"],
+            data["neighbor_sims"],
+            data["sources"].tolist() if "sources" in data else (),
+        )
+
+
+@derived_artifact(_load_base_job_graph, load_job_index, load_company_index)
+def load_job_graph(base: Optional[JobGraph], job_index, company_index) -> Optional[JobGraph]:
+    """
+    저장된 그래프 + online_store로 추가된 직무 / 기업 (파일이 없으면 None).
+    그래프를 만든 뒤 임베딩 원본이 다시 게시되었으면 (서명 불일치) 현재 인덱스로 다시 계산한다.
+    """
+    if base is None:
+        return None
+    sources = graph_sources()
+    if base.sources != sources:
+        return build_job_graph(job_index, company_index, sources=sources)
+    return base.extend(job_index, company_index)
+
+
+def lookup_job_company_sim(job_id, company_id) -> Optional[float]:
+    graph = load_job_graph()
+    if graph is None:
+        return None
+    return graph.job_company_sim(job_id, company_id)
+
+
+def similar_jobs(job_id, k: int = 10) -> List[Dict]:
+    """
+    job_id와 가까운 직무 k개 [{"job_id", "similarity"}, ...].
+    그래프가 없으면 빈 리스트.
+    """
+    graph = load_job_graph()
+    if graph is None:
+        return []
+    return graph.similar_jobs(job_id, k)
@@ -0,0 +1,338 @@
+"""
+keyword_catalog.py
+
+직무 카탈로그 전체의 핵심 키워드 커버리지를 한 번에 계산하는 모듈.
+
+- 모든 직무·그룹의 키워드를 중복 없이 모은 어휘(vocabulary)를 한 번만 임베딩
+  → (어휘 수, dim) 정규화 float32 행렬 (data/keyword_catalog.npz)
+- (직무, 그룹, 키워드) 항목은 평탄한 int32 배열로 보관
+- 자소서 문장 행렬과 행렬곱 한 번 → 키워드별 문장 최대 유사도
+  → bincount 세그먼트 합으로 직무 × 그룹 커버리지
+- 카탈로그는 selfintro_app/scripts/build_keyword_catalog.py 로 미리 만들어 둔다
+  (파일이 없으면 요청 중에 전체 어휘를 임베딩하지 않고 빈 결과를 반환)
+- online_store로 추가된 직무는 카탈로그 뒤에 붙인다 (새 키워드만 임베딩)
+- NLP_EMBED_STORAGE 변형(data/keyword_catalog.<형식>.npz)이 있으면 키워드 행렬은
+  그 형식(nlp.quantization) 그대로 점수를 계산한다
+- 어휘가 커서 키워드 ANN 인덱스(nlp.ann_index)를 저장해 두었다면 문장마다
+  가까운 키워드 후보만 찾아 최대 유사도의 하한을 채운다
+  충족 여부가 확정되지 않은 키워드를 충족 / 미충족으로 가정한 커버리지 상·하한으로
+  상위 직무가 될 수 있는 직무만 골라, 그 키워드를 정확히 계산한 뒤 커버리지를 다시 구한다
+  (반환하는 직무의 커버리지와 부족 키워드는 정확 검색과 같다)
+
+점수 기준(SIM_THRESHOLD, 그룹 평균)은 analyze_keyword_coverage와 같다.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from nlp.ann_index import ExactIndex, load_keyword_search_index
+from nlp.artifacts import atomic_write, derived_artifact, hot_artifact
+from nlp.embedding import embed_sentences
+from nlp.keyword_coverage import SIM_THRESHOLD, collect_job_keywords_by_group
+from nlp.lexical_matcher import find_keyword_spans
+from nlp.loaders import load_raw_job_vectors
+from nlp.online_store import Delta, job_delta
+from nlp.quantization import EMBED_STORAGE, QuantizedMatrix, load_quantized, quantized_path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+KEYWORD_CATALOG_PATH = BASE_DIR / "selfintro_app" / "scripts" / "data" / "keyword_catalog.npz"
+
+KEYWORD_GROUPS = ("skills", "knowledge", "main_abilities")
+
+# ANN 사용 시 문장마다 가져올 키워드 후보 수
+ANN_KEYWORD_K = 64
+
+
+class KeywordCatalog:
+    """
+    vocab      : 고유 키워드 리스트
+    store      : (len(vocab), dim) 정규화된 키워드 임베딩 (QuantizedMatrix, matrix는 float32 복원본)
+    job_ids    : 직무 id 리스트
+    entry_job / entry_group / entry_keyword : 항목별 직무 위치, 그룹 번호, 어휘 위치
+    """
+
+    def __init__(
+        self,
+        vocab: Sequence[str],
+        matrix,
+        job_ids: Sequence,
+        entry_job: np.ndarray,
+        entry_group: np.ndarray,
+        entry_keyword: np.ndarray,
+    ):
+        self.vocab = list(vocab)
+        self.vocab_pos = {kw: pos for pos, kw in enumerate(self.vocab)}
+        self.store = (
+            matrix if isinstance(matrix, QuantizedMatrix)
+            else QuantizedMatrix("float32", np.asarray(matrix, dtype=np.float32))
+        )
+        self.job_ids = list(job_ids)
+        self.entry_job = np.asarray(entry_job, dtype=np.int32)
+        self.entry_group = np.asarray(entry_group, dtype=np.int32)
+        self.entry_keyword = np.asarray(entry_keyword, dtype=np.int32)
+
+        # 세그먼트 = 직무 위치 × 그룹 수 + 그룹 번호
+        self.entry_segment = self.entry_job * len(KEYWORD_GROUPS) + self.entry_group
+        self.num_segments = len(self.job_ids) * len(KEYWORD_GROUPS)
+        self.segment_sizes = np.bincount(self.entry_segment, minlength=self.num_segments)
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self.store.matrix
+
+    def extend(self, raw_jobs: Dict) -> "KeywordCatalog":
+        """
+        직무를 뒤에 붙인 새 카탈로그 (어휘에 없던 키워드만 임베딩해 어휘 뒤에 추가).
+        기존 어휘 위치는 그대로라 저장된 키워드 ANN 인덱스에는 새 어휘 행만 add 된다.
+        """
+        vocab_pos = dict(self.vocab_pos)
+        new_vocab: List[str] = []
+        job_ids = list(self.job_ids)
+        entry_job, entry_group, entry_keyword = [], [], []
+
+        for job_id, job_info in raw_jobs.items():
+            job_pos = len(job_ids)
+            job_ids.append(job_id)
+            groups = collect_job_keywords_by_group(job_info)
+
+            for group_idx, group_name in enumerate(KEYWORD_GROUPS):
+                for kw in groups.get(group_name, []):
+                    if kw not in vocab_pos:
+                        vocab_pos[kw] = len(vocab_pos)
+                        new_vocab.append(kw)
+                    entry_job.append(job_pos)
+                    entry_group.append(group_idx)
+                    entry_keyword.append(vocab_pos[kw])
+
+        store = self.store
+        if new_vocab:
+            store = store.append(embed_sentences(new_vocab, normalize=True))
+
+        return KeywordCatalog(
+            self.vocab + new_vocab,
+            store,
+            job_ids,
+            np.concatenate([self.entry_job, np.asarray(entry_job, dtype=np.int32)]),
+            np.concatenate([self.entry_group, np.asarray(entry_group, dtype=np.int32)]),
+            np.concatenate([self.entry_keyword, np.asarray(entry_keyword, dtype=np.int32)]),
+        )
+
+
+# 생성
+
+def build_keyword_catalog(raw_jobs: Optional[Dict] = None) -> KeywordCatalog:
+    """RAW 직무 데이터 → KeywordCatalog (고유 키워드만 임베딩)"""
+    if raw_jobs is None:
+        raw_jobs = load_raw_job_vectors()
+
+    vocab: Dict[str, int] = {}
+    job_ids, entry_job, entry_group, entry_keyword = [], [], [], []
+
+    for job_pos, (job_id, job_info) in enumerate(raw_jobs.items()):
+        job_ids.append(job_id)
+        groups = collect_job_keywords_by_group(job_info)
+
+        for group_idx, group_name in enumerate(KEYWORD_GROUPS):
+            for kw in groups.get(group_name, []):
+                entry_job.append(job_pos)
+                entry_group.append(group_idx)
+                entry_keyword.append(vocab.setdefault(kw, len(vocab)))
+
+    if vocab:
+        matrix = embed_sentences(list(vocab), normalize=True)
+    else:
+        matrix = np.zeros((0, 0), dtype=np.float32)
+
+    return KeywordCatalog(list(vocab), matrix, job_ids, entry_job, entry_group, entry_keyword)
+
+
+def save_keyword_catalog(catalog: KeywordCatalog, path: Optional[Path] = None):
+    with atomic_write(path or KEYWORD_CATALOG_PATH) as f:
+        np.savez_compressed(
+            f,
+            vocab=np.asarray(catalog.vocab),
+            matrix=catalog.matrix,
+            job_ids=np.asarray(catalog.job_ids),
+            entry_job=catalog.entry_job,
+            entry_group=catalog.entry_group,
+            entry_keyword=catalog.entry_keyword,
+        )
+
+
+@hot_artifact(KEYWORD_CATALOG_PATH, quantized_path(KEYWORD_CATALOG_PATH, EMBED_STORAGE))
+def _load_base_keyword_catalog() -> Optional[KeywordCatalog]:
+    """
+    저장된 카탈로그 (프로세스 당 한 번 로드, 다시 게시되면 교체).
+    파일이 없으면 None → build_keyword_catalog.py 로 먼저 만들어야 한다.
+    """
+    if not KEYWORD_CATALOG_PATH.exists():
+        return None
+
+    with np.load(KEYWORD_CATALOG_PATH, allow_pickle=False) as data:
+        vocab = data["vocab"].tolist()
+
+        store = None
+        if EMBED_STORAGE != "float32":
+            loaded = load_quantized(
+                quantized_path(KEYWORD_CATALOG_PATH, EMBED_STORAGE), source=KEYWORD_CATALOG_PATH
+            )
+            if loaded is not None and loaded[0] == vocab:
+                store = loaded[1]
+
+        return KeywordCatalog(
+            vocab,
+            data["matrix"] if store is None else store,
+            data["job_ids"].tolist(),
+            data["entry_job"],
+            data["entry_group"],
+            data["entry_keyword"],
+        )
+
+
+@derived_artifact(_load_base_keyword_catalog, job_delta)
+def load_keyword_catalog(base: Optional[KeywordCatalog], delta: Delta) -> Optional[KeywordCatalog]:
+    """
+    저장된 카탈로그 + online_store로 추가된 직무 (카탈로그 파일이 없으면 None).
+    delta가 바뀌었을 때 한 번만 새 키워드를 임베딩해 붙이고, 이후 요청은 그 카탈로그를 재사용한다.
+    """
+    if base is None:
+        return None
+
+    known = set(base.job_ids)
+    added = {job_id: info for job_id, info in delta.by_id.items() if job_id not in known}
+    return base.extend(added) if added else base
+
+
+# 카탈로그 전체 커버리지
+
+def keyword_best_similarity(
+    catalog: KeywordCatalog,
+    sentence_embeddings: np.ndarray,
+    nprobe: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    어휘 키워드별 문장 최대 유사도 (len(vocab),)와 그 값이 정확한지 여부 (len(vocab),) bool.
+
+    ANN을 쓰면 키워드가 후보에 든 문장에서의 최대값만 알 수 있으므로,
+    모든 문장의 후보에 들지 않은 키워드는 하한(후보에 한 번도 없으면 -inf)이고 정확하지 않다.
+    """
+    index = load_keyword_search_index()
+    if isinstance(index, ExactIndex):
+        best = index.scores(sentence_embeddings).max(axis=0)
+        return best, np.ones(len(best), dtype=bool)
+
+    scores, positions = index.search(sentence_embeddings, k=ANN_KEYWORD_K, nprobe=nprobe)
+    found = positions >= 0
+
+    best = np.full(len(catalog.vocab), -np.inf, dtype=np.float32)
+    np.maximum.at(best, positions[found], scores[found])
+
+    # 문장마다 후보는 중복이 없으므로 등장 횟수 == 문장 수 이면 모든 문장에서 계산된 값
+    seen = np.bincount(positions[found], minlength=len(catalog.vocab))
+    return best, seen == len(sentence_embeddings)
+
+
+def _coverage(catalog: KeywordCatalog, best: np.ndarray, threshold: float):
+    """키워드별 최대 유사도 → (항목별 충족 여부, (직무 수, 그룹 수) 그룹 커버리지, 직무별 전체 커버리지)"""
+    hit = best[catalog.entry_keyword] >= threshold
+    hits = np.bincount(catalog.entry_segment, weights=hit, minlength=catalog.num_segments)
+
+    sizes = catalog.segment_sizes
+    group_cov = np.zeros(catalog.num_segments, dtype=np.float64)
+    nonempty = sizes > 0
+    group_cov[nonempty] = hits[nonempty] / sizes[nonempty] * 100
+    group_cov = np.round(group_cov, 2).reshape(len(catalog.job_ids), len(KEYWORD_GROUPS))
+
+    return hit, group_cov, np.round(group_cov.mean(axis=1), 2)
+
+
+def rank_jobs_by_coverage(
+    sentences: List[str],
+    sentence_embeddings: np.ndarray,
+    top_k: Optional[int] = 20,
+    missing_k: int = 5,
+    threshold: float = SIM_THRESHOLD,
+    nprobe: Optional[int] = None,
+) -> List[Dict]:
+    """
+    자소서 문장 임베딩을 카탈로그 전체 직무와 비교해 키워드 커버리지 순으로 정렬.
+    nprobe는 키워드 ANN 인덱스가 있을 때만 쓰인다 (None이면 인덱스 기본값).
+
+    Returns
+    -------
+    List[Dict]
+        [{"rank", "job_id", "coverage_score", "group_coverage", "top_missing"}, ...]
+        group_coverage는 그룹별 커버리지(%),
+        top_missing은 문장 유사도가 가장 낮은(가장 부족한) 미충족 키워드.
+    """
+    if not sentences:
+        return []
+
+    catalog = load_keyword_catalog()
+    if catalog is None or not catalog.vocab:
+        return []
+
+    # 1. 키워드별 문장 최대 유사도 (행렬곱 한 번 + 행 최대값, 또는 ANN 후보)
+    #    본문에 그대로 등장한 키워드는 analyze_keyword_coverage와 같이 매칭(1.0)으로 본다
+    best, exact = keyword_best_similarity(catalog, sentence_embeddings, nprobe)
+    matched = find_keyword_spans(catalog.vocab, sentences)
+    if matched:
+        pos = [catalog.vocab_pos[kw] for kw in matched]
+        best[pos] = 1.0
+        exact[pos] = True
+
+    # 2. 항목 → 세그먼트(직무 × 그룹) 합산
+    #    ANN 하한만 아는 키워드는 미충족으로 본 하한
+    hit, group_cov, overall = _coverage(catalog, best, threshold)
+
+    # 2-1. 충족 여부가 확정되지 않은 키워드(하한 < threshold 이고 정확하지 않음)가 있으면:
+    #      그 키워드를 모두 충족으로 본 상한이 top_k 하한 이상인 직무만 정확히 계산하고
+    #      커버리지를 다시 구한다 (상한이 더 낮은 직무는 정확히 계산해도 상위 top_k에 들 수 없다)
+    #      → 반환하는 직무의 커버리지와 부족 키워드 순위는 정확 검색과 같다
+    uncertain = ~exact & ~(best >= threshold)
+    if uncertain.any():
+        _, _, upper = _coverage(catalog, np.where(uncertain, np.inf, best), threshold)
+
+        if top_k is None or top_k >= len(overall):
+            contenders = np.arange(len(overall))
+        else:
+            kth = -np.partition(-overall, top_k - 1)[top_k - 1]
+            contenders = np.flatnonzero(upper >= kth)
+
+        in_contenders = np.isin(catalog.entry_job, contenders)
+        rescore = np.unique(catalog.entry_keyword[in_contenders & uncertain[catalog.entry_keyword]])
+        if len(rescore):
+            best[rescore] = catalog.store.scores(sentence_embeddings, rescore).max(axis=0)
+            hit, group_cov, overall = _coverage(catalog, best, threshold)
+
+    # 3. 정렬 (전체 커버리지 → 직무 순서)
+    order = np.argsort(-overall, kind="stable")
+    if top_k is not None:
+        order = order[:top_k]
+
+    # 4. 상위 직무만 부족 키워드 정리
+    #    항목은 직무 순서로 쌓여 있으므로 직무 구간은 이진 탐색으로 찾는다
+    spans = [np.searchsorted(catalog.entry_job, [job_pos, job_pos + 1]) for job_pos in order]
+    missing = [np.unique(catalog.entry_keyword[lo:hi][~hit[lo:hi]]) for lo, hi in spans]
+
+    results = []
+    for rank, (job_pos, missing_kw) in enumerate(zip(order, missing), start=1):
+        missing_kw = missing_kw[np.argsort(best[missing_kw], kind="stable")][:missing_k]
+
+        results.append({
+            "rank": rank,
+            "job_id": catalog.job_ids[job_pos],
+            "coverage_score": float(overall[job_pos]),
+            "group_coverage": {
+                name: float(group_cov[job_pos, g]) for g, name in enumerate(KEYWORD_GROUPS)
+            },
+            "top_missing": [catalog.vocab[k] for k in missing_kw],
+        })
+
+    return results
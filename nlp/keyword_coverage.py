@@ -4,17 +4,21 @@ keyword_coverage.py
 SBERT 기반 의미 매칭으로
 직무 핵심 키워드(Skills / Knowledge / Abilities)가
 자기소개서 문장에 얼마나 반영되었는지 분석하는 모듈.
+
+본문에 그대로 등장한 키워드는 lexical_matcher(Aho-Corasick)로 먼저 찾아
+span과 함께 매칭 처리하고, 나머지 키워드만 임베딩 유사도로 판단한다.
 """
 
 from __future__ import annotations
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import re
 import numpy as np
 
-from nlp.embedding import embed_sentences
+from nlp.embedding import DEFAULT_MODEL_NAME, embed_sentences
 from nlp.preprocessing import preprocess
 from nlp.loaders import load_raw_job_vectors
-from nlp.similarity import cosine_similarity
+from nlp.similarity import cosine_scores
+from nlp.lexical_matcher import find_keyword_spans
 
 
 # 설정
@@ -52,51 +56,117 @@ def collect_job_keywords_by_group(job_info: Dict) -> Dict[str, List[str]]:
     return groups
 
 
-# 의미 기반 키워드 매칭
-def semantic_keyword_match(
+# 키워드 × 문장 유사도 행렬
+def keyword_similarity_matrix(
+    keyword_embeddings: np.ndarray,
+    sentence_embeddings: np.ndarray
+) -> np.ndarray:
+    """
+    (num_keywords, num_sentences) 코사인 유사도 행렬.
+    증분 분석에서 바뀐 문장 열(column)만 다시 계산할 수 있도록 분리해둠.
+    """
+    if len(keyword_embeddings) == 0 or len(sentence_embeddings) == 0:
+        return np.zeros((len(keyword_embeddings), len(sentence_embeddings)), dtype=np.float32)
+
+    return cosine_scores(keyword_embeddings, sentence_embeddings)
+
+
+# 유사도 행렬 → 매칭 결과
+def summarize_keyword_matches(
     keywords: List[str],
     sentences: List[str],
-    sentence_embeddings: np.ndarray
+    sims: Optional[np.ndarray],
+    lexical_hits: Optional[Dict[str, List[Tuple[int, int, int]]]] = None,
 ) -> Dict:
+    """
+    키워드별 매칭 결과 요약.
 
+    본문에 그대로(또는 변형 형태로) 등장한 키워드(lexical_hits)는 유사도를 보지 않고
+    매칭 처리하며 문장 내 span을 남긴다. 나머지는 sims 행의 최대 유사도로 판단한다.
+    """
     if not keywords or not sentences:
         return {
             "matched": {},
             "missing": keywords,
-            "coverage_score": 0.0
+            "coverage_score": 0.0,
+            "highlights": {}
         }
 
-    keyword_embeddings = embed_sentences(keywords)
+    if lexical_hits is None:
+        lexical_hits = find_keyword_spans(keywords, sentences)
+
+    if sims is not None:
+        best_idx = sims.argmax(axis=1)
+        best_sim = sims[np.arange(len(keywords)), best_idx]
 
     matched = {}
     missing = []
-
-    for idx, kw_vec in enumerate(keyword_embeddings):
-        max_sim = 0.0
-        max_idx = -1
-
-        #  여기서 for로 문장/단어 각각 하나씩 비교
-        for sent_idx, sent_vec in enumerate(sentence_embeddings):
-            sim = cosine_similarity(kw_vec, sent_vec)
-            if sim > max_sim:
-                max_sim = sim
-                max_idx = sent_idx
-
-        if max_sim >= SIM_THRESHOLD:
-            matched[keywords[idx]] = {
-                "sentence": sentences[max_idx],
-                "similarity": round(float(max_sim), 3)
+    highlights: Dict[int, Dict] = {}
+
+    for idx, kw in enumerate(keywords):
+        hits = lexical_hits.get(kw)
+        if hits:
+            first_sent = hits[0][0]
+            matched[kw] = {
+                "sentence": sentences[first_sent],
+                "similarity": 1.0,
+                "match": "exact",
+                "spans": [[start, end] for sent_idx, start, end in hits if sent_idx == first_sent]
+            }
+            for sent_idx, start, end in hits:
+                entry = highlights.setdefault(sent_idx, {"sentence": sentences[sent_idx], "spans": []})
+                entry["spans"].append([start, end, kw])
+        elif sims is not None and best_sim[idx] >= SIM_THRESHOLD:
+            matched[kw] = {
+                "sentence": sentences[best_idx[idx]],
+                "similarity": round(float(best_sim[idx]), 3),
+                "match": "semantic"
             }
         else:
-            missing.append(keywords[idx])
+            missing.append(kw)
 
     coverage = round(len(matched) / len(keywords) * 100, 2) if keywords else 0.0
 
     return {
         "matched": matched,
         "missing": missing,
-        "coverage_score": coverage
+        "coverage_score": coverage,
+        "highlights": highlights
     }
+
+
+def _semantic_rows(keywords: List[str], lexical_hits: Dict) -> List[int]:
+    """정확 일치가 없어 임베딩 유사도가 필요한 키워드 위치"""
+    return [i for i, kw in enumerate(keywords) if kw not in lexical_hits]
+
+
+# 의미 기반 키워드 매칭
+def semantic_keyword_match(
+    keywords: List[str],
+    sentences: List[str],
+    sentence_embeddings: np.ndarray,
+    model_name: str = DEFAULT_MODEL_NAME,
+) -> Dict:
+    """
+    정확 일치(Aho-Corasick) → 나머지 키워드만 임베딩 유사도 순으로 매칭.
+    키워드는 문장 임베딩과 같은 인코더(model_name)로 임베딩한다.
+    """
+    if not keywords or not sentences:
+        return summarize_keyword_matches(keywords, sentences, None)
+
+    lexical_hits = find_keyword_spans(keywords, sentences)
+    rows = _semantic_rows(keywords, lexical_hits)
+
+    sims = np.zeros((len(keywords), len(sentences)), dtype=np.float32)
+    if rows:
+        keyword_embeddings = embed_sentences(
+            [keywords[i] for i in rows], model_name=model_name, normalize=True
+        )
+        sims[rows] = keyword_similarity_matrix(keyword_embeddings, sentence_embeddings)
+
+    return summarize_keyword_matches(keywords, sentences, sims, lexical_hits=lexical_hits)
+
+
 # 추천 문장 생성
 def generate_recommend_phrases(missing_keywords: List[str]) -> List[str]:
     templates = [
@@ -113,40 +183,20 @@ def generate_recommend_phrases(missing_keywords: List[str]) -> List[str]:
     return recs
 
 
-# 메인 분석 함수
-def analyze_keyword_coverage(job_id: int, essay_text: str) -> Dict:
-    """
-    report_builder에서 호출되는 메인 함수
-    """
-    # 직무 정보 로드
-    raw_jobs = load_raw_job_vectors()
-    job_info = raw_jobs.get(job_id)
-
-    if job_info is None:
-        return {}
-
-    # 전처리
-    prep = preprocess(essay_text)
-    sentences = prep["sentences"]
-
-    if not sentences:
-        return {}
-
-    sentence_embeddings = embed_sentences(sentences)
-
-    # 키워드 그룹 수집
-    groups = collect_job_keywords_by_group(job_info)
-
+# 그룹별 결과 → 최종 커버리지 리포트
+def build_coverage_report(group_matches: Dict[str, Dict]) -> Dict:
     group_results = {}
     all_matched = {}
     all_missing = []
 
-    for group_name, keywords in groups.items():
-        result = semantic_keyword_match(
-            keywords,
-            sentences,
-            sentence_embeddings
-        )
+    highlights: Dict[int, Dict] = {}
+
+    for group_name, result in group_matches.items():
+        for sent_idx, entry in result.get("highlights", {}).items():
+            merged = highlights.setdefault(sent_idx, {"sentence": entry["sentence"], "spans": []})
+            for span in entry["spans"]:
+                if span not in merged["spans"]:
+                    merged["spans"].append(span)
 
         group_results[group_name] = {
             "coverage_score": result["coverage_score"],
@@ -168,5 +218,123 @@ def analyze_keyword_coverage(job_id: int, essay_text: str) -> Dict:
         "matched_keywords": list(all_matched.keys()),
         "missing_keywords": list(set(all_missing)),
         "matched_evidence": all_matched,
-        "recommended_phrases": generate_recommend_phrases(all_missing)
-    }
\ No newline at end of file
+        "recommended_phrases": generate_recommend_phrases(all_missing),
+        # 정확히 등장한 키워드의 문장별 span (화면 하이라이트용)
+        "highlights": [
+            {
+                "sentence_index": sent_idx,
+                "sentence": entry["sentence"],
+                "spans": sorted(entry["spans"])
+            }
+            for sent_idx, entry in sorted(highlights.items())
+        ]
+    }
+
+
+def load_job_keyword_groups(job_id: int) -> Optional[Dict[str, List[str]]]:
+    """job_id → 키워드 그룹 (존재하지 않는 직무면 None)"""
+    job_info = load_raw_job_vectors().get(job_id)
+    if job_info is None:
+        return None
+    return collect_job_keywords_by_group(job_info)
+
+
+# 메인 분석 함수
+def analyze_keyword_coverage(
+    job_id: int,
+    essay_text: str,
+    sentences: Optional[List[str]] = None,
+    sentence_embeddings: Optional[np.ndarray] = None,
+    model_name: str = DEFAULT_MODEL_NAME,
+) -> Dict:
+    """
+    report_builder에서 호출되는 메인 함수
+
+    sentences / sentence_embeddings를 넘기면 전처리·문장 임베딩을 다시 하지 않는다.
+    model_name은 sentence_embeddings를 만든 인코더 (키워드도 같은 인코더로 임베딩).
+    """
+    # 직무 정보 로드 + 키워드 그룹 수집
+    groups = load_job_keyword_groups(job_id)
+
+    if groups is None:
+        return {}
+
+    # 전처리
+    if sentences is None:
+        prep = preprocess(essay_text)
+        sentences = prep["sentences"]
+
+    if not sentences:
+        return {}
+
+    if sentence_embeddings is None:
+        sentence_embeddings = embed_sentences(sentences, model_name=model_name, normalize=True)
+
+    group_matches = {
+        group_name: semantic_keyword_match(keywords, sentences, sentence_embeddings, model_name=model_name)
+        for group_name, keywords in groups.items()
+    }
+
+    return build_coverage_report(group_matches)
+
+
+# 여러 직무 한 번에
+def analyze_keyword_coverage_many(
+    job_ids: List[int],
+    sentences: List[str],
+    sentence_embeddings: np.ndarray,
+) -> Dict[int, Dict]:
+    """
+    여러 직무의 키워드 커버리지를 한 번에 계산 (build_multi_report용).
+
+    정확 일치하지 않은 키워드만 모든 직무·그룹에서 중복 없이 모아 한 번 임베딩하고,
+    키워드 × 문장 유사도도 행렬곱 한 번으로 구한 뒤 직무/그룹별 행만 골라 요약한다.
+    """
+    groups_by_job = {
+        job_id: load_job_keyword_groups(job_id)
+        for job_id in dict.fromkeys(job_ids)
+    }
+
+    if not sentences:
+        return {job_id: {} for job_id in groups_by_job}
+
+    # 정확 일치는 직무·그룹별로 먼저 찾고, 남은 키워드만 어휘에 모은다
+    lexical = {
+        (job_id, group_name): find_keyword_spans(keywords, sentences)
+        for job_id, groups in groups_by_job.items()
+        for group_name, keywords in (groups or {}).items()
+    }
+
+    vocab: Dict[str, int] = {}
+    for job_id, groups in groups_by_job.items():
+        for group_name, keywords in (groups or {}).items():
+            hits = lexical[(job_id, group_name)]
+            for kw in keywords:
+                if kw not in hits:
+                    vocab.setdefault(kw, len(vocab))
+
+    sims = None
+    if vocab:
+        keyword_embeddings = embed_sentences(list(vocab), normalize=True)
+        sims = keyword_similarity_matrix(keyword_embeddings, sentence_embeddings)
+
+    results = {}
+    for job_id, groups in groups_by_job.items():
+        if groups is None:
+            results[job_id] = {}
+            continue
+
+        group_matches = {}
+        for group_name, keywords in groups.items():
+            hits = lexical[(job_id, group_name)]
+            rows = np.zeros((len(keywords), len(sentences)), dtype=np.float32)
+            semantic = _semantic_rows(keywords, hits)
+            if semantic:
+                rows[semantic] = sims[[vocab[keywords[i]] for i in semantic]]
+            group_matches[group_name] = summarize_keyword_matches(
+                keywords, sentences, rows, lexical_hits=hits
+            )
+
+        results[job_id] = build_coverage_report(group_matches)
+
+    return results
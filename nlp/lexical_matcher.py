@@ -0,0 +1,201 @@
+"""
+lexical_matcher.py
+
+직무 키워드의 정확(어휘) 일치를 임베딩 없이 찾는 모듈.
+
+- 키워드 + 표기 변형(끝 조사 제거, '.'로 묶인 키워드 분리)을 Aho-Corasick 오토마톤 하나로 묶음
+- 문장을 한 번씩 훑어 모든 키워드 등장 위치(문자 span)를 선형 시간에 찾음
+- 오토마톤은 키워드 목록(직무·그룹)별로 한 번만 만들고 캐시
+- 영문 키워드는 대소문자 구분 없이 매칭
+- 단어 경계 검사: 영문/숫자는 앞뒤가 영문/숫자가 아니어야 하고 ("AI" ≠ "email", "SQL" ≠ "NoSQL"),
+  한글은 바로 앞 글자가 한글이 아니어야 한다 ("안전" ≠ "불안전", 뒤에 붙는 조사·어미는 허용)
+- '~능력'·'~하기'·'~적' 을 뗀 어간("운동능력" → "운동")은 뜻이 달라질 수 있어
+  정확 일치로 보지 않고 의미 매칭(임베딩 유사도)에 맡긴다
+
+keyword_coverage에서 정확히 등장한 키워드는 의미 매칭 없이 매칭 처리하고,
+나머지 키워드만 임베딩 유사도로 판단한다.
+"""
+
+from __future__ import annotations
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# 변형 생성 시 키워드 끝에서 떼어낼 조사
+# ('~능력'·'~하기'·'~적' 같은 접미 표현은 떼지 않는다 → 의미 매칭에서 판단)
+_KEYWORD_JOSA = ("과", "와", "의")
+
+# 이보다 짧은 변형은 오탐이 많아 쓰지 않는다
+MIN_VARIANT_LENGTH = 2
+
+
+def keyword_variants(keyword: str) -> List[str]:
+    """
+    키워드 → 본문에서 찾을 표기 목록 (원형 포함, 중복 없음)
+
+    예) "안전과" → ["안전과", "안전"], "발견.수리" → ["발견.수리", "발견", "수리"],
+        "대인관계능력" → ["대인관계능력"]
+    """
+    keyword = keyword.strip()
+    variants = [keyword]
+
+    for part in keyword.split("."):
+        variants.append(part)
+
+    for base in list(variants):
+        for josa in _KEYWORD_JOSA:
+            if base.endswith(josa):
+                variants.append(base[: -len(josa)])
+
+    return [
+        v for v in dict.fromkeys(v.strip().lower() for v in variants)
+        if len(v) >= MIN_VARIANT_LENGTH
+    ]
+
+
+def _is_alnum(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+def _is_hangul(ch: str) -> bool:
+    return "가" <= ch <= "힣"
+
+
+def _on_boundary(text: str, start: int, end: int) -> bool:
+    """text[start:end] 가 단어 중간에서 잘린 부분 문자열이 아닌지"""
+    before = text[start - 1] if start > 0 else ""
+    after = text[end] if end < len(text) else ""
+    first, last = text[start], text[end - 1]
+
+    if _is_alnum(first) and before and _is_alnum(before):
+        return False
+    if _is_alnum(last) and after and _is_alnum(after):
+        return False
+    # 한글은 뒤에 조사·어미가 붙는 것은 허용, 앞에 다른 음절이 붙은 경우만 거른다
+    if _is_hangul(first) and before and _is_hangul(before):
+        return False
+    return True
+
+
+class AhoCorasick:
+    """
+    여러 패턴을 한 번의 순회로 찾는 Aho-Corasick 오토마톤.
+    상태 전이는 문자 → 상태 dict, 실패 링크는 BFS로 계산한다.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for idx, pattern in enumerate(self.patterns):
+            self._insert(pattern, idx)
+        self._link()
+
+    def _insert(self, pattern: str, idx: int):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(idx)
+
+    def _link(self):
+        # 루트의 자식은 실패 링크가 루트(0)이므로 그 다음 깊이부터 계산
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+
+                # 실패 링크 쪽에서 끝나는 패턴도 함께 출력
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """(start, end, 패턴 번호)를 끝 위치 순서로 yield"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for idx in out[state]:
+                yield i + 1 - len(self.patterns[idx]), i + 1, idx
+
+
+class LexicalMatcher:
+    """키워드 목록 하나에 대한 오토마톤 + 변형 → 원 키워드 매핑"""
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = list(keywords)
+
+        patterns: List[str] = []
+        self._owners: List[List[int]] = []
+        pattern_pos: Dict[str, int] = {}
+
+        for kw_idx, kw in enumerate(self.keywords):
+            for variant in keyword_variants(kw):
+                pos = pattern_pos.get(variant)
+                if pos is None:
+                    pos = pattern_pos[variant] = len(patterns)
+                    patterns.append(variant)
+                    self._owners.append([])
+                self._owners[pos].append(kw_idx)
+
+        self._automaton = AhoCorasick(patterns)
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """text 안의 키워드 등장 위치 [(start, end, keyword), ...]"""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # 소문자 변환으로 길이가 바뀌는 문자가 있으면 원문 그대로 매칭 (span 보존)
+            lowered = text
+
+        hits = []
+        for start, end, idx in self._automaton.iter_matches(lowered):
+            if not _on_boundary(lowered, start, end):
+                continue
+            for kw_idx in self._owners[idx]:
+                hits.append((start, end, self.keywords[kw_idx]))
+        return hits
+
+    def find_in_sentences(self, sentences: Sequence[str]) -> Dict[str, List[Tuple[int, int, int]]]:
+        """
+        키워드 → [(문장 번호, start, end), ...] (등장한 키워드만)
+        span은 각 문장 문자열 기준이다.
+        """
+        hits: Dict[str, List[Tuple[int, int, int]]] = {}
+        for sent_idx, sent in enumerate(sentences):
+            for start, end, kw in self.find(sent):
+                hits.setdefault(kw, []).append((sent_idx, start, end))
+        return hits
+
+
+@lru_cache(maxsize=2048)
+def _cached_matcher(keywords: Tuple[str, ...]) -> LexicalMatcher:
+    return LexicalMatcher(keywords)
+
+
+def get_lexical_matcher(keywords: Sequence[str]) -> LexicalMatcher:
+    """같은 키워드 목록(직무·그룹)에는 같은 오토마톤을 재사용"""
+    return _cached_matcher(tuple(keywords))
+
+
+def find_keyword_spans(
+    keywords: Sequence[str],
+    sentences: Sequence[str],
+) -> Dict[str, List[Tuple[int, int, int]]]:
+    if not keywords or not sentences:
+        return {}
+    return get_lexical_matcher(keywords).find_in_sentences(sentences)
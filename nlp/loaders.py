@@ -1,7 +1,14 @@
 from pathlib import Path
+from typing import Callable, Dict, List
 import json
+import threading
 import numpy as np
 
+from nlp.artifacts import derived_artifact, hot_artifact, watch_files
+from nlp.online_store import current_delta, delta_records, delta_signature, job_delta
+from nlp.quantization import EMBED_STORAGE, QuantizedMatrix, load_quantized, quantized_path
+from nlp.similarity import l2_normalize
+
 # NLP_final 프로젝트 루트 기준
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -11,6 +18,7 @@ DATA_DIR = BASE_DIR / "selfintro_app" / "scripts" / "data"
 
 JOB_EMBED_PATH = DATA_DIR / "career_job_vectors_embed.json"
 COMPANY_EMBED_PATH = DATA_DIR / "company_profiles_embed.json"
+COMPANY_PROFILE_PATH = DATA_DIR / "company_profiles.json"
 
 
 def load_job_embeddings():
@@ -25,18 +33,206 @@ def load_company_embeddings():
     return {item["company_id"]: item for item in data}
 
 
+# 벡터 인덱스 (프로세스 당 한 번만 로드)
+
+class VectorIndex:
+    """
+    id 리스트와 (n, dim) 임베딩 행렬을 함께 보관하는 읽기 전용 인덱스.
+    JSON을 매 요청마다 다시 읽지 않도록 한 번 만든 뒤 공유해서 사용한다.
+
+    임베딩은 QuantizedMatrix(float32 / float16 / int8 / pca)로 보관하고,
+    scores()는 압축된 형식 그대로 계산한다. matrix는 float32 복원본이다.
+    """
+
+    def __init__(self, ids: List, matrix, version: int = 0):
+        self.ids = list(ids)
+        self.store = matrix if isinstance(matrix, QuantizedMatrix) else QuantizedMatrix("float32", matrix)
+        self.version = version
+        self._positions = {item_id: pos for pos, item_id in enumerate(self.ids)}
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self.store.matrix
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, item_id) -> bool:
+        return item_id in self._positions
+
+    def position(self, item_id) -> int:
+        return self._positions[item_id]
+
+    def get(self, item_id) -> np.ndarray:
+        return self.store.rows(self._positions[item_id])
+
+    def scores(self, queries: np.ndarray, positions=None) -> np.ndarray:
+        """질의 (nq, dim) → 인덱스 행(또는 positions 행)과의 코사인 (nq, n)"""
+        return self.store.scores(queries, positions)
+
+    def extend(self, ids: List, matrix: np.ndarray, version: int) -> "VectorIndex":
+        """새 행만 붙인 새 인덱스 (기존 인덱스는 그대로 — 사용 중인 요청은 이전 버전으로 끝난다)"""
+        return VectorIndex(self.ids + list(ids), self.store.append(matrix), version)
+
+
+def _build_index(records: List[Dict], id_key: str) -> VectorIndex:
+    """임베딩은 로드 시점에 한 번 L2 정규화한 float32 행렬로 보관"""
+    ids = [item[id_key] for item in records]
+    matrix = l2_normalize(np.array([item["embedding"] for item in records], dtype=np.float32))
+    return VectorIndex(ids, matrix)
+
+
+def _load_index(embed_path: Path, id_key: str) -> VectorIndex:
+    """NLP_EMBED_STORAGE 변형 파일이 현재 JSON 원본으로 만든 것이면 그것을, 아니면 JSON 원본을 로드"""
+    if EMBED_STORAGE != "float32":
+        loaded = load_quantized(quantized_path(embed_path, EMBED_STORAGE), source=embed_path)
+        if loaded is not None:
+            return VectorIndex(*loaded)
+
+    with open(embed_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return _build_index(data, id_key)
+
+
+# 원본 파일(또는 NLP_EMBED_STORAGE 변형)이 다시 게시되면 artifacts watcher가 새로 로드해 교체
+
+@hot_artifact(JOB_EMBED_PATH, quantized_path(JOB_EMBED_PATH, EMBED_STORAGE))
+def _load_base_job_index() -> VectorIndex:
+    return _load_index(JOB_EMBED_PATH, "job_cd")
+
+
+@hot_artifact(COMPANY_EMBED_PATH, quantized_path(COMPANY_EMBED_PATH, EMBED_STORAGE))
+def _load_base_company_index() -> VectorIndex:
+    return _load_index(COMPANY_EMBED_PATH, "company_id")
+
+
+class LiveIndex:
+    """
+    원본 인덱스 + online_store delta → 현재 버전 VectorIndex.
+
+    호출마다 delta 파일 stat만 확인하고, 바뀌었으면 아직 없는 delta 행만 붙인
+    새 VectorIndex를 만들어 참조를 교체한다. 재시작이나 기존 행 재인코딩이 없다.
+    원본 인덱스 자체가 교체되면(artifacts watcher) 새 원본에 delta를 다시 붙인다.
+    원본에 이미 있는 id의 delta 행은 건너뛴다 (추가한 레코드를 포함해 원본을 다시 빌드한 경우).
+    """
+
+    def __init__(self, kind: str, load_base: Callable[[], VectorIndex]):
+        self.kind = kind
+        self._load_base = load_base
+        self._lock = threading.Lock()
+        self._current = None
+        self._base = None
+        self._signature = None
+
+    def current(self) -> VectorIndex:
+        signature = delta_signature(self.kind)
+        base = self._load_base()
+        current = self._current
+        if current is not None and signature == self._signature and base is self._base:
+            return current
+
+        with self._lock:
+            if self._current is None or signature != self._signature or base is not self._base:
+                self._current = self._refresh(base)
+                self._base = base
+                self._signature = signature
+            return self._current
+
+    def _refresh(self, base: VectorIndex) -> VectorIndex:
+        delta = current_delta(self.kind)
+        rows = [i for i, item_id in enumerate(delta.ids) if item_id not in base]
+        ids = [delta.ids[i] for i in rows]
+
+        current = self._current
+        if (
+            current is None
+            or base is not self._base
+            or current.ids[len(base):] != ids[:len(current) - len(base)]
+        ):
+            # 처음 로드 / 원본 교체 / delta 초기화 → 원본부터 다시
+            current = base
+
+        have = len(current) - len(base)
+        if have < len(rows):
+            current = current.extend(ids[have:], delta.embeddings[rows[have:]], delta.version)
+        return current
+
+
+_LIVE_INDEXES = {
+    "job": LiveIndex("job", _load_base_job_index),
+    "company": LiveIndex("company", _load_base_company_index),
+}
+
+
+def load_job_index() -> VectorIndex:
+    return _LIVE_INDEXES["job"].current()
+
+
+def load_company_index() -> VectorIndex:
+    return _LIVE_INDEXES["company"].current()
+
+
 def get_job_vector(job_id: str) -> np.ndarray:
-    jobs = load_job_embeddings()
-    if job_id not in jobs:
+    index = load_job_index()
+    if job_id not in index:
         raise ValueError(f"존재하지 않는 job_id: {job_id}")
-    return np.array(jobs[job_id]["embedding"], dtype=float)
+    return index.get(job_id)
 
 
 def get_company_vector(company_id: str) -> np.ndarray:
-    companies = load_company_embeddings()
-    if company_id not in companies:
+    index = load_company_index()
+    if company_id not in index:
         raise ValueError(f"존재하지 않는 company_id: {company_id}")
-    return np.array(companies[company_id]["embedding"], dtype=float)
+    return index.get(company_id)
+
+
+# UI용 메타데이터 (임베딩 제외)
+
+JOB_META_FIELDS = ("job_nm", "top_nm", "aptit_name")
+COMPANY_META_FIELDS = ("company_name", "industry")
+
+
+def load_job_meta() -> Dict[int, Dict]:
+    """
+    드롭다운 구성에 필요한 직무 메타데이터(id, 이름, 분류)만 로드.
+    768차원 임베딩이 없는 RAW 직무 데이터(load_raw_job_vectors, 캐시됨)에서 뽑는다.
+    """
+    # online_store로 추가된 직무 포함 (원본에 이미 있으면 원본 우선)
+    return {
+        job_cd: {field: item.get(field) for field in JOB_META_FIELDS}
+        for job_cd, item in load_raw_job_vectors().items()
+    }
+
+
+def load_company_meta() -> Dict[str, Dict]:
+    """기업 드롭다운용 메타데이터(id, 이름, 산업)만 로드."""
+    with open(COMPANY_PROFILE_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    meta = {
+        item["company_id"]: {field: item.get(field) for field in COMPANY_META_FIELDS}
+        for item in data
+    }
+    for company_id, item in delta_records("company").items():
+        meta.setdefault(company_id, {field: item.get(field) for field in COMPANY_META_FIELDS})
+    return meta
+
+
+def build_job_tree(job_meta: Dict[int, Dict]) -> Dict[str, Dict[str, List[int]]]:
+    """
+    직무 메타데이터 → 대분류 / 중분류 / 직무 id 3단 트리.
+    """
+    job_tree = {}
+
+    for job_cd, job in job_meta.items():
+        top = job.get("top_nm") or "기타"
+        mid = job.get("aptit_name") or "기타"
+
+        job_tree.setdefault(top, {})
+        job_tree[top].setdefault(mid, [])
+        job_tree[top][mid].append(job_cd)
+
+    return job_tree
 
 
 if __name__ == "__main__":
@@ -63,16 +259,31 @@ if __name__ == "__main__":
 # RAW 직무 데이터 로딩 (career_job_vectors.json)
 RAW_JOB_VECTORS_PATH = DATA_DIR / "career_job_vectors.json"
 
-def load_raw_job_vectors() -> dict:
-    """임베딩 되기 전 RAW 직무 데이터 로드"""
+# 메타데이터 원본이 다시 게시되면 UI 캐시 키(artifacts.generation)가 바뀌도록
+watch_files(RAW_JOB_VECTORS_PATH, COMPANY_PROFILE_PATH)
+
+@hot_artifact(RAW_JOB_VECTORS_PATH)
+def _load_base_raw_jobs() -> Dict[int, Dict]:
+    """원본 RAW 직무 파일 → job_cd 맵 (프로세스 당 한 번 파싱, 다시 게시되면 watcher가 교체)"""
     with open(RAW_JOB_VECTORS_PATH, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    # job_cd → job_info 맵으로 변환
-    job_map = {}
-    for item in data:
-        job_cd = item.get("job_cd")
-        if job_cd is not None:
-            job_map[int(job_cd)] = item
+    return {
+        int(item["job_cd"]): item
+        for item in data
+        if item.get("job_cd") is not None
+    }
+
+
+@derived_artifact(_load_base_raw_jobs, job_delta)
+def load_raw_job_vectors(base: Dict[int, Dict], delta) -> dict:
+    """
+    임베딩 되기 전 RAW 직무 데이터 (job_cd → job_info, online_store로 추가된 직무 포함).
 
-    return job_map
\ No newline at end of file
+    원본 파일은 hot_artifact로 한 번만 파싱하고, delta가 바뀌었거나 원본이 교체됐을 때만
+    다시 병합한다. 반환한 dict는 여러 요청이 공유하므로 수정하지 않는다.
+    """
+    job_map = dict(base)
+    for job_cd, item in delta.by_id.items():
+        job_map.setdefault(job_cd, item)
+    return job_map
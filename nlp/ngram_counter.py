@@ -0,0 +1,91 @@
+"""
+ngram_counter.py
+
+반복 구절 탐지를 위한 단일 패스 다중 차수 n-gram 카운터.
+
+- 토큰 문자열을 정수 id로 intern
+- 각 위치에서 2~4gram 창(window)을 id 비트 패킹으로 한 번에 키로 만듦
+  (차수마다 비트 길이 범위가 달라 서로 다른 n-gram이 같은 키를 갖지 않음)
+- 임계값 이상 등장한 n-gram만 문자열로 복원
+- 더 긴 반복 구절에 포함되면서 등장 횟수가 같은 짧은 구절은 선택적으로 제거
+
+5~10k자 분량의 긴 자소서도 토큰 수에 선형인 시간과 정수 키 메모리로 처리한다.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Sequence
+
+
+def count_repeated_ngrams(
+    tokens: Sequence[str],
+    min_n: int = 2,
+    max_n: int = 4,
+    threshold: int = 2,
+    suppress_subsumed: bool = False,
+) -> Dict[str, int]:
+    """
+    tokens에서 min_n ~ max_n gram 중 threshold회 이상 등장한 구절을 센다.
+
+    반환 순서는 기존 방식과 같다: 차수(n) 오름차순, 같은 차수 안에서는 첫 등장 순.
+    """
+    if min_n < 1 or max_n < min_n:
+        raise ValueError("1 <= min_n <= max_n 이어야 합니다.")
+
+    # 1) intern: 토큰 → id (0은 비워두기 위해 1부터)
+    vocab: Dict[str, int] = {}
+    ids: List[int] = []
+    for tok in tokens:
+        ids.append(vocab.setdefault(tok, len(vocab) + 1))
+
+    if not ids:
+        return {}
+
+    bits = len(vocab).bit_length()
+    num_tokens = len(ids)
+
+    # 2) 단일 패스 카운팅 (문자열 생성 없음)
+    counts: Dict[int, int] = {}
+    for i in range(num_tokens):
+        key = 0
+        for n in range(1, min(max_n, num_tokens - i) + 1):
+            key = (key << bits) | ids[i + n - 1]
+            if n >= min_n:
+                counts[key] = counts.get(key, 0) + 1
+
+    repeated = {key: cnt for key, cnt in counts.items() if cnt >= threshold}
+
+    def order(key: int) -> int:
+        return -(-key.bit_length() // bits)
+
+    # 3) 더 긴 반복 구절에 흡수되는 짧은 구절 제거
+    if suppress_subsumed:
+        subsumed = set()
+        for key, cnt in repeated.items():
+            n = order(key)
+            if n <= min_n:
+                continue
+            prefix = key >> bits
+            suffix = key & ((1 << (bits * (n - 1))) - 1)
+            for sub in (prefix, suffix):
+                if repeated.get(sub) == cnt:
+                    subsumed.add(sub)
+        repeated = {key: cnt for key, cnt in repeated.items() if key not in subsumed}
+
+    # 4) 임계값을 넘은 n-gram만 문자열로 복원
+    id_to_token = [""] * (len(vocab) + 1)
+    for tok, idx in vocab.items():
+        id_to_token[idx] = tok
+
+    mask = (1 << bits) - 1
+    decoded = []
+    for key, cnt in repeated.items():
+        n = order(key)
+        parts = []
+        for shift in range(n - 1, -1, -1):
+            parts.append(id_to_token[(key >> (bits * shift)) & mask])
+        decoded.append((n, " ".join(parts), cnt))
+
+    # dict 삽입 순서 = 첫 등장 순이므로 차수 기준 안정 정렬만 하면 된다
+    decoded.sort(key=lambda item: item[0])
+
+    return {phrase: cnt for _, phrase, cnt in decoded}
@@ -0,0 +1,232 @@
+"""
+online_store.py
+
+기업 / 직무를 전체 재빌드 없이 하나씩 추가하는 append 전용 delta 저장소.
+
+- 원본(company_profiles_embed.json, career_job_vectors_embed.json)은 건드리지 않고,
+  추가된 레코드만 data/company_delta.npz, data/job_delta.npz 에 쌓는다
+  (ids / 정규화 float32 임베딩 / 레코드 JSON / version)
+- 추가할 때는 새 레코드 하나만 임베딩 — 병합 문장과 인코딩은 빌드 스크립트
+  (build_job_embeddings.py / build_company_embeddings.py)와 같은 embed_records()를 쓴다
+- 쓰기는 artifacts.atomic_write (임시 파일 → os.replace) → 읽는 쪽은 항상 완전한 파일만 본다
+  여러 프로세스가 동시에 추가해도 잠금 파일(flock)로 순서대로 처리
+- 읽는 쪽은 current_delta()로 delta 파일의 stat(mtime, size)만 보고 바뀌었을 때만 다시 읽는다
+  (nlp.loaders는 기존 인덱스 뒤에 새 행만 붙인 새 인덱스로 교체, 기존 행 재인코딩 없음)
+  RAW 직무 데이터, BM25 색인, 키워드 카탈로그, 직무 그래프도 job_delta() / 현재 인덱스를
+  원천으로 하는 derived_artifact 라서 추가된 레코드가 검색 · 순위 · 이웃 조회에 바로 반영된다
+- 원본을 다시 빌드해 추가했던 레코드가 원본에 들어가면, 읽는 쪽은 원본에 있는 id의
+  delta 레코드를 건너뛴다 (원본 우선, 중복 id 없음)
+
+CLI: selfintro_app/scripts/append_record.py
+"""
+
+from __future__ import annotations
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from nlp.artifacts import atomic_write, file_lock, watch_files
+from nlp.similarity import l2_normalize
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "selfintro_app" / "scripts" / "data"
+
+DELTA_PATHS = {
+    "job": DATA_DIR / "job_delta.npz",
+    "company": DATA_DIR / "company_delta.npz",
+}
+ID_KEYS = {"job": "job_cd", "company": "company_id"}
+
+# 다른 프로세스(append_record.py)가 추가해도 UI 캐시 키(artifacts.generation)가 바뀌도록
+watch_files(*DELTA_PATHS.values())
+
+# build_job_embeddings.py / build_company_embeddings.py 와 같은 모델
+STORE_MODEL_NAME = "jhgan/ko-sbert-multitask"
+
+
+class Delta:
+    """원본 뒤에 붙는 추가 레코드 (append 순서 유지)"""
+
+    def __init__(self, ids: List, embeddings: np.ndarray, records: List[Dict], version: int):
+        self.ids = list(ids)
+        self.embeddings = np.asarray(embeddings, dtype=np.float32)
+        self.records = list(records)
+        self.version = version
+        # id → 레코드 (읽기 전용, 메타데이터 병합용)
+        self.by_id = dict(zip(self.ids, self.records))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+# 레코드 임베딩 (빌드 스크립트 / append_record 공용)
+
+def company_embedding_text(c: Dict) -> str:
+    return (
+        f"기업명: {c.get('company_name')}. "
+        f"산업: {c.get('industry', '')}. "
+        f"기업요약: {c.get('summary', '')}. "
+        f"핵심가치: {c.get('values', '')}. "
+        f"인재상: {c.get('talent', '')}. "
+        f"기술키워드: {c.get('tech_keywords', '')}. "
+    )
+
+
+def job_embedding_text(job: Dict) -> str:
+    return (
+        f"직업명: {job.get('job_nm')}. "
+        f"설명: {job.get('work_summary', '')}. "
+        f"핵심능력: {', '.join(job.get('main_abilities', []))}. "
+        f"스킬: {', '.join(job.get('skills', []))}. "
+        f"지식요소: {', '.join(job.get('knowledge', []))}. "
+    )
+
+
+_EMBEDDING_TEXT = {"job": job_embedding_text, "company": company_embedding_text}
+
+
+def embed_records(kind: str, records: List[Dict]) -> np.ndarray:
+    """
+    레코드 → (len(records), dim) raw 임베딩 (정규화 전).
+
+    병합 문장 하나를 model.encode에 그대로 넘긴다 (모델 최대 길이에서 잘림).
+    원본 인덱스와 delta가 같은 레코드에 같은 벡터를 갖도록 양쪽 모두 이 함수만 쓴다.
+    """
+    _check_kind(kind)
+    from nlp.embedding import get_sbert_model
+
+    texts = [_EMBEDDING_TEXT[kind](r) for r in records]
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.asarray(
+        get_sbert_model(STORE_MODEL_NAME).encode(texts, convert_to_numpy=True),
+        dtype=np.float32,
+    )
+
+
+# 읽기
+
+def _check_kind(kind: str):
+    if kind not in DELTA_PATHS:
+        raise ValueError(f"지원하지 않는 레코드 종류: {kind}")
+
+
+def delta_signature(kind: str) -> Optional[Tuple[int, int]]:
+    """delta 파일의 (mtime_ns, size) — 없으면 None (변경 감지용, 파일을 열지 않는다)"""
+    _check_kind(kind)
+    try:
+        stat = DELTA_PATHS[kind].stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_delta(kind: str) -> Delta:
+    _check_kind(kind)
+    path = DELTA_PATHS[kind]
+    if not path.exists():
+        return Delta([], np.zeros((0, 0), dtype=np.float32), [], 0)
+
+    with np.load(path, allow_pickle=False) as data:
+        return Delta(
+            data["ids"].tolist(),
+            data["embeddings"],
+            [json.loads(r) for r in data["records"].tolist()],
+            int(data["version"]),
+        )
+
+
+_CACHE: Dict[str, Tuple[Optional[Tuple[int, int]], Delta]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def current_delta(kind: str) -> Delta:
+    """
+    delta 파일 stat이 그대로면 이전에 읽은 Delta를 그대로 반환 (요청마다 npz를 다시 읽지 않는다).
+    """
+    signature = delta_signature(kind)
+    cached = _CACHE.get(kind)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _CACHE_LOCK:
+        cached = _CACHE.get(kind)
+        if cached is None or cached[0] != signature:
+            cached = (signature, load_delta(kind))
+            _CACHE[kind] = cached
+        return cached[1]
+
+
+def job_delta() -> Delta:
+    """current_delta("job") — derived_artifact 원천용"""
+    return current_delta("job")
+
+
+def company_delta() -> Delta:
+    """current_delta("company") — derived_artifact 원천용"""
+    return current_delta("company")
+
+
+def delta_records(kind: str) -> Dict:
+    """id → 레코드 (메타데이터 / RAW 직무 데이터 병합용, 읽기 전용)"""
+    return current_delta(kind).by_id
+
+
+# 쓰기
+
+def append_record(
+    kind: str,
+    record: Dict,
+    existing_ids=(),
+    embedding: Optional[np.ndarray] = None,
+    expected_dim: Optional[int] = None,
+) -> int:
+    """
+    레코드 하나를 임베딩해 delta 저장소에 추가하고 새 version을 반환한다.
+
+    existing_ids : 원본 인덱스에 이미 있는 id (중복 추가 방지)
+    embedding    : 이미 계산한 벡터가 있으면 재사용 (없으면 STORE_MODEL_NAME으로 임베딩)
+    expected_dim : 원본 인덱스 차원 (다른 모델로 만든 벡터가 섞이지 않도록 확인)
+    """
+    _check_kind(kind)
+    id_key = ID_KEYS[kind]
+    item_id = record.get(id_key)
+    if item_id is None:
+        raise ValueError(f"레코드에 {id_key}가 없습니다.")
+    if kind == "job":
+        item_id = record[id_key] = int(item_id)
+
+    if embedding is None:
+        embedding = embed_records(kind, [record])[0]
+    embedding = l2_normalize(np.asarray(embedding, dtype=np.float32)[None, :])
+    if expected_dim is not None and embedding.shape[1] != expected_dim:
+        raise ValueError(f"임베딩 차원이 다릅니다: {embedding.shape[1]} (원본 {expected_dim})")
+
+    path = DELTA_PATHS[kind]
+    with file_lock(path):
+        delta = load_delta(kind)
+        if item_id in existing_ids or item_id in delta.ids:
+            raise ValueError(f"이미 존재하는 {id_key}: {item_id}")
+        if len(delta) and delta.embeddings.shape[1] != embedding.shape[1]:
+            raise ValueError(
+                f"임베딩 차원이 다릅니다: {embedding.shape[1]} (저장소 {delta.embeddings.shape[1]})"
+            )
+
+        embeddings = embedding if not len(delta) else np.vstack([delta.embeddings, embedding])
+        version = delta.version + 1
+
+        with atomic_write(path) as f:
+            np.savez(
+                f,
+                ids=np.asarray(delta.ids + [item_id]),
+                embeddings=embeddings,
+                records=np.asarray(
+                    [json.dumps(r, ensure_ascii=False) for r in delta.records + [record]]
+                ),
+                version=np.asarray(version),
+            )
+
+    return version
@@ -5,7 +5,7 @@ preprocessing.py
 - 공백/특수문자 정리
 - 문장 단위 분리
 - 규칙 기반 정규화
-- 형태소 기반 정규화 (Mecab)
+- 형태소 기반 정규화 (nlp.tokenization 공유 토큰 배열)
 - 맞춤법 교정(옵션)
 - SBERT 기반 의미 카테고리 라벨링
 """
@@ -13,7 +13,19 @@ preprocessing.py
 from __future__ import annotations
 import re
 import numpy as np
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Sequence, Tuple, Union
+
+
+# 미리 컴파일한 정규식 (호출마다 재컴파일하지 않음)
+_HTML_SPACE = re.compile(r"&nbsp;|&emsp;|&ensp;")
+_MULTI_NEWLINE = re.compile(r"\n{2,}")
+_WHITESPACE = re.compile(r"\s+")
+_LINE_END = re.compile(r"([가-힣0-9])\n")
+_NOISE = re.compile(r"[^가-힣0-9a-zA-Z\s.,!?]")
+
+# clean_basic → enforce_sentence_end → remove_noise 를 한 번에:
+# 허용 문자 밖의 문자(공백 포함)가 이어진 구간을 공백 하나로 바꾼다
+_NOISE_OR_SPACE = re.compile(r"[^가-힣0-9a-zA-Z.,!?]+")
 
 
 def clean_basic(text: str) -> str:
@@ -24,14 +36,14 @@ def clean_basic(text: str) -> str:
         return ""
 
     # Word 복붙 시 생기는 HTML 스페이스 제거
-    text = re.sub(r"&nbsp;|&emsp;|&ensp;", " ", text)
+    text = _HTML_SPACE.sub(" ", text)
 
     # 줄바꿈 정리
     text = text.replace("\r", "\n")
-    text = re.sub(r"\n{2,}", "\n", text)
+    text = _MULTI_NEWLINE.sub("\n", text)
 
     # 연속 공백 → 1개
-    text = re.sub(r"\s+", " ", text)
+    text = _WHITESPACE.sub(" ", text)
 
     return text.strip()
 
@@ -41,7 +53,7 @@ def enforce_sentence_end(text: str) -> str:
     줄바꿈으로 문장이 끝나는 경우 뒤에 마침표 자동 부여.
     '문제 해결\n다음 문장' → '문제 해결.\n다음 문장'
     """
-    text = re.sub(r"([가-힣0-9])\n", r"\1.\n", text)
+    text = _LINE_END.sub(r"\1.\n", text)
     return text
 
 
@@ -50,52 +62,86 @@ def remove_noise(text: str) -> str:
     NLP 분석에 방해되는 특수문자 제거.
     URL, 이메일, 기본 문장부호는 유지.
     """
-    text = re.sub(r"[^가-힣0-9a-zA-Z\s.,!?]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _NOISE.sub(" ", text)
+    text = _WHITESPACE.sub(" ", text).strip()
     return text
 
 
-def normalize_text_rule_based(text: str) -> str:
+def clean_fast(text: str) -> str:
     """
-    가장 기본적인 표현 통일만 수행 
+    clean_basic → enforce_sentence_end → remove_noise 와 같은 결과를 한 번의 치환으로 만든다.
+    (clean_basic이 줄바꿈을 모두 공백으로 바꾸므로 enforce_sentence_end는 이 순서에서 효과가 없다)
     """
-    rules = [
-        (r"하였습니다", "했습니다"),
-        (r"하였습니다", "했습니다"),
-        (r"하였다", "했다"),
-        (r"해결함으로써", "해결하여"),
-        (r"수행하였습니다", "수행했습니다"),
-    ]
+    if not text:
+        return ""
+    text = _HTML_SPACE.sub(" ", text)
+    return _NOISE_OR_SPACE.sub(" ", text).strip()
+
+
+# 규칙 기반 표현 통일 (문자열 그대로 치환)
+NORMALIZATION_RULES: List[Tuple[str, str]] = [
+    ("하였습니다", "했습니다"),
+    ("하였다", "했다"),
+    ("해결함으로써", "해결하여"),
+    ("수행하였습니다", "수행했습니다"),
+]
+
+
+def compile_rules(rules: Sequence[Tuple[str, str]]) -> Callable[[str], str]:
+    """
+    (찾을 문자열, 바꿀 문자열) 규칙표 → 단일 alternation 정규식 치환 함수.
+
+    긴 규칙부터 시도하므로 텍스트를 한 번만 훑으며 가장 긴 규칙이 이긴다.
+    규칙 결과가 다른 규칙의 입력이 되는 연쇄 치환은 하지 않는다.
+    """
+    table: Dict[str, str] = {}
     for pattern, repl in rules:
-        text = re.sub(pattern, repl, text)
-    return text
+        table.setdefault(pattern, repl)
 
+    if not table:
+        return lambda text: text
 
+    alternation = re.compile(
+        "|".join(re.escape(p) for p in sorted(table, key=len, reverse=True))
+    )
 
-try:
-    from konlpy.tag import Mecab
-    mecab = Mecab()
-except Exception:
-    mecab = None
+    def replace(text: str) -> str:
+        return alternation.sub(lambda m: table[m.group(0)], text)
+
+    return replace
 
 
-def normalize_text_morphological(text: str) -> str:
+_normalize_default = compile_rules(NORMALIZATION_RULES)
+
+
+def normalize_text_rule_based(text: str) -> str:
     """
-    Mecab을 사용해 동사/형용사를 기본형에 가까운 형태로 정규화.
+    가장 기본적인 표현 통일만 수행 
     """
-    if mecab is None:
-        return text
+    return _normalize_default(text)
 
-    tokens = mecab.pos(text)
-    normalized = []
 
-    for word, tag in tokens:
-        if tag.startswith("VV") or tag.startswith("VA"):   # 동사/형용사
-            normalized.append(word)
-        else:
-            normalized.append(word)
+from nlp.tokenization import Token, tokenize, morphs
+from nlp.segmentation import SEGMENTATION_BACKENDS, segment_many, split_sentences as segment_split
+from nlp.similarity import cosine_scores, l2_normalize
+
+
+def normalize_text_morphological(
+    text: str,
+    tokens: Optional[Sequence[Token]] = None,
+    backend: Optional[str] = None,
+) -> str:
+    """
+    형태소 단위로 다시 이어 붙여 표현을 정규화.
+    tokens(공유 토큰 배열)가 있으면 다시 분석하지 않는다.
+    """
+    if tokens is None:
+        try:
+            tokens = tokenize(text, backend=backend)
+        except Exception:
+            return text
 
-    text = " ".join(normalized)
+    text = " ".join(morphs(tokens))
     text = re.sub(r"\s+", " ", text).strip()
 
     return text
@@ -117,9 +163,17 @@ except ImportError:
 def split_sentences(text: str) -> List[str]:
     """
     '.!? + 공백/줄바꿈' 을 기준으로 문장 단위로 나눔.
+    (nlp.segmentation의 regex 백엔드)
     """
-    parts = re.split(r"(?<=[.!?])\s+|\n+", text)
-    return [s.strip() for s in parts if s.strip()]
+    return segment_split(text, backend="regex")
+
+
+# 문장 분리기 선택 ("regex": 빠름, "kss": 정확하지만 느림)
+SENTENCE_SPLITTERS = SEGMENTATION_BACKENDS
+
+
+def split_sentences_with(text: str, splitter: str = "regex") -> List[str]:
+    return segment_split(text, backend=splitter)
 
 
 # 시멘틱 정규화
@@ -138,59 +192,127 @@ SEMANTIC_CANONICALS = {
     "ACTION_COMMUNICATE": "의사소통을 통해 조율했다.",
 }
 
+# 라벨별 추가 예시 문장 (대표 문장과 함께 평균내어 prototype 벡터로 사용)
+SEMANTIC_EXEMPLARS = {
+    "ACTION_RESOLVE": [
+        "발생한 오류의 원인을 찾아 해결했습니다.",
+        "이슈를 파악하고 개선 방안을 도출했습니다.",
+    ],
+    "ACTION_COLLABORATE": [
+        "팀원들과 역할을 나누어 함께 프로젝트를 진행했습니다.",
+        "동료와 협력하여 과제를 완수했습니다.",
+    ],
+    "ACTION_LEARN": [
+        "필요한 기술을 스스로 공부하여 익혔습니다.",
+        "처음 접하는 도구를 학습해 업무에 적용했습니다.",
+    ],
+    "ACTION_IMPROVE": [
+        "기존 방식의 비효율을 찾아 개선했습니다.",
+        "처리 속도를 높이기 위해 구조를 최적화했습니다.",
+    ],
+    "ACTION_COMMUNICATE": [
+        "이해관계자와 소통하며 의견 차이를 조율했습니다.",
+        "회의를 통해 서로의 입장을 정리하고 합의를 이끌었습니다.",
+    ],
+}
 
-def _build_semantic_centers():
-    if embed_sentences is None:
-        return None
 
-    labels = list(SEMANTIC_CANONICALS.keys())
-    sents = list(SEMANTIC_CANONICALS.values())
-    vecs = embed_sentences(sents)
+# 라벨 세트 레지스트리: 이름 → {라벨: [예시 문장, ...]}
+_LABEL_SETS: Dict[str, Dict[str, List[str]]] = {}
+
+# 라벨 세트 이름 → {"labels": [...], "matrix": (num_labels, dim) 정규화 prototype}
+_PROTOTYPE_CACHE: Dict[str, Dict] = {}
+
 
-    return {"labels": labels, "vectors": vecs}
+def register_label_set(name: str, exemplars: Dict[str, Union[str, List[str]]]):
+    """
+    의미 라벨 세트를 이름으로 등록한다. 라벨마다 예시 문장을 여러 개 줄 수 있다.
+    같은 이름으로 다시 등록하면 캐시된 prototype도 새로 만든다.
+    """
+    _LABEL_SETS[name] = {
+        label: [examples] if isinstance(examples, str) else list(examples)
+        for label, examples in exemplars.items()
+    }
+    _PROTOTYPE_CACHE.pop(name, None)
 
 
-_cached_semantic_centers = None
+register_label_set(
+    "default",
+    {
+        label: [canonical] + SEMANTIC_EXEMPLARS.get(label, [])
+        for label, canonical in SEMANTIC_CANONICALS.items()
+    },
+)
 
 
-def semantic_label_sentences(sentences: List[str], threshold: float = 0.70):
+def get_label_prototypes(label_set: str = "default") -> Optional[Dict]:
     """
-    문장을 SBERT로 임베딩하고 정의된 의미 그룹과 가장 가까운 그룹 라벨 부여.
+    라벨 세트의 prototype 행렬 (라벨별 정규화된 예시 벡터 평균, 다시 정규화).
+    한 번 만든 뒤 캐시한다.
     """
-    global _cached_semantic_centers
-
     if embed_sentences is None:
-        return [{"sentence": s, "label": None, "similarity": 0.0} for s in sentences]
+        return None
+
+    if label_set not in _LABEL_SETS:
+        raise ValueError(f"등록되지 않은 label_set: {label_set}")
 
-    if _cached_semantic_centers is None:
-        _cached_semantic_centers = _build_semantic_centers()
+    cached = _PROTOTYPE_CACHE.get(label_set)
+    if cached is not None:
+        return cached
+
+    exemplars = _LABEL_SETS[label_set]
+    labels = list(exemplars.keys())
+
+    # 모든 예시 문장을 한 번에 임베딩한 뒤 라벨별로 평균
+    flat = [sent for label in labels for sent in exemplars[label]]
+    vecs = embed_sentences(flat, normalize=True)
+
+    protos = []
+    offset = 0
+    for label in labels:
+        n = len(exemplars[label])
+        protos.append(vecs[offset:offset + n].mean(axis=0))
+        offset += n
+
+    cached = {"labels": labels, "matrix": l2_normalize(np.stack(protos))}
+    _PROTOTYPE_CACHE[label_set] = cached
+    return cached
+
+
+def semantic_label_sentences(
+    sentences: List[str],
+    threshold: float = 0.70,
+    embeddings: Optional[np.ndarray] = None,
+    label_set: str = "default",
+):
+    """
+    문장을 정의된 의미 그룹(prototype)과 비교해 가장 가까운 그룹 라벨 부여.
+
+    embeddings(이미 계산된 문장 임베딩)를 넘기면 다시 임베딩하지 않으며,
+    전체 문장 × 라벨 유사도는 한 번의 행렬곱으로 계산한다.
+    """
+    if not sentences:
+        return []
 
-    centers = _cached_semantic_centers
+    centers = get_label_prototypes(label_set)
     if centers is None:
         return [{"sentence": s, "label": None, "similarity": 0.0} for s in sentences]
 
     labels = centers["labels"]
-    center_vecs = centers["vectors"]
 
-    sent_vecs = embed_sentences(sentences)
-    results = []
-
-    for sent, vec in zip(sentences, sent_vecs):
-        best_label = None
-        best_sim = -1.0
-
-        for lbl, c_vec in zip(labels, center_vecs):
-            sim = float(vec @ c_vec / ((np.linalg.norm(vec) * np.linalg.norm(c_vec)) + 1e-8))
-            if sim > best_sim:
-                best_sim = sim
-                best_label = lbl
+    if embeddings is None:
+        embeddings = embed_sentences(sentences)
 
-        if best_sim < threshold:
-            best_label = None
+    sims = cosine_scores(embeddings, centers["matrix"])
+    best_idx = sims.argmax(axis=1)
+    best_sims = sims[np.arange(len(sentences)), best_idx]
 
+    results = []
+    for sent, idx, best_sim in zip(sentences, best_idx, best_sims):
+        best_sim = float(best_sim)
         results.append({
             "sentence": sent,
-            "label": best_label,
+            "label": labels[idx] if best_sim >= threshold else None,
             "similarity": round(best_sim, 4),
         })
 
@@ -198,37 +320,109 @@ def semantic_label_sentences(sentences: List[str], threshold: float = 0.70):
 
 
 # 메인 파이프라인
+class PreprocessingEngine:
+    """
+    정규식과 규칙표를 한 번만 컴파일해두고 재사용하는 전처리기.
+
+    extra_rules로 (찾을 문자열, 바꿀 문자열) 규칙을 추가할 수 있다.
+    기본 규칙과 겹치면 extra_rules가 우선한다.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[Tuple[str, str]] = NORMALIZATION_RULES,
+        extra_rules: Optional[Sequence[Tuple[str, str]]] = None,
+    ):
+        self.rules = list(extra_rules or []) + list(rules)
+        self._normalize = compile_rules(self.rules)
+
+    def clean(self, text: str) -> str:
+        return self._normalize(clean_fast(text))
+
+    def _finish(
+        self,
+        t: str,
+        sentences: List[str],
+        use_morph_normalize: bool,
+        tokenizer_backend: Optional[str],
+    ) -> Dict:
+        morph_norm = None
+        if use_morph_normalize:
+            morph_norm = normalize_text_morphological(t, backend=tokenizer_backend)
+
+        return {
+            "clean_text": t,
+            "morph_normalized_text": morph_norm,
+            "sentences": sentences,
+        }
+
+    def process(
+        self,
+        text: str,
+        use_spellcheck: bool = False,
+        use_morph_normalize: bool = False,
+        splitter: str = "regex",
+        tokenizer_backend: Optional[str] = None,
+    ) -> Dict:
+        t = self.clean(text)
+
+        if use_spellcheck:
+            t = spell_correct(t)
+
+        sentences = split_sentences_with(t, splitter)
+        return self._finish(t, sentences, use_morph_normalize, tokenizer_backend)
+
+    def process_many(
+        self,
+        texts: Sequence[str],
+        use_spellcheck: bool = False,
+        use_morph_normalize: bool = False,
+        splitter: str = "regex",
+        tokenizer_backend: Optional[str] = None,
+    ) -> List[Dict]:
+        """대량 코퍼스용: 정제 후 문장 분리를 segment_many로 한 번에 수행"""
+        cleaned = [self.clean(t) for t in texts]
+
+        if use_spellcheck:
+            cleaned = [spell_correct(t) for t in cleaned]
+
+        segmented = segment_many(cleaned, backend=splitter)
+
+        return [
+            self._finish(t, [s.text for s in sents], use_morph_normalize, tokenizer_backend)
+            for t, sents in zip(cleaned, segmented)
+        ]
+
+
+DEFAULT_ENGINE = PreprocessingEngine()
+
+
 def preprocess(
     text: str,
     use_spellcheck: bool = False,
     use_morph_normalize: bool = False,
+    splitter: str = "regex",
+    tokenizer_backend: Optional[str] = None,
 ) -> Dict:
     """
     전체 preprocessing pipeline.
-    """
-    t = text
-
-    t = clean_basic(t)
-    t = enforce_sentence_end(t)
-    t = remove_noise(t)
-
-    # 간단한 규칙 기반 정규화
-    t = normalize_text_rule_based(t)
-
-    if use_spellcheck:
-        t = spell_correct(t)
 
-    sentences = split_sentences(t)
-
-    morph_norm = None
-    if use_morph_normalize:
-        morph_norm = normalize_text_morphological(t)
-
-    return {
-        "clean_text": t,
-        "morph_normalized_text": morph_norm,
-        "sentences": sentences,
-    }
+    splitter: "regex"(기본) 또는 "kss"
+    tokenizer_backend: 형태소 정규화에 사용할 tokenization 백엔드 (None이면 기본 백엔드,
+                       반복 표현 분석과 같은 토큰 캐시를 공유)
+    """
+    return DEFAULT_ENGINE.process(
+        text,
+        use_spellcheck=use_spellcheck,
+        use_morph_normalize=use_morph_normalize,
+        splitter=splitter,
+        tokenizer_backend=tokenizer_backend,
+    )
+
+
+def preprocess_many(texts: Sequence[str], **kwargs) -> List[Dict]:
+    """여러 텍스트를 한 번에 전처리 (preprocess와 같은 결과)"""
+    return DEFAULT_ENGINE.process_many(texts, **kwargs)
 
 
 # 테스트
@@ -0,0 +1,235 @@
+"""
+quantization.py
+
+직무 / 기업 / 키워드 임베딩을 작게 저장하고, 압축된 상태 그대로 점수를 계산하는 모듈.
+
+- float32 : 원본 (정규화된 행렬)
+- float16 : 절반 크기, 점수 계산 시 청크 단위로 float32 승격
+- int8    : 행별 scale(max|x| / 127)로 양자화 → q·x ≈ (q·codes) * scale
+- pca     : 정규화된 행렬의 (비중심화) SVD 상위 r개 축 P (dim, r)로 투영
+            q·x ≈ (q P)·normalize(x P)  — 질의도 같은 P로 투영해서 r차원에서 바로 계산
+            (투영 후 다시 정규화해 두므로 복원 벡터 P·(x P)도 단위 길이)
+
+모든 저장 형식은 QuantizedMatrix 하나로 감싸고 scores(queries) / rows(positions)
+인터페이스가 같으므로, loaders.VectorIndex와 keyword_catalog는 형식과 상관없이 같은
+코드로 점수를 계산한다.
+
+변형 파일은 원본 옆에 <이름>.<형식>.npz 로 저장한다
+(selfintro_app/scripts/build_quantized_embeddings.py).
+변형에는 만들 때의 원본 내용 서명(artifacts.content_signature)을 함께 저장하고,
+원본이 그 뒤에 다시 게시되었으면 로드하지 않는다 (호출부는 원본으로 대체).
+어떤 형식을 쓸지는 환경변수 NLP_EMBED_STORAGE (float32 / float16 / int8 / pca)로 고른다.
+"""
+
+from __future__ import annotations
+import os
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from nlp.artifacts import atomic_write, content_signature
+from nlp.similarity import l2_normalize
+
+STORAGE_KINDS = ("float32", "float16", "int8", "pca")
+
+# 배포에서 사용할 저장 형식 (변형 파일이 없으면 float32 원본 사용)
+EMBED_STORAGE = os.environ.get("NLP_EMBED_STORAGE", "float32")
+
+# PCA 기본 차원
+DEFAULT_PCA_DIM = 256
+
+# float16 / int8 → float32 승격 시 한 번에 처리할 행 수 (임시 메모리 상한)
+SCORE_CHUNK_SIZE = 4096
+
+
+class QuantizedMatrix:
+    """
+    kind       : STORAGE_KINDS 중 하나
+    data       : float32 / float16 / int8 (n, dim) 또는 pca 투영 float32 (n, r)
+    scales     : int8 행별 scale (n,)
+    projection : pca 투영 행렬 (dim, r)
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        data: np.ndarray,
+        scales: Optional[np.ndarray] = None,
+        projection: Optional[np.ndarray] = None,
+    ):
+        if kind not in STORAGE_KINDS:
+            raise ValueError(f"지원하지 않는 저장 형식: {kind}")
+
+        self.kind = kind
+        self.data = data
+        self.scales = None if scales is None else np.asarray(scales, dtype=np.float32)
+        self.projection = None if projection is None else np.asarray(projection, dtype=np.float32)
+        self._dense: Optional[np.ndarray] = data if kind == "float32" else None
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def dim(self) -> int:
+        """원래 임베딩 차원"""
+        if self.projection is not None:
+            return self.projection.shape[0]
+        return self.data.shape[1] if self.data.ndim == 2 else 0
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            a.nbytes for a in (self.data, self.scales, self.projection) if a is not None
+        )
+
+    def _decode(self, data: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+        if self.kind == "float16":
+            return data.astype(np.float32)
+        if self.kind == "int8":
+            return data.astype(np.float32) * np.expand_dims(scales, -1)
+        if self.kind == "pca":
+            return data @ self.projection.T
+        return data
+
+    def rows(self, positions) -> np.ndarray:
+        """행 위치 → 원래 차원 float32 벡터 (get_job_vector 등 단건 조회용)"""
+        scales = None if self.scales is None else self.scales[positions]
+        return self._decode(self.data[positions], scales)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """전체 행렬을 원래 차원 float32로 복원 (오프라인 스크립트용, 한 번만 만들고 재사용)"""
+        if self._dense is None:
+            self._dense = self._decode(self.data, self.scales)
+        return self._dense
+
+    def scores(self, queries: np.ndarray, positions: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        queries (nq, dim) 또는 (dim,) → 코사인 근사 (nq, n) float32.
+        positions가 주어지면 그 행만 계산한다.
+        """
+        queries = l2_normalize(np.atleast_2d(queries))
+
+        data, scales = self.data, self.scales
+        if positions is not None:
+            positions = np.asarray(positions, dtype=np.int64)
+            data = data[positions]
+            scales = None if scales is None else scales[positions]
+
+        if self.kind == "float32":
+            return queries @ data.T
+        if self.kind == "pca":
+            return (queries @ self.projection) @ data.T
+
+        out = np.empty((len(queries), len(data)), dtype=np.float32)
+        for start in range(0, len(data), SCORE_CHUNK_SIZE):
+            stop = start + SCORE_CHUNK_SIZE
+            block = data[start:stop].astype(np.float32)
+            out[:, start:stop] = queries @ block.T
+            if scales is not None:
+                out[:, start:stop] *= scales[start:stop]
+        return out
+
+    def append(self, matrix: np.ndarray) -> "QuantizedMatrix":
+        """새 행만 같은 형식(pca는 같은 투영)으로 변환해 뒤에 붙인 새 QuantizedMatrix"""
+        new = quantize(matrix, self.kind, projection=self.projection)
+        if not len(self.data):
+            return new
+
+        scales = None if self.scales is None else np.concatenate([self.scales, new.scales])
+        return QuantizedMatrix(
+            self.kind,
+            np.concatenate([self.data, new.data]),
+            scales=scales,
+            projection=self.projection,
+        )
+
+
+# 변환
+
+def quantize(
+    matrix: np.ndarray,
+    kind: str,
+    pca_dim: int = DEFAULT_PCA_DIM,
+    projection: Optional[np.ndarray] = None,
+) -> QuantizedMatrix:
+    """
+    정규화된 float32 행렬 → QuantizedMatrix.
+    pca는 projection이 주어지면 새로 학습하지 않고 그 투영을 쓴다 (행 추가용).
+    """
+
+    matrix = l2_normalize(matrix)
+
+    if kind == "float32":
+        return QuantizedMatrix(kind, matrix)
+
+    if kind == "float16":
+        return QuantizedMatrix(kind, matrix.astype(np.float16))
+
+    if kind == "int8":
+        scales = np.abs(matrix).max(axis=1) / 127.0 if len(matrix) else np.zeros(0)
+        safe = np.where(scales > 0, scales, 1.0)
+        codes = np.clip(np.round(matrix / safe[:, None]), -127, 127).astype(np.int8)
+        return QuantizedMatrix(kind, codes, scales=scales)
+
+    if kind == "pca":
+        if projection is None:
+            r = max(1, min(pca_dim, *matrix.shape))
+            # 코사인(내적)을 보존하려면 평균을 빼지 않은 SVD 축을 쓴다
+            _, _, vt = np.linalg.svd(matrix, full_matrices=False)
+            projection = vt[:r].T.astype(np.float32)
+        return QuantizedMatrix(kind, l2_normalize(matrix @ projection), projection=projection)
+
+    raise ValueError(f"지원하지 않는 저장 형식: {kind}")
+
+
+# 저장 / 로드
+
+def quantized_path(path: Path, kind: str) -> Path:
+    """data/career_job_vectors_embed.json → data/career_job_vectors_embed.int8.npz"""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.{kind}.npz")
+
+
+def save_quantized(
+    store: QuantizedMatrix,
+    ids: Sequence,
+    path: Path,
+    source: Optional[Path] = None,
+):
+    """source : 변형을 만든 원본 파일 (내용 서명을 함께 저장)"""
+    arrays = {"kind": np.asarray(store.kind), "ids": np.asarray(list(ids)), "data": store.data}
+    if source is not None:
+        arrays["source_signature"] = np.asarray(content_signature(source))
+    if store.scales is not None:
+        arrays["scales"] = store.scales
+    if store.projection is not None:
+        arrays["projection"] = store.projection
+
+    with atomic_write(path) as f:
+        np.savez_compressed(f, **arrays)
+
+
+def load_quantized(path: Path, source: Optional[Path] = None) -> Optional[Tuple[List, QuantizedMatrix]]:
+    """
+    저장된 변형 → (ids, QuantizedMatrix).
+    파일이 없거나, source를 넘겼는데 저장된 원본 서명이 없거나 현재 source 내용과 다르면 None.
+    """
+    if not Path(path).exists():
+        return None
+
+    with np.load(path, allow_pickle=False) as data:
+        if source is not None and (
+            "source_signature" not in data
+            or str(data["source_signature"]) != content_signature(source)
+        ):
+            return None
+
+        store = QuantizedMatrix(
+            str(data["kind"]),
+            data["data"],
+            scales=data["scales"] if "scales" in data else None,
+            projection=data["projection"] if "projection" in data else None,
+        )
+        return data["ids"].tolist(), store
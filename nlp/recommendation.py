@@ -0,0 +1,120 @@
+"""
+recommendation.py
+
+자기소개서 하나로 여러 기업을 한 번에 평가 / 추천하는 모듈.
+
+- 자소서는 한 번만 임베딩 (문장 벡터 + 문서 평균 벡터)
+- 요청된 기업 전체와의 유사도는 기업 인덱스 행렬과의 행렬곱 한 번으로 계산
+- 문장 × 기업 유사도도 행렬곱 한 번 → 기업별 근거 문장 top-k
+- 기업별 anchor로 보정(calibration.calibrate_batch)한 점수 기준으로 순위 정렬
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from nlp.calibration import calibrate_batch
+from nlp.embedding import embed_sentences
+from nlp.loaders import load_company_index
+from nlp.preprocessing import preprocess
+from nlp.similarity import l2_normalize
+
+# 기업별로 보여줄 근거 문장 수
+EVIDENCE_K = 3
+
+
+def _top_evidence(
+    sentences: List[str],
+    column: np.ndarray,
+    k: int,
+) -> List[Dict]:
+    """한 기업 열(column)에서 유사도가 높은 문장 k개"""
+    if k <= 0 or not sentences:
+        return []
+
+    k = min(k, len(sentences))
+    top = np.argpartition(-column, k - 1)[:k]
+    top = top[np.argsort(-column[top], kind="stable")]
+
+    return [
+        {"sentence": sentences[i], "similarity": round(float(column[i]), 4)}
+        for i in top
+    ]
+
+
+def score_companies(
+    essay_text: str,
+    company_ids: Optional[Sequence[str]] = None,
+    top_k: Optional[int] = None,
+    evidence_k: int = EVIDENCE_K,
+    sentences: Optional[List[str]] = None,
+    sentence_embeddings: Optional[np.ndarray] = None,
+) -> List[Dict]:
+    """
+    자기소개서 하나를 여러 기업과 비교해 기업 적합도 순으로 정렬한다.
+
+    Parameters
+    ----------
+    essay_text : str
+        자기소개서 원문.
+    company_ids : Sequence[str], optional
+        평가할 기업 id 목록. None이면 인덱스의 모든 기업.
+    top_k : int, optional
+        상위 k개만 반환 (None이면 전체).
+    evidence_k : int
+        기업별 근거 문장 수.
+    sentences, sentence_embeddings : optional
+        이미 분리/임베딩한 결과가 있으면 재사용 (예: AnalysisState).
+
+    Returns
+    -------
+    List[Dict]
+        [{"rank", "company_id", "company_fit", "raw_sim", "evidence"}, ...]
+    """
+    index = load_company_index()
+
+    if company_ids is None:
+        company_ids = index.ids
+    else:
+        missing = [cid for cid in company_ids if cid not in index]
+        if missing:
+            raise ValueError(f"존재하지 않는 company_id: {missing}")
+        company_ids = list(dict.fromkeys(company_ids))
+
+    if not company_ids:
+        return []
+
+    # 1. 자소서 임베딩 (한 번)
+    if sentences is None:
+        sentences = preprocess(essay_text)["sentences"]
+    if not sentences:
+        return []
+
+    if sentence_embeddings is None:
+        sentence_embeddings = embed_sentences(sentences, normalize=True)
+    sentence_embeddings = l2_normalize(sentence_embeddings)
+    essay_vector = l2_normalize(sentence_embeddings.mean(axis=0))
+
+    # 2. 기업 전체와의 유사도 (행렬곱 한 번씩, 저장 형식 그대로)
+    positions = [index.position(cid) for cid in company_ids]
+    raw_sims = index.scores(essay_vector, positions)[0]
+    sentence_sims = index.scores(sentence_embeddings, positions)
+
+    # 3. 기업별 anchor 보정 + 정렬 (보정 점수 → raw 유사도 순)
+    fits = calibrate_batch(raw_sims, company_ids, kind="company")
+    order = np.lexsort((-raw_sims, -fits))
+    if top_k is not None:
+        order = order[:top_k]
+
+    results = []
+    for rank, col in enumerate(order, start=1):
+        results.append({
+            "rank": rank,
+            "company_id": company_ids[col],
+            "company_fit": float(fits[col]),
+            "raw_sim": round(float(raw_sims[col]), 4),
+            "evidence": _top_evidence(sentences, sentence_sims[:, col], evidence_k),
+        })
+
+    return results
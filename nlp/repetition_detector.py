@@ -3,20 +3,32 @@ repetition_detector.py
 
 자기소개서 내부에서 반복되는 단어, 구절(phrase),문장 구조를 자동으로 감지하는 모듈.
 하드코딩 없이 자기소개서에서 직접 통계 기반으로 반복 패턴을 추출합니다.
+문장 임베딩이 주어지면 표현만 다른 의미상 중복 문장도 함께 찾습니다.
 """
 
 from __future__ import annotations
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence
 from collections import Counter
-from konlpy.tag import Okt
 
-okt = Okt()
+import numpy as np
+
+from nlp.tokenization import Token, tokenize, nouns, morphs
+from nlp.ngram_counter import count_repeated_ngrams
+from nlp.segmentation import split_sentences
+from nlp.similarity import l2_normalize
 
 
 #  단어 반복 탐지
-def detect_repeated_words(text: str, threshold: int = 3) -> Dict[str, int]:
-    tokens = [t for t in okt.nouns(text) if len(t) > 1]
+def detect_repeated_words(
+    text: str,
+    threshold: int = 3,
+    tokens: Optional[Sequence[Token]] = None,
+) -> Dict[str, int]:
+    if tokens is None:
+        tokens = tokenize(text)
+
+    tokens = [t for t in nouns(tokens) if len(t) > 1]
     counter = Counter(tokens)
 
     repeated = {word: cnt for word, cnt in counter.items() if cnt >= threshold}
@@ -31,31 +43,38 @@ def extract_ngrams(tokens: List[str], n: int):
     return [" ".join(tokens[i:i+n]) for i in range(len(tokens)-n+1)]
 
 
-def detect_repeated_phrases(text: str, threshold: int = 2) -> Dict[str, int]:
-    tokens = [t for t in okt.morphs(text) if len(t) > 1]
+def detect_repeated_phrases(
+    text: str,
+    threshold: int = 2,
+    tokens: Optional[Sequence[Token]] = None,
+    suppress_subsumed: bool = False,
+) -> Dict[str, int]:
+    """
+    2~4gram 반복 구절 탐지 (단일 패스 정수 키 카운팅, nlp.ngram_counter).
+    suppress_subsumed=True이면 더 긴 반복 구절에 흡수되는 짧은 구절은 뺀다.
+    """
+    if tokens is None:
+        tokens = tokenize(text)
 
-    phrase_counter = Counter()
+    tokens = [t for t in morphs(tokens) if len(t) > 1]
 
-    for n in range(2, 5):  # 2~4 gram
-        ngrams = extract_ngrams(tokens, n)
-        for ngram in ngrams:
-            phrase_counter[ngram] += 1
-
-    repeated = {
-        phrase: cnt for phrase, cnt in phrase_counter.items()
-        if cnt >= threshold
-    }
-
-    return repeated
+    return count_repeated_ngrams(
+        tokens,
+        min_n=2,
+        max_n=4,
+        threshold=threshold,
+        suppress_subsumed=suppress_subsumed,
+    )
 
 
 # 문장 구조 반복 탐지 (예: "저는 ~했습니다" 패턴)
 def detect_sentence_patterns(text: str) -> Dict[str, int]:
-    sentences = re.split(r"[.!?]\s*|\n", text)
+    sentences = split_sentences(text)
     pattern_counter = Counter()
 
     for s in sentences:
-        s = s.strip()
+        # 문장 끝 부호는 구조 비교에서 제외
+        s = s.rstrip(".!?").strip()
         if not s:
             continue
 
@@ -68,12 +87,175 @@ def detect_sentence_patterns(text: str) -> Dict[str, int]:
     return repeated
 
 
+# 의미상 중복 문장 탐지 (표현만 다르고 같은 주장을 반복하는 경우)
+NEAR_DUPLICATE_THRESHOLD = 0.85
+
+# 문장 수가 이 이상이면 전체 유사도 행렬 대신 LSH 버킷 안에서만 비교
+# (그보다 적으면 행렬곱 한 번이 더 빠르다. 이 크기부터는 n² 행렬 메모리가 문제)
+LSH_MIN_SENTENCES = 5000
+
+# random-hyperplane LSH: 테이블당 비트 수와, threshold 쌍이 한 테이블 이상에서
+# 같은 버킷에 들어갈 목표 확률 (테이블 수는 이 목표에서 계산)
+LSH_BITS = 8
+LSH_TARGET_RECALL = 0.99
+LSH_MAX_TABLES = 64
+
+
+def _near_duplicate_pairs_exact(unit: np.ndarray, threshold: float):
+    sims = unit @ unit.T
+    rows, cols = np.nonzero(np.triu(sims, k=1) >= threshold)
+    return rows, cols, sims[rows, cols]
+
+
+def lsh_tables(threshold: float, mean_sq_norm: float = 0.0, bits: int = LSH_BITS) -> int:
+    """
+    threshold 코사인 쌍을 LSH_TARGET_RECALL 확률로 후보에 넣는 데 필요한 테이블 수.
+
+    중심화한 벡터로 해싱하므로 threshold 쌍의 중심화 후 코사인
+    (t - |m|²) / (1 - |m|²) 로 비트당 충돌 확률 1 - arccos(t)/π 를 구한다.
+    """
+    centered = (threshold - mean_sq_norm) / max(1.0 - mean_sq_norm, 1e-6)
+    centered = float(np.clip(centered, -1.0, 1.0))
+    per_table = (1.0 - np.arccos(centered) / np.pi) ** bits
+    if per_table >= 1.0:
+        return 1
+    if per_table <= 0.0:
+        return LSH_MAX_TABLES
+    tables = np.log(1.0 - LSH_TARGET_RECALL) / np.log(1.0 - per_table)
+    return int(min(max(np.ceil(tables), 1), LSH_MAX_TABLES))
+
+
+def _near_duplicate_pairs_lsh(unit: np.ndarray, threshold: float, seed: int = 0):
+    """
+    random-hyperplane LSH: 같은 버킷에 들어간 문장끼리만 유사도를 계산해 O(n²)을 피한다.
+
+    - SBERT 임베딩은 평균이 0이 아니라 한쪽으로 몰려 있으므로 평균을 빼고 해싱
+      (그대로 해싱하면 버킷이 한두 개로 쏠려 전체 비교와 같아진다)
+    - 버킷마다 멤버 행렬끼리 행렬곱 한 번 → threshold 이상인 쌍만 남기고,
+      여러 테이블에서 중복으로 찾은 쌍은 마지막에 한 번만 남긴다
+    """
+    n = len(unit)
+    mean = unit.mean(axis=0)
+    centered = unit - mean
+    tables = lsh_tables(threshold, float(mean @ mean))
+
+    rng = np.random.default_rng(seed)
+    weights = 1 << np.arange(LSH_BITS, dtype=np.int64)
+
+    found_rows, found_cols, found_sims = [], [], []
+    for _ in range(tables):
+        planes = rng.standard_normal((unit.shape[1], LSH_BITS)).astype(unit.dtype)
+        codes = ((centered @ planes) > 0) @ weights
+
+        order = np.argsort(codes, kind="stable")
+        bounds = np.flatnonzero(np.diff(codes[order])) + 1
+        for members in np.split(order, bounds):
+            if len(members) < 2:
+                continue
+            block = unit[members]
+            sims = block @ block.T
+            r, c = np.nonzero(np.triu(sims, k=1) >= threshold)
+            if len(r):
+                found_rows.append(members[r])
+                found_cols.append(members[c])
+                found_sims.append(sims[r, c])
+
+    if not found_rows:
+        empty = np.zeros(0, dtype=int)
+        return empty, empty, np.zeros(0)
+
+    rows = np.concatenate(found_rows)
+    cols = np.concatenate(found_cols)
+    lo, hi = np.minimum(rows, cols), np.maximum(rows, cols)
+    _, first = np.unique(lo.astype(np.int64) * n + hi, return_index=True)
+    return lo[first], hi[first], np.concatenate(found_sims)[first]
+
+
+def detect_semantic_duplicates(
+    sentences: List[str],
+    sentence_embeddings: np.ndarray,
+    threshold: float = NEAR_DUPLICATE_THRESHOLD,
+    use_lsh: Optional[bool] = None,
+) -> List[Dict]:
+    """
+    문장 임베딩으로 의미상 거의 같은 문장 쌍을 찾아 클러스터로 묶는다.
+
+    - 기본: 정규화한 문장 행렬로 유사도 행렬을 한 번의 행렬곱으로 계산
+    - 문장 수가 LSH_MIN_SENTENCES 이상이면 LSH 버킷 후보만 비교 (use_lsh로 강제 가능)
+    """
+    n = len(sentences)
+    if n < 2 or sentence_embeddings is None or len(sentence_embeddings) != n:
+        return []
+
+    unit = l2_normalize(sentence_embeddings)
+
+    if use_lsh is None:
+        use_lsh = n >= LSH_MIN_SENTENCES
+
+    if use_lsh:
+        rows, cols, sims = _near_duplicate_pairs_lsh(unit, threshold)
+    else:
+        rows, cols, sims = _near_duplicate_pairs_exact(unit, threshold)
+
+    # union-find로 쌍 → 클러스터
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in zip(rows.tolist(), cols.tolist()):
+        parent[find(i)] = find(j)
+
+    clusters: Dict[int, Dict] = {}
+    for i, j, sim in zip(rows.tolist(), cols.tolist(), sims.tolist()):
+        cluster = clusters.setdefault(find(i), {"indices": set(), "pairs": []})
+        cluster["indices"].update((i, j))
+        cluster["pairs"].append({
+            "sentences": [sentences[i], sentences[j]],
+            "similarity": round(float(sim), 3),
+        })
+
+    results = []
+    for cluster in clusters.values():
+        indices = sorted(cluster["indices"])
+        results.append({
+            "indices": indices,
+            "sentences": [sentences[i] for i in indices],
+            "pairs": cluster["pairs"],
+            "max_similarity": max(p["similarity"] for p in cluster["pairs"]),
+        })
+
+    results.sort(key=lambda c: c["indices"][0])
+    return results
+
+
 # 통합
-def analyze_repetition(text: str) -> Dict:
-    words = detect_repeated_words(text)
-    phrases = detect_repeated_phrases(text)
+def analyze_repetition(
+    text: str,
+    tokens: Optional[Sequence[Token]] = None,
+    backend: Optional[str] = None,
+    sentences: Optional[List[str]] = None,
+    sentence_embeddings: Optional[np.ndarray] = None,
+) -> Dict:
+    """
+    sentences / sentence_embeddings(이미 계산된 문장 임베딩)를 넘기면
+    의미상 중복 문장 탐지도 함께 수행한다.
+    """
+    # 형태소 분석은 한 번만 하고 단어/구절 탐지가 같은 토큰 배열을 읽는다
+    if tokens is None:
+        tokens = tokenize(text, backend=backend)
+
+    words = detect_repeated_words(text, tokens=tokens)
+    phrases = detect_repeated_phrases(text, tokens=tokens)
     patterns = detect_sentence_patterns(text)
 
+    semantic_dups = []
+    if sentences is not None and sentence_embeddings is not None:
+        semantic_dups = detect_semantic_duplicates(sentences, sentence_embeddings)
+
     suggestions = []
 
     for w, c in words.items():
@@ -85,10 +267,17 @@ def analyze_repetition(text: str) -> Dict:
     for p, c in patterns.items():
         suggestions.append("유사한 문장 구조가 반복됩니다. 문장 구조를 다양하게 작성하면 더 자연스러워집니다.")
 
+    for cluster in semantic_dups:
+        suggestions.append(
+            f"{len(cluster['sentences'])}개 문장이 표현만 다르고 같은 내용을 반복합니다 "
+            f"(유사도 {cluster['max_similarity']}). 하나로 합치거나 다른 경험으로 바꿔보세요."
+        )
+
     return {
         "repeated_words": words,
         "repeated_phrases": phrases,
         "repeated_sentence_patterns": patterns,
+        "semantic_duplicates": semantic_dups,
         "suggestions": suggestions
     }
 
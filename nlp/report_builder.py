@@ -6,71 +6,413 @@ report_builder.py
 """
 
 from __future__ import annotations
-from typing import Dict
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from nlp.preprocessing import preprocess
+import numpy as np
+
+from nlp.preprocessing import preprocess, split_sentences, semantic_label_sentences
 from nlp.loaders import get_job_vector, get_company_vector
-from nlp.embedding import embed_sentences
-from nlp.similarity import compute_fit_scores
-from nlp.keyword_coverage import analyze_keyword_coverage
+from nlp.embedding import (
+    DEFAULT_MODEL_NAME,
+    STATIC_MODEL_NAME,
+    embed_sentences,
+    embed_sentences_with_stats,
+    static_model_available,
+)
+from nlp.similarity import compute_fit_scores, compute_fit_scores_batch
+from nlp.calibration import get_company_anchor, get_job_anchor, load_anchor_tables
+from nlp.job_graph import load_job_graph, lookup_job_company_sim
+from nlp.keyword_coverage import analyze_keyword_coverage, analyze_keyword_coverage_many
 from nlp.repetition_detector import analyze_repetition
-from nlp.star_detector import tag_star_semantic
+from nlp.star_detector import tag_star_from_embeddings
+from nlp.incremental import AnalysisState
 
 
-def build_report(
+# 리포트 섹션 순서 (계산 비용이 싼 순서)
+REPORT_SECTIONS = (
+    "preprocessing",
+    "similarity",
+    "keyword_coverage",
+    "repetition",
+    "star_analysis",
+    "semantic_labels",
+)
+
+# 예산과 관계없이 항상 계산하는 섹션
+REQUIRED_SECTIONS = ("preprocessing", "similarity")
+
+
+# 분석 프로필
+# - stages    : 실행할 선택 섹션
+# - splitter  : 문장 분리기 ("regex" 빠름 / "kss" 정확)
+# - encoder   : 문장 인코더 (정적 임베딩은 SBERT 증류 근사치, 테이블이 없으면 SBERT)
+# - budget_ms : 호출자가 예산을 주지 않았을 때의 기본 예산 (None이면 무제한)
+ANALYSIS_PROFILES = {
+    "fast": {
+        "stages": ("keyword_coverage",),
+        "splitter": "regex",
+        "encoder": STATIC_MODEL_NAME,
+        "budget_ms": 300.0,
+    },
+    "standard": {
+        "stages": ("keyword_coverage", "repetition", "star_analysis", "semantic_labels"),
+        "splitter": "regex",
+        "encoder": DEFAULT_MODEL_NAME,
+        "budget_ms": None,
+    },
+    "full": {
+        "stages": ("keyword_coverage", "repetition", "star_analysis", "semantic_labels"),
+        "splitter": "kss",
+        "encoder": DEFAULT_MODEL_NAME,
+        "budget_ms": None,
+    },
+}
+
+DEFAULT_PROFILE = "standard"
+
+
+# 섹션별 예상 소요 시간(ms) — 실행할 때마다 이동 평균으로 갱신
+# 프로세스 전체(모든 세션 스레드)가 공유하므로 읽기/갱신은 _STAGE_COST_LOCK 안에서
+_STAGE_COST_MS = {
+    "keyword_coverage": 150.0,
+    "repetition": 400.0,
+    "star_analysis": 20.0,
+    "semantic_labels": 5.0,
+}
+
+_COST_SMOOTHING = 0.3
+
+_STAGE_COST_LOCK = threading.Lock()
+
+
+def _stage_cost(name: str) -> float:
+    with _STAGE_COST_LOCK:
+        return _STAGE_COST_MS.get(name, 0.0)
+
+
+def _record_stage_cost(name: str, elapsed_ms: float):
+    with _STAGE_COST_LOCK:
+        prev = _STAGE_COST_MS.get(name, elapsed_ms)
+        _STAGE_COST_MS[name] = (1 - _COST_SMOOTHING) * prev + _COST_SMOOTHING * elapsed_ms
+
+
+def _elapsed_ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+def _profile_encoder(config: Dict) -> str:
+    # 정적 임베딩 테이블이 배포되지 않았으면 SBERT로 대체
+    if config["encoder"] == STATIC_MODEL_NAME and not static_model_available():
+        return DEFAULT_MODEL_NAME
+    return config["encoder"]
+
+
+def iter_report_sections(
     essay_text: str,
     job_id: int,
     company_id: str,
-) -> Dict:
+    state: Optional[AnalysisState] = None,
+    profile: str = DEFAULT_PROFILE,
+    budget_ms: Optional[float] = None,
+) -> Iterator[Tuple[str, object]]:
     """
-    전체 NLP 파이프라인을 실행하고 결과를 하나의 리포트로 반환한다.
+    리포트를 섹션 단위로 계산하면서 완료되는 즉시 (섹션명, 결과)를 yield 한다.
+    UI는 적합도 점수부터 먼저 그리고, 나머지 섹션은 준비되는 대로 채운다.
+
+    state(AnalysisState)를 넘기면 직전 분석과 문장 단위로 diff 하여
+    추가/변경된 문장만 임베딩·STAR 태깅하고, state를 갱신한다.
+
+    profile("fast" / "standard" / "full")이 실행할 섹션, 문장 분리기, 인코더를 정한다.
+    예산(budget_ms, 없으면 프로필 기본값)은 전처리·임베딩·유사도를 포함한 전체 경과 시간 기준이며,
+    선택 섹션마다 시작 직전에 남은 예산과 그 섹션의 예상 시간을 비교해
+    끝낼 수 없는 섹션만 건너뛴다 (뒤의 싼 섹션은 계속 검사).
+    마지막에 ("meta", {...})로 생략된 섹션, 예산 초과 여부(partial),
+    이번에 인코딩한 문장의 잘림(창 분할) / 패딩 통계를 알려준다.
     """
+    if profile not in ANALYSIS_PROFILES:
+        raise ValueError(f"지원하지 않는 profile: {profile}")
+
+    config = ANALYSIS_PROFILES[profile]
+    encoder = _profile_encoder(config)
+    if budget_ms is None:
+        budget_ms = config["budget_ms"]
+    start = time.perf_counter()
+
+    def over_budget(cost_ms: float = 0.0) -> bool:
+        return budget_ms is not None and _elapsed_ms(start) + cost_ms > budget_ms
+
+    skipped_by_profile = [
+        name for name in REPORT_SECTIONS
+        if name not in REQUIRED_SECTIONS and name not in config["stages"]
+    ]
+    skipped_by_budget = []
 
     # 1. 전처리
-    prep = preprocess(essay_text)
+    prep = preprocess(essay_text, splitter=config["splitter"])
     sentences = prep["sentences"]
 
-    # 2. 임베딩
-    sentence_embeddings = embed_sentences(sentences)
-    essay_vector = sentence_embeddings.mean(axis=0)
+    # 2. 임베딩 (+ 증분 상태 갱신)
+    if state is not None:
+        state.update(sentences, model_name=encoder)
+        sentence_embeddings = state.embeddings
+        essay_vector = state.essay_vector
+        encode_stats = dict(state.last_encode_stats)
+    else:
+        sentence_embeddings, encode_stats = embed_sentences_with_stats(
+            sentences, model_name=encoder, normalize=True
+        )
+        essay_vector = sentence_embeddings.mean(axis=0)
+
+    preprocessing_info = {
+        "sentence_count": len(sentences),
+        "splitter": config["splitter"],
+    }
+    if state is not None:
+        preprocessing_info["incremental"] = dict(state.last_stats)
+
+    yield "preprocessing", preprocessing_info
 
     # 3. 직무 / 기업 벡터 로딩
     job_vector = get_job_vector(job_id)
     company_vector = get_company_vector(company_id)
 
     # 4. 의미 유사도 분석 (calibration 적용)
-    similarity_result = compute_fit_scores(
+    scores = compute_fit_scores(
         job_vector=job_vector,
         company_vector=company_vector,
         essay_vector=essay_vector,
+        job_anchor=get_job_anchor(job_id),
+        company_anchor=get_company_anchor(company_id),
+        job_company_sim=lookup_job_company_sim(job_id, company_id),
     )
+    if encoder == STATIC_MODEL_NAME:
+        scores["approximate"] = True
 
-    # 5. 직무 핵심 역량 커버리지 (의미 기반)
-    keyword_result = analyze_keyword_coverage(
-        job_id=job_id,
-        essay_text=prep["clean_text"],
-    )
+    # 필수 섹션(전처리·임베딩·유사도)까지의 경과 시간
+    core_ms = _elapsed_ms(start)
 
-    # 6. 반복 표현 분석
-    repetition_result = analyze_repetition(prep["clean_text"])
+    yield "similarity", scores
 
-    # 7. STAR 구조 분석
-    star_result = tag_star_semantic(essay_text)
+    # 5~7. 선택 섹션
+    def keyword_stage():
+        # 직무 핵심 역량 커버리지 (의미 기반)
+        if state is not None:
+            return state.keyword_coverage(job_id)
+        return analyze_keyword_coverage(
+            job_id=job_id,
+            essay_text=prep["clean_text"],
+            sentences=sentences,
+            sentence_embeddings=sentence_embeddings,
+            model_name=encoder,
+        )
 
-    # 8. 최종 리포트
-    return {
+    def repetition_stage():
+        # 반복 표현 분석
+        return analyze_repetition(
+            prep["clean_text"],
+            sentences=sentences,
+            sentence_embeddings=sentence_embeddings,
+        )
+
+    def star_stage():
+        # STAR 구조 분석 (이미 계산한 문장 임베딩 재사용)
+        if state is not None:
+            return state.star_analysis
+        return tag_star_from_embeddings(sentences, sentence_embeddings)
+
+    def semantic_label_stage():
+        # 문장별 의미 라벨 (문장 임베딩 재사용, 행렬곱 한 번)
+        return semantic_label_sentences(sentences, embeddings=sentence_embeddings)
+
+    stages = {
+        "keyword_coverage": keyword_stage,
+        "repetition": repetition_stage,
+        "star_analysis": star_stage,
+        "semantic_labels": semantic_label_stage,
+    }
+
+    for name in REPORT_SECTIONS:
+        if name not in stages or name in skipped_by_profile:
+            continue
+
+        # 남은 예산으로 끝낼 수 없는 섹션만 취소 (이미 초과했으면 전부)
+        if over_budget(_stage_cost(name)):
+            skipped_by_budget.append(name)
+            continue
+
+        stage_start = time.perf_counter()
+        result = stages[name]()
+        _record_stage_cost(name, _elapsed_ms(stage_start))
+
+        yield name, result
+
+    yield "meta", {
+        "profile": profile,
+        "budget_ms": budget_ms,
+        "encoder": encoder,
+        "core_ms": round(core_ms, 1),
+        "elapsed_ms": round(_elapsed_ms(start), 1),
+        "skipped_by_profile": skipped_by_profile,
+        "skipped_by_budget": skipped_by_budget,
+        "partial": bool(skipped_by_budget) or over_budget(),
+        "encoding": encode_stats,
+    }
+
+
+def build_report(
+    essay_text: str,
+    job_id: int,
+    company_id: str,
+    state: Optional[AnalysisState] = None,
+    on_section: Optional[Callable[[str, object], None]] = None,
+    profile: str = DEFAULT_PROFILE,
+    budget_ms: Optional[float] = None,
+) -> Dict:
+    """
+    전체 NLP 파이프라인을 실행하고 결과를 하나의 리포트로 반환한다.
+
+    on_section(섹션명, 결과) 콜백을 넘기면 섹션이 완료될 때마다 호출된다.
+    프로필/예산으로 생략된 섹션은 None이며, report["meta"]에 생략 사유가 남는다.
+    """
+    report = {
         "job_id": job_id,
         "company_id": company_id,
-        "preprocessing": {
-            "sentence_count": len(sentences),
+    }
+    report.update({name: None for name in REPORT_SECTIONS})
+
+    for name, result in iter_report_sections(
+        essay_text,
+        job_id,
+        company_id,
+        state=state,
+        profile=profile,
+        budget_ms=budget_ms,
+    ):
+        report[name] = result
+        if on_section is not None:
+            on_section(name, result)
+
+    return report
+
+
+# 여러 (직무, 기업) 쌍에 대한 리포트
+def build_multi_report(
+    essay_text: str,
+    targets: Sequence[Tuple[int, str]],
+    profile: str = DEFAULT_PROFILE,
+) -> Dict:
+    """
+    자기소개서 하나를 여러 (job_id, company_id) 쌍과 비교한다.
+
+    대상과 무관한 부분(전처리, 임베딩, 반복 표현, STAR, 의미 라벨)은 한 번만 계산해
+    report["shared"]에 두고, 대상별 부분(적합도, 키워드 커버리지)만
+    행렬 연산으로 묶어 report["targets"]에 쌍 순서대로 담는다.
+    """
+    if profile not in ANALYSIS_PROFILES:
+        raise ValueError(f"지원하지 않는 profile: {profile}")
+
+    config = ANALYSIS_PROFILES[profile]
+    stages = config["stages"]
+    encoder = _profile_encoder(config)
+    start = time.perf_counter()
+
+    # 1. 대상과 무관한 부분 (한 번만)
+    prep = preprocess(essay_text, splitter=config["splitter"])
+    sentences = prep["sentences"]
+    sentence_embeddings, encode_stats = embed_sentences_with_stats(
+        sentences, model_name=encoder, normalize=True
+    )
+    essay_vector = sentence_embeddings.mean(axis=0)
+
+    shared = {name: None for name in REPORT_SECTIONS if name not in ("similarity", "keyword_coverage")}
+    shared["preprocessing"] = {
+        "sentence_count": len(sentences),
+        "splitter": config["splitter"],
+    }
+
+    if "repetition" in stages:
+        shared["repetition"] = analyze_repetition(
+            prep["clean_text"],
+            sentences=sentences,
+            sentence_embeddings=sentence_embeddings,
+        )
+    if "star_analysis" in stages:
+        shared["star_analysis"] = tag_star_from_embeddings(sentences, sentence_embeddings)
+    if "semantic_labels" in stages:
+        shared["semantic_labels"] = semantic_label_sentences(sentences, embeddings=sentence_embeddings)
+
+    # 2. 대상별 부분 (쌍 전체를 한 번에)
+    job_ids = [job_id for job_id, _ in targets]
+    company_ids = [company_id for _, company_id in targets]
+
+    targets_out: List[Dict] = []
+    if targets:
+        anchor_tables = load_anchor_tables()
+        graph = load_job_graph()
+        similarities = compute_fit_scores_batch(
+            np.stack([get_job_vector(job_id) for job_id in job_ids]),
+            np.stack([get_company_vector(company_id) for company_id in company_ids]),
+            essay_vector,
+            job_anchors=anchor_tables["job"].lookup(job_ids),
+            company_anchors=anchor_tables["company"].lookup(company_ids),
+            job_company_sims=graph.job_company_sims(job_ids, company_ids) if graph is not None else None,
+        )
+
+        coverage = {}
+        if "keyword_coverage" in stages:
+            coverage = analyze_keyword_coverage_many(job_ids, sentences, sentence_embeddings)
+
+        for job_id, company_id, sim in zip(job_ids, company_ids, similarities):
+            targets_out.append({
+                "job_id": job_id,
+                "company_id": company_id,
+                "similarity": sim,
+                "keyword_coverage": coverage.get(job_id),
+            })
+
+    return {
+        "shared": shared,
+        "targets": targets_out,
+        "meta": {
+            "profile": profile,
+            "encoder": encoder,
+            "target_count": len(targets_out),
+            "elapsed_ms": round(_elapsed_ms(start), 1),
+            "encoding": encode_stats,
         },
-        "similarity": similarity_result,
-        "keyword_coverage": keyword_result,
-        "repetition": repetition_result,
-        "star_analysis": star_result,
     }
 
 
+# 타이핑 중 실시간 미리보기 (정적 임베딩, 근사치)
+def preview_fit_scores(
+    essay_text: str,
+    job_id: int,
+    company_id: str,
+) -> Optional[Dict]:
+    """
+    SBERT 대신 증류된 정적 토큰 임베딩으로 직무/기업 적합도를 근사 계산한다.
+    문장당 수 마이크로초 수준이라 입력이 바뀔 때마다 호출해도 된다.
+    """
+    sentences = split_sentences(essay_text)
+    if not sentences:
+        return None
+
+    sentence_embeddings = embed_sentences(sentences, model_name=STATIC_MODEL_NAME)
+
+    scores = compute_fit_scores(
+        job_vector=get_job_vector(job_id),
+        company_vector=get_company_vector(company_id),
+        essay_vector=sentence_embeddings.mean(axis=0),
+        job_anchor=get_job_anchor(job_id),
+        company_anchor=get_company_anchor(company_id),
+        job_company_sim=lookup_job_company_sim(job_id, company_id),
+    )
+    scores["approximate"] = True
+    return scores
+
+
 # 테스트용 (로컬 확인용)
 if __name__ == "__main__":
     sample_text = """
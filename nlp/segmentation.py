@@ -0,0 +1,161 @@
+"""
+segmentation.py
+
+프로젝트 전체에서 공통으로 쓰는 문장 분리 모듈.
+
+- Sentence(text, start, end) : 문장과 입력 텍스트 기준 문자 오프셋
+- 백엔드 선택 : "regex"(빠름, 기본) / "kss"(정확하지만 느림, 요청할 때만 import)
+- (백엔드, 텍스트 해시) 캐시 → 같은 텍스트를 여러 단계가 나눠도 한 번만 분리
+- segment_many() : 여러 문서를 한 번에 분리 (kss는 리스트 입력으로 일괄 처리)
+
+전처리 / 임베딩 / STAR / 반복 탐지가 모두 이 모듈을 거치므로
+같은 텍스트·같은 백엔드라면 모든 단계의 문장 경계가 일치한다.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import hashlib
+import re
+import threading
+
+
+class Sentence(NamedTuple):
+    text: str
+    start: int
+    end: int
+
+
+SEGMENTATION_BACKENDS = ("regex", "kss")
+DEFAULT_BACKEND = "regex"
+
+CACHE_SIZE = 512
+
+# '.!? + 공백' 또는 줄바꿈 기준 (문장부호는 문장에 남긴다)
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+# 백엔드 구현
+
+def _strip_span(text: str, start: int, end: int) -> Optional[Sentence]:
+    piece = text[start:end]
+    stripped = piece.strip()
+    if not stripped:
+        return None
+    lead = len(piece) - len(piece.lstrip())
+    return Sentence(stripped, start + lead, start + lead + len(stripped))
+
+
+def _segment_regex(text: str) -> Tuple[Sentence, ...]:
+    sentences = []
+    cursor = 0
+    for m in _SENTENCE_BOUNDARY.finditer(text):
+        sent = _strip_span(text, cursor, m.start())
+        if sent is not None:
+            sentences.append(sent)
+        cursor = m.end()
+
+    sent = _strip_span(text, cursor, len(text))
+    if sent is not None:
+        sentences.append(sent)
+
+    return tuple(sentences)
+
+
+def _align(text: str, pieces: Sequence[str]) -> Tuple[Sentence, ...]:
+    """분리기가 돌려준 문장 문자열을 원문 위치에 맞춘다."""
+    sentences = []
+    cursor = 0
+    for piece in pieces:
+        piece = piece.strip()
+        if not piece:
+            continue
+        start = text.find(piece, cursor)
+        if start < 0:
+            # 분리기가 공백 등을 바꾼 경우: 현재 위치 기준 근사 오프셋
+            start = cursor
+            end = min(len(text), cursor + len(piece))
+        else:
+            end = start + len(piece)
+        sentences.append(Sentence(piece, start, end))
+        cursor = end
+    return tuple(sentences)
+
+
+def _segment_kss_batch(texts: List[str]) -> List[Tuple[Sentence, ...]]:
+    import kss
+
+    if len(texts) == 1:
+        return [_align(texts[0], kss.split_sentences(texts[0]))]
+
+    results = kss.split_sentences(texts)
+    return [_align(t, pieces) for t, pieces in zip(texts, results)]
+
+
+# 캐시 + 진입점
+
+_CACHE: "OrderedDict[Tuple[str, str], Tuple[Sentence, ...]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _key(backend: str, text: str) -> Tuple[str, str]:
+    return backend, hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _check_backend(backend: str):
+    if backend not in SEGMENTATION_BACKENDS:
+        raise ValueError(f"지원하지 않는 splitter: {backend}")
+
+
+def segment_many(
+    texts: Sequence[str],
+    backend: str = DEFAULT_BACKEND,
+) -> List[Tuple[Sentence, ...]]:
+    """
+    여러 문서를 한 번에 문장 분리한다. 캐시에 없는 문서만 모아서 처리한다.
+    """
+    _check_backend(backend)
+
+    results: List[Optional[Tuple[Sentence, ...]]] = [None] * len(texts)
+    pending: Dict[Tuple[str, str], List[int]] = {}
+
+    with _CACHE_LOCK:
+        for idx, text in enumerate(texts):
+            if not text:
+                results[idx] = ()
+                continue
+            key = _key(backend, text)
+            cached = _CACHE.get(key)
+            if cached is not None:
+                _CACHE.move_to_end(key)
+                results[idx] = cached
+            else:
+                pending.setdefault(key, []).append(idx)
+
+    if pending:
+        todo = [texts[indices[0]] for indices in pending.values()]
+
+        if backend == "kss":
+            computed = _segment_kss_batch(todo)
+        else:
+            computed = [_segment_regex(t) for t in todo]
+
+        with _CACHE_LOCK:
+            for (key, indices), sents in zip(pending.items(), computed):
+                for idx in indices:
+                    results[idx] = sents
+                _CACHE[key] = sents
+            while len(_CACHE) > CACHE_SIZE:
+                _CACHE.popitem(last=False)
+
+    return results
+
+
+def segment(text: str, backend: str = DEFAULT_BACKEND) -> Tuple[Sentence, ...]:
+    """텍스트 → Sentence(text, start, end) 튜플"""
+    return segment_many([text], backend=backend)[0]
+
+
+def split_sentences(text: str, backend: str = DEFAULT_BACKEND) -> List[str]:
+    """오프셋이 필요 없는 호출부용: 문장 문자열 리스트"""
+    return [s.text for s in segment(text, backend=backend)]
@@ -4,26 +4,100 @@ similarity.py
 직무 임베딩 / 기업 임베딩 / 자기소개서 임베딩 간
 코사인 유사도를 계산하고,
 anchor 기반 calibration을 통해 적합도 점수를 산출한다.
+
+l2_normalize / cosine_scores 는 프로젝트 전체가 공유하는 유사도 커널이다.
+벡터는 로드·임베딩 시점에 float32로 정규화해두고, 코사인은 내적으로 계산한다.
 """
 
 from __future__ import annotations
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
 import numpy as np
 
+from nlp.job_anchor_config import JOB_ANCHORS
+
+
+# 공용 벡터 연산 (모든 모듈이 이 커널을 사용)
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    벡터(dim,) 또는 행렬(n, dim)을 행 단위 L2 정규화한 float32 배열로 변환.
+    로드/임베딩 시점에 한 번만 호출해두면 이후 코사인은 내적만으로 계산된다.
+    """
+    arr = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(arr, axis=-1, keepdims=True)
+    return arr / (norms + 1e-8)
+
+
+def cosine_scores(
+    queries: np.ndarray,
+    targets: np.ndarray,
+    normalized: bool = False,
+) -> Union[np.ndarray, float]:
+    """
+    배치 코사인 유사도 커널.
+
+    - (dim,)    × (dim,)    → float
+    - (dim,)    × (m, dim)  → (m,)
+    - (n, dim)  × (dim,)    → (n,)
+    - (n, dim)  × (m, dim)  → (n, m)
+
+    normalized=True이면 입력이 이미 L2 정규화되어 있다고 보고 내적만 계산한다.
+    """
+    if not normalized:
+        queries = l2_normalize(queries)
+        targets = l2_normalize(targets)
+
+    if queries.size == 0 or targets.size == 0:
+        shape = queries.shape[:-1] + targets.shape[:-1]
+        return np.zeros(shape, dtype=np.float32)
+
+    scores = queries @ targets.T
+
+    if np.ndim(scores) == 0:
+        return float(scores)
+    return scores
+
 
 # 기본 코사인 유사도
 def cosine_similarity(v1: np.ndarray, v2: np.ndarray) -> float:
-    v1 = np.array(v1, dtype=float)
-    v2 = np.array(v2, dtype=float)
+    return float(cosine_scores(v1, v2))
 
-    denom = (np.linalg.norm(v1) * np.linalg.norm(v2)) + 1e-8
-    if denom == 0:
-        return 0.0
 
-    return float(np.dot(v1, v2) / denom)
+# Anchor 기반 calibration
 
+DEFAULT_ANCHOR = dict(JOB_ANCHORS["DEFAULT"])
+
+
+def calibrate_scores(
+    sims: np.ndarray,
+    low: Union[float, np.ndarray],
+    mid: Union[float, np.ndarray],
+    high: Union[float, np.ndarray],
+) -> np.ndarray:
+    """
+    calibrate_similarity의 벡터화 버전.
+    sims와 low/mid/high는 브로드캐스팅되므로 (자소서 수, 직무 수) 행렬에
+    직무별 anchor 행 (직무 수,)을 그대로 넘길 수 있다.
+    """
+    sims = np.asarray(sims, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    mid = np.asarray(mid, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+
+    # 구간별 식을 모두 계산한 뒤 np.select로 고른다 (선택되지 않은 구간의 0 나눗셈은 무시)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        below = np.where(low != 0, 30 * (sims / low), 30.0)
+        lower = 30 + (sims - low) / (mid - low) * 20
+        upper = 50 + (sims - mid) / (high - mid) * 30
+    top = 80 + np.minimum((sims - high) * 100, 20)
+
+    score = np.select(
+        [sims <= low, sims <= mid, sims <= high],
+        [below, lower, upper],
+        default=top,
+    )
+    return np.round(np.clip(score, 0, 100), 2)
 
-# Anchor 기반 calibration
 
 def calibrate_similarity(
     sim: float,
@@ -33,52 +107,90 @@ def calibrate_similarity(
 ) -> float:
     """
     좁은 코사인 유사도 분포를 0~100 점수로 보정
+    (단건 호출도 calibrate_scores를 거쳐 배치 결과와 항상 같은 값을 낸다)
     """
-
-    if sim <= low:
-        score = 30 * (sim / low) if low != 0 else 30
-    elif sim <= mid:
-        score = 30 + (sim - low) / (mid - low) * 20
-    elif sim <= high:
-        score = 50 + (sim - mid) / (high - mid) * 30
-    else:
-        score = 80 + min((sim - high) * 100, 20)
-
-    return round(float(np.clip(score, 0, 100)), 2)
+    return float(calibrate_scores(sim, low, mid, high))
 
 
 # 메인 함수
 def compute_fit_scores(
     job_vector: np.ndarray,
     company_vector: np.ndarray,
-    essay_vector: np.ndarray
+    essay_vector: np.ndarray,
+    job_anchor: Optional[Dict[str, float]] = None,
+    company_anchor: Optional[Dict[str, float]] = None,
+    job_company_sim: Optional[float] = None,
 ) -> Dict[str, float]:
     """
     직무·기업·자소서 적합도 계산 (calibration 적용)
-    """
-
-    # raw similarity
-    job_sim = cosine_similarity(job_vector, essay_vector)
-    company_sim = cosine_similarity(company_vector, essay_vector)
-    job_company_sim = cosine_similarity(job_vector, company_vector)
 
-    # 공통 anchor (지금 데이터 분포 기준)
-    ANCHOR = {
-        "low": -0.08,
-        "mid": 0.02,
-        "high": 0.12
-    }
+    job_anchor / company_anchor는 nlp.calibration의 직무·기업별 anchor.
+    없으면 job_anchor_config의 DEFAULT anchor를 쓴다.
+    job_company_sim은 nlp.job_graph에서 조회한 직무-기업 raw 유사도 (없으면 직접 계산).
+    """
+    return compute_fit_scores_batch(
+        np.asarray(job_vector)[None, :],
+        np.asarray(company_vector)[None, :],
+        essay_vector,
+        job_anchors=_anchor_rows([job_anchor or DEFAULT_ANCHOR]),
+        company_anchors=_anchor_rows([company_anchor or DEFAULT_ANCHOR]),
+        job_company_sims=None if job_company_sim is None else np.array([job_company_sim]),
+    )[0]
+
+
+def _anchor_rows(anchors: List[Dict[str, float]]) -> np.ndarray:
+    return np.array([[a["low"], a["mid"], a["high"]] for a in anchors], dtype=np.float64)
+
+
+def compute_fit_scores_batch(
+    job_vectors: np.ndarray,
+    company_vectors: np.ndarray,
+    essay_vector: np.ndarray,
+    job_anchors: Optional[np.ndarray] = None,
+    company_anchors: Optional[np.ndarray] = None,
+    job_company_sims: Optional[np.ndarray] = None,
+) -> List[Dict]:
+    """
+    자소서 하나 × (직무, 기업) 쌍 N개의 적합도를 한 번에 계산.
 
-    return {
-        "job_fit": calibrate_similarity(job_sim, **ANCHOR),
-        "company_fit": calibrate_similarity(company_sim, **ANCHOR),
-        "job_company_alignment": calibrate_similarity(job_company_sim, **ANCHOR),
-        "raw": {
-            "job_sim": round(job_sim, 4),
-            "company_sim": round(company_sim, 4),
-            "job_company_sim": round(job_company_sim, 4)
-        }
-    }
+    job_vectors / company_vectors는 i번째 행끼리 한 쌍인 (N, dim) 행렬,
+    job_anchors / company_anchors는 (N, 3) [low, mid, high] 배열 (없으면 DEFAULT).
+    job_company_sims는 미리 계산한 쌍별 직무-기업 raw 유사도 (없으면 직접 계산).
+    결과는 쌍마다 compute_fit_scores와 같은 형식의 dict.
+    """
+    job_units = l2_normalize(job_vectors)
+    company_units = l2_normalize(company_vectors)
+    essay_unit = l2_normalize(essay_vector)
+
+    # raw similarity (행렬-벡터 곱 두 번 + 쌍별 내적)
+    job_sims = job_units @ essay_unit
+    company_sims = company_units @ essay_unit
+    if job_company_sims is None:
+        job_company_sims = np.einsum("ij,ij->i", job_units, company_units)
+
+    default = _anchor_rows([DEFAULT_ANCHOR])
+    if job_anchors is None:
+        job_anchors = np.repeat(default, len(job_units), axis=0)
+    if company_anchors is None:
+        company_anchors = np.repeat(default, len(company_units), axis=0)
+
+    job_fits = calibrate_scores(job_sims, *job_anchors.T)
+    company_fits = calibrate_scores(company_sims, *company_anchors.T)
+    alignments = calibrate_scores(job_company_sims, *default.T)
+
+    results = []
+    for i in range(len(job_units)):
+        results.append({
+            "job_fit": float(job_fits[i]),
+            "company_fit": float(company_fits[i]),
+            "job_company_alignment": float(alignments[i]),
+            "raw": {
+                "job_sim": round(float(job_sims[i]), 4),
+                "company_sim": round(float(company_sims[i]), 4),
+                "job_company_sim": round(float(job_company_sims[i]), 4)
+            }
+        })
+    return results
 
 
 # 문장 단위 유사도 (그대로 유지)
@@ -88,16 +200,14 @@ def compute_sentence_level_similarity(
     sentence_embeddings: np.ndarray
 ) -> Dict[str, List[float]]:
 
-    job_sims = []
-    comp_sims = []
+    if len(sentence_embeddings) == 0:
+        return {"job_sims": [], "company_sims": []}
 
-    for vec in sentence_embeddings:
-        job_sims.append(cosine_similarity(job_vector, vec))
-        comp_sims.append(cosine_similarity(company_vector, vec))
+    sims = cosine_scores(sentence_embeddings, np.stack([job_vector, company_vector]))
 
     return {
-        "job_sims": job_sims,
-        "company_sims": comp_sims
+        "job_sims": sims[:, 0].tolist(),
+        "company_sims": sims[:, 1].tolist()
     }
 
 
@@ -0,0 +1,335 @@
+"""
+sparse_index.py
+
+직무 설명(work_summary / skills / knowledge)에 대한 BM25 역색인과
+dense(SBERT) 점수를 섞는 하이브리드 직무 검색 모듈.
+
+- 색인 단위 : 한글 문자 n-gram(기본, 외부 의존성 없음) 또는 형태소 토큰(nlp.tokenization 백엔드)
+- 역색인   : CSR 형태의 압축 배열
+             term_offsets(int64) / posting_docs(int32) / posting_weight(float32)
+             posting_weight에는 문서 길이 정규화까지 끝난 BM25 항 가중치를 미리 저장
+- 질의     : 질의 용어별 posting 구간을 이어 붙여 bincount 한 번으로 문서 점수 합산
+- 융합     : BM25 / dense 점수를 각각 최대값으로 나눈 뒤 alpha 가중합
+- dense    : 직무 ANN 인덱스(nlp.ann_index)가 저장돼 있으면 후보 직무만 점수를 채운다
+- 설명     : 상위 직무마다 점수에 기여한 용어와 기여도를 함께 반환
+
+data/bm25_index.npz 로 저장 (selfintro_app/scripts/build_bm25_index.py),
+파일이 없으면 첫 호출 때 만들어 프로세스 안에서 재사용한다.
+online_store로 추가된 직무가 색인에 없으면 그 직무까지 포함해 다시 만든다.
+"""
+
+from __future__ import annotations
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import re
+
+import numpy as np
+
+from nlp.ann_index import ExactIndex, load_job_search_index
+from nlp.artifacts import atomic_write, derived_artifact, hot_artifact
+from nlp.loaders import load_job_index, load_raw_job_vectors
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+BM25_INDEX_PATH = BASE_DIR / "selfintro_app" / "scripts" / "data" / "bm25_index.npz"
+
+# 색인할 직무 필드
+INDEX_FIELDS = ("work_summary", "skills", "knowledge")
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 문자 n-gram 길이
+CHAR_NGRAM_RANGE = (2, 3)
+
+# 하이브리드 기본 가중치 (1.0 = dense만, 0.0 = BM25만)
+DEFAULT_ALPHA = 0.5
+
+# 직무 ANN 인덱스 사용 시 dense 점수를 채울 후보 직무 수
+ANN_JOB_CANDIDATES = 200
+
+_WORD_RE = re.compile(r"[가-힣]+|[A-Za-z]+|[0-9]+")
+
+
+# 용어 추출
+
+def char_ngrams(text: str, ngram_range=CHAR_NGRAM_RANGE) -> List[str]:
+    """어절(한글/영문/숫자 덩어리) 안에서만 문자 n-gram 생성 (짧은 어절은 통째로)"""
+    lo, hi = ngram_range
+    terms = []
+    for word in _WORD_RE.findall(text.lower()):
+        if len(word) < lo:
+            terms.append(word)
+            continue
+        for n in range(lo, hi + 1):
+            terms.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return terms
+
+
+def analyze_terms(text: str, analyzer: str = "char") -> List[str]:
+    """
+    analyzer="char"     : 문자 n-gram
+    analyzer=백엔드 이름 : nlp.tokenization 형태소 토큰 중 명사 + 영문
+    """
+    if analyzer == "char":
+        return char_ngrams(text)
+
+    from nlp.tokenization import NOUN_TAGS, tokenize
+
+    return [
+        t.surface.lower() for t in tokenize(text, backend=analyzer)
+        if (t.tag in NOUN_TAGS or t.tag == "Alpha") and len(t.surface) > 1
+    ]
+
+
+def job_document(job_info: Dict) -> str:
+    parts = []
+    for field in INDEX_FIELDS:
+        value = job_info.get(field) or ""
+        parts.append(" ".join(value) if isinstance(value, list) else value)
+    return " ".join(parts)
+
+
+# 역색인
+
+class BM25Index:
+    """
+    doc_ids        : 직무 id 리스트
+    terms          : 용어 리스트 (term_offsets 순서)
+    term_offsets   : (용어 수 + 1,) 용어별 posting 구간
+    posting_docs   : 문서 위치 (용어 구간 안에서 오름차순)
+    posting_weight : BM25 항 가중치 idf * tf(k1+1) / (tf + k1(1 - b + b·dl/avgdl))
+    """
+
+    def __init__(
+        self,
+        doc_ids: Sequence,
+        terms: Sequence[str],
+        term_offsets: np.ndarray,
+        posting_docs: np.ndarray,
+        posting_weight: np.ndarray,
+        analyzer: str = "char",
+    ):
+        self.doc_ids = list(doc_ids)
+        self.terms = list(terms)
+        self.term_offsets = np.asarray(term_offsets, dtype=np.int64)
+        self.posting_docs = np.asarray(posting_docs, dtype=np.int32)
+        self.posting_weight = np.asarray(posting_weight, dtype=np.float32)
+        self.analyzer = analyzer
+        self._term_pos = {term: pos for pos, term in enumerate(self.terms)}
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def query_terms(self, text: str) -> Dict[int, int]:
+        """질의 → {용어 위치: 질의 내 등장 횟수} (색인에 없는 용어 제외)"""
+        counts = Counter(analyze_terms(text, self.analyzer))
+        return {
+            self._term_pos[term]: cnt for term, cnt in counts.items()
+            if term in self._term_pos
+        }
+
+    def score(self, query: Dict[int, int]) -> np.ndarray:
+        """query_terms() 결과 → (문서 수,) BM25 점수"""
+        if not query:
+            return np.zeros(len(self.doc_ids), dtype=np.float32)
+
+        starts = self.term_offsets[list(query)]
+        stops = self.term_offsets[[t + 1 for t in query]]
+        lengths = stops - starts
+
+        # 질의 용어들의 posting 구간을 한 번에 모아 bincount 합산
+        idx = np.concatenate([np.arange(s, e) for s, e in zip(starts, stops)])
+        weights = self.posting_weight[idx] * np.repeat(list(query.values()), lengths)
+
+        return np.bincount(
+            self.posting_docs[idx], weights=weights, minlength=len(self.doc_ids)
+        ).astype(np.float32)
+
+    def term_contributions(self, query: Dict[int, int], doc_pos: int, top_n: int = 10) -> List[Dict]:
+        """문서 하나의 BM25 점수를 질의 용어별 기여도로 분해"""
+        contributions = []
+        for term_pos, qtf in query.items():
+            start, stop = self.term_offsets[term_pos], self.term_offsets[term_pos + 1]
+            docs = self.posting_docs[start:stop]
+            hit = np.searchsorted(docs, doc_pos)
+            if hit < len(docs) and docs[hit] == doc_pos:
+                contributions.append({
+                    "term": self.terms[term_pos],
+                    "contribution": round(float(self.posting_weight[start + hit]) * qtf, 4),
+                })
+
+        contributions.sort(key=lambda c: -c["contribution"])
+        return contributions[:top_n]
+
+
+def build_bm25_index(
+    raw_jobs: Optional[Dict] = None,
+    analyzer: str = "char",
+    k1: float = BM25_K1,
+    b: float = BM25_B,
+) -> BM25Index:
+    if raw_jobs is None:
+        raw_jobs = load_raw_job_vectors()
+
+    doc_ids = list(raw_jobs.keys())
+    doc_terms = [Counter(analyze_terms(job_document(raw_jobs[d]), analyzer)) for d in doc_ids]
+
+    doc_len = np.array([sum(c.values()) for c in doc_terms], dtype=np.float64)
+    avgdl = float(doc_len.mean()) if len(doc_len) else 0.0
+
+    # 용어 → [(문서 위치, tf)] (문서 위치 오름차순으로 쌓인다)
+    postings: Dict[str, List] = {}
+    for doc_pos, counts in enumerate(doc_terms):
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append((doc_pos, tf))
+
+    terms = sorted(postings)
+    n_docs = len(doc_ids)
+
+    term_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    term_offsets[1:] = np.cumsum([len(postings[t]) for t in terms])
+
+    posting_docs = np.empty(term_offsets[-1], dtype=np.int32)
+    posting_tf = np.empty(term_offsets[-1], dtype=np.float64)
+    df = np.empty(len(terms), dtype=np.float64)
+
+    for pos, term in enumerate(terms):
+        start, stop = term_offsets[pos], term_offsets[pos + 1]
+        docs, tfs = zip(*postings[term])
+        posting_docs[start:stop] = docs
+        posting_tf[start:stop] = tfs
+        df[pos] = stop - start
+
+    # BM25 (Lucene 방식 idf: 항상 양수)
+    idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+    term_of_posting = np.repeat(np.arange(len(terms)), np.diff(term_offsets))
+    norm = k1 * (1 - b + b * doc_len[posting_docs] / max(avgdl, 1e-8))
+    posting_weight = idf[term_of_posting] * posting_tf * (k1 + 1) / (posting_tf + norm)
+
+    return BM25Index(doc_ids, terms, term_offsets, posting_docs, posting_weight, analyzer)
+
+
+def save_bm25_index(index: BM25Index, path: Optional[Path] = None):
+    with atomic_write(path or BM25_INDEX_PATH) as f:
+        np.savez_compressed(
+            f,
+            doc_ids=np.asarray(index.doc_ids),
+            terms=np.asarray(index.terms),
+            term_offsets=index.term_offsets,
+            posting_docs=index.posting_docs,
+            posting_weight=index.posting_weight,
+            analyzer=np.asarray(index.analyzer),
+        )
+
+
+@hot_artifact(BM25_INDEX_PATH)
+def _load_base_bm25_index() -> BM25Index:
+    """저장된 BM25 색인 (없으면 지금 만들어서 프로세스 안에서 재사용, 다시 게시되면 교체)"""
+    if not BM25_INDEX_PATH.exists():
+        return build_bm25_index()
+
+    with np.load(BM25_INDEX_PATH, allow_pickle=False) as data:
+        return BM25Index(
+            data["doc_ids"].tolist(),
+            data["terms"].tolist(),
+            data["term_offsets"],
+            data["posting_docs"],
+            data["posting_weight"],
+            str(data["analyzer"]),
+        )
+
+
+@derived_artifact(_load_base_bm25_index, load_raw_job_vectors)
+def load_bm25_index(base: BM25Index, raw_jobs: Dict) -> BM25Index:
+    """
+    현재 직무 전체에 대한 BM25 색인.
+    online_store로 추가된 직무가 색인에 없으면 (idf / 평균 문서 길이가 바뀌므로) 같은 analyzer로
+    다시 만든다. 추가가 있을 때 한 번만 만들고, 이후 요청은 그 색인을 재사용한다.
+    """
+    indexed = set(base.doc_ids)
+    if all(job_id in indexed for job_id in raw_jobs):
+        return base
+    return build_bm25_index(raw_jobs, analyzer=base.analyzer)
+
+
+# 하이브리드 검색
+
+def _dense_scores(
+    doc_ids: List,
+    essay_vector: np.ndarray,
+    nprobe: Optional[int] = None,
+) -> np.ndarray:
+    """BM25 문서 순서에 맞춘 dense 코사인 (임베딩이 없거나 ANN 후보 밖인 직무는 0)"""
+    job_index = load_job_index()
+    scores = np.zeros(len(doc_ids), dtype=np.float32)
+
+    search_index = load_job_search_index(job_index)
+    if isinstance(search_index, ExactIndex):
+        dense = search_index.scores(essay_vector)[0]
+    else:
+        dense = np.zeros(len(job_index), dtype=np.float32)
+        top_scores, top = search_index.search(essay_vector, k=ANN_JOB_CANDIDATES, nprobe=nprobe)
+        found = top[0] >= 0
+        dense[top[0][found]] = top_scores[0][found]
+
+    present = [(i, job_index.position(d)) for i, d in enumerate(doc_ids) if d in job_index]
+    if present:
+        dst, src = zip(*present)
+        scores[list(dst)] = dense[list(src)]
+    return scores
+
+
+def _scale(scores: np.ndarray) -> np.ndarray:
+    top = float(scores.max()) if len(scores) else 0.0
+    return scores / top if top > 0 else np.zeros_like(scores)
+
+
+def hybrid_search(
+    essay_text: str,
+    essay_vector: Optional[np.ndarray] = None,
+    top_k: int = 10,
+    alpha: float = DEFAULT_ALPHA,
+    explain_terms: int = 10,
+    nprobe: Optional[int] = None,
+) -> List[Dict]:
+    """
+    자소서와 가까운 직무를 BM25 + dense 점수로 검색한다.
+
+    essay_vector가 없으면 BM25만 사용한다 (alpha 무시).
+    nprobe는 직무 ANN 인덱스가 있을 때만 쓰인다 (None이면 인덱스 기본값).
+
+    Returns
+    -------
+    List[Dict]
+        [{"rank", "job_id", "score", "bm25", "dense", "terms": [{"term", "contribution"}]}, ...]
+    """
+    index = load_bm25_index()
+    query = index.query_terms(essay_text)
+    bm25 = index.score(query)
+
+    if essay_vector is not None:
+        dense = _dense_scores(index.doc_ids, essay_vector, nprobe)
+        fused = alpha * _scale(np.clip(dense, 0, None)) + (1 - alpha) * _scale(bm25)
+    else:
+        dense = None
+        fused = _scale(bm25)
+
+    k = min(top_k, len(fused))
+    if k <= 0:
+        return []
+    top = np.argpartition(-fused, k - 1)[:k]
+    top = top[np.argsort(-fused[top], kind="stable")]
+
+    results = []
+    for rank, doc_pos in enumerate(top, start=1):
+        results.append({
+            "rank": rank,
+            "job_id": index.doc_ids[doc_pos],
+            "score": round(float(fused[doc_pos]), 4),
+            "bm25": round(float(bm25[doc_pos]), 4),
+            "dense": None if dense is None else round(float(dense[doc_pos]), 4),
+            "terms": index.term_contributions(query, doc_pos, top_n=explain_terms),
+        })
+    return results
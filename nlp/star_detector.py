@@ -5,16 +5,16 @@ SBERT 임베딩을 활용한 문장 의미 기반 S/T/A/R 태깅
 
 from __future__ import annotations
 from typing import List, Tuple
-import re
 import numpy as np
 
 from nlp.embedding import embed_sentences   # 여러 문장 임베딩
+from nlp.segmentation import split_sentences as segment_split
+from nlp.similarity import cosine_scores, l2_normalize
 
 
-# 문장 나누기
+# 문장 나누기 (전처리·임베딩과 같은 분리 규칙)
 def split_sentences(text: str) -> List[str]:
-    sentences = re.split(r"[.!?]\s*|\n", text)
-    return [s.strip() for s in sentences if s.strip()]
+    return segment_split(text)
 
 # STAR 예시 문장 정의
 S_examples = [
@@ -117,38 +117,55 @@ T_vec = get_center_vector(T_examples)
 A_vec = get_center_vector(A_examples)
 R_vec = get_center_vector(R_examples)
 
+# S/T/A/R 대표 벡터를 정규화해 한 행렬로 보관 (문장 × 라벨 = 행렬곱 한 번)
+STAR_LABELS = ("S", "T", "A", "R")
+_STAR_MATRIX = l2_normalize(np.stack([S_vec, T_vec, A_vec, R_vec]))
 
-# 코사인 유사도
-def cosine_similarity(v1, v2):
-    v1 = np.array(v1)
-    v2 = np.array(v2)
-    return float(np.dot(v1, v2) / ((np.linalg.norm(v1) * np.linalg.norm(v2)) + 1e-8))
+STAR_THRESHOLD = 0.20
 
 
 # 문장 하나 태깅
 def label_sentence(sentence: str) -> str:
     vec = embed_sentences([sentence])[0]
+    return label_vector(vec)
 
-    sims = {
-        "S": cosine_similarity(vec, S_vec),
-        "T": cosine_similarity(vec, T_vec),
-        "A": cosine_similarity(vec, A_vec),
-        "R": cosine_similarity(vec, R_vec),
-    }
 
-    best = max(sims, key=sims.get)
-    best_score = sims[best]
+# 이미 계산된 문장 벡터 태깅 (재임베딩 없음)
+def label_vector(vec: np.ndarray) -> str:
+    return label_vectors(np.asarray(vec)[None, :])[0]
+
 
-    if best_score < 0.20:
-        return "O"
+def label_vectors(vectors: np.ndarray) -> List[str]:
+    """문장 벡터 행렬 전체를 한 번에 태깅 (최고 유사도가 STAR_THRESHOLD 미만이면 "O")"""
+    if len(vectors) == 0:
+        return []
 
-    return best
+    sims = cosine_scores(vectors, _STAR_MATRIX, normalized=False)
+    best_idx = sims.argmax(axis=1)
+    best_sims = sims[np.arange(len(sims)), best_idx]
+
+    return [
+        STAR_LABELS[idx] if score >= STAR_THRESHOLD else "O"
+        for idx, score in zip(best_idx, best_sims)
+    ]
 
 
 # 전체 문장 태깅
 def tag_star_semantic(text: str) -> List[Tuple[str, str]]:
     sentences = split_sentences(text)
-    return [(s, label_sentence(s)) for s in sentences]
+    if not sentences:
+        return []
+    return tag_star_from_embeddings(sentences, embed_sentences(sentences))
+
+
+def tag_star_from_embeddings(
+    sentences: List[str],
+    sentence_embeddings: np.ndarray
+) -> List[Tuple[str, str]]:
+    """
+    report_builder 등에서 이미 임베딩한 문장을 그대로 태깅.
+    """
+    return list(zip(sentences, label_vectors(sentence_embeddings)))
 
 
 # STAR 에피소드로 묶기
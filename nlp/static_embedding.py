@@ -0,0 +1,146 @@
+"""
+static_embedding.py
+
+실시간 미리보기용 정적(static) 토큰 임베딩 인코더.
+
+- ko-sroberta-multitask에서 오프라인으로 증류한 토큰(subword) 임베딩 테이블 사용
+  (selfintro_app/scripts/build_static_embeddings.py)
+- 순수 Python WordPiece 토큰화 + 가중 평균 풀링 → torch/SBERT 호출 없음
+- SentenceTransformer와 같은 encode() 인터페이스를 제공하므로
+  nlp.embedding에서 모델 이름만 바꿔 그대로 사용할 수 있다.
+
+정확도는 SBERT보다 낮으므로 타이핑 중 대략적인 적합도 미리보기 용도로만 쓴다.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Union
+import re
+import threading
+
+import numpy as np
+
+from nlp.artifacts import atomic_write
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+STATIC_MODEL_PATH = BASE_DIR / "selfintro_app" / "scripts" / "data" / "static_embedding.npz"
+
+# WordPiece 이어지는 토큰 접두사 (BERT 계열 토크나이저 규칙)
+SUBWORD_PREFIX = "##"
+
+# BERT basic tokenizer와 비슷하게 단어/문장부호 단위로 먼저 자른다
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+
+# 단어 → 토큰 id 캐시 크기 (단어 수, 오래 안 쓴 단어부터 버림)
+WORD_CACHE_SIZE = 50_000
+
+
+class StaticEmbeddingModel:
+    """
+    토큰 → 벡터 테이블 기반 문장 인코더.
+
+    Parameters
+    ----------
+    tokens : List[str]
+        WordPiece 토큰 목록 (이어지는 토큰은 '##' 접두사).
+    table : np.ndarray
+        (num_tokens, dim) 토큰 임베딩.
+    weights : np.ndarray
+        (num_tokens,) 토큰 가중치 (SIF 방식: 흔한 토큰일수록 작음).
+    """
+
+    def __init__(self, tokens: List[str], table: np.ndarray, weights: np.ndarray):
+        self.tokens = list(tokens)
+        self.table = np.asarray(table, dtype=np.float32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.vocab: Dict[str, int] = {tok: idx for idx, tok in enumerate(self.tokens)}
+        self.max_token_len = max((len(t) for t in self.tokens), default=1)
+        self._word_cache: "OrderedDict[str, List[int]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = STATIC_MODEL_PATH) -> "StaticEmbeddingModel":
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(
+                f"정적 임베딩 테이블이 없습니다: {path} "
+                "(selfintro_app/scripts/build_static_embeddings.py 실행 필요)"
+            )
+        data = np.load(path, allow_pickle=False)
+        return cls(data["tokens"].tolist(), data["table"], data["weights"])
+
+    def save(self, path: Union[str, Path] = STATIC_MODEL_PATH):
+        with atomic_write(path) as f:
+            np.savez(
+                f,
+                tokens=np.array(self.tokens),
+                table=self.table,
+                weights=self.weights,
+            )
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.table.shape[1]
+
+    # 토큰화 (greedy longest-match WordPiece)
+    def _tokenize_word(self, word: str) -> List[int]:
+        with self._cache_lock:
+            cached = self._word_cache.get(word)
+            if cached is not None:
+                self._word_cache.move_to_end(word)
+                return cached
+
+        ids = []
+        start = 0
+        while start < len(word):
+            end = min(len(word), start + self.max_token_len)
+            found = None
+            while end > start:
+                piece = word[start:end]
+                if start > 0:
+                    piece = SUBWORD_PREFIX + piece
+                if piece in self.vocab:
+                    found = self.vocab[piece]
+                    break
+                end -= 1
+
+            if found is None:
+                # 사전에 없는 글자는 건너뛴다
+                start += 1
+            else:
+                ids.append(found)
+                start = end
+
+        with self._cache_lock:
+            self._word_cache[word] = ids
+            if len(self._word_cache) > WORD_CACHE_SIZE:
+                self._word_cache.popitem(last=False)
+        return ids
+
+    def tokenize_ids(self, text: str) -> List[int]:
+        ids = []
+        for word in _WORD_RE.findall(text):
+            ids.extend(self._tokenize_word(word))
+        return ids
+
+    # SentenceTransformer.encode 호환
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        convert_to_numpy: bool = True,
+        **kwargs,
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        out = np.zeros((len(sentences), self.table.shape[1]), dtype=np.float32)
+
+        for row, sent in enumerate(sentences):
+            ids = self.tokenize_ids(sent)
+            if not ids:
+                continue
+            w = self.weights[ids]
+            out[row] = (w @ self.table[ids]) / (w.sum() + 1e-8)
+
+        return out[0] if single else out
@@ -0,0 +1,309 @@
+"""
+tokenization.py
+
+요청 당 한 번의 형태소 분석 결과(토큰 배열)를 여러 분석 단계가 공유하도록 하는 모듈.
+
+- Token(surface, tag, start, end) : 표층형, 품사, 원문 문자 오프셋
+- 백엔드 선택 : "okt"(konlpy, JVM) / "mecab"(python-mecab-ko 또는 konlpy, JVM 없음)
+                / "regex"(순수 Python 근사, 외부 의존성 없음)
+- 분석기는 첫 사용 시점에 만들고(import 시 JVM 기동 없음), 동시 호출을 위해 풀로 관리
+- 텍스트 해시 기반 캐시 → 같은 텍스트는 백엔드별로 한 번만 분석
+- 기본 백엔드는 환경변수 NLP_TOKENIZER_BACKEND 로 배포별 선택
+  (selfintro_app/scripts/bench_tokenizers.py 로 처리량/정확도 비교)
+- 명사 추출 / 형태소 나열 / 정규화는 모두 이 토큰 배열을 읽어서 처리
+
+품사 태그는 Okt 태그 체계(Noun, Verb, Josa, ...)를 기본으로 하고,
+Mecab 태그(NNG, NNP, ...)는 그대로 둔 채 NOUN_TAGS로 함께 처리한다.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+import hashlib
+import importlib.util
+import os
+import queue
+import re
+import threading
+
+
+class Token(NamedTuple):
+    surface: str
+    tag: str
+    start: int
+    end: int
+
+
+TokenStream = Tuple[Token, ...]
+
+# 명사로 취급하는 태그 (Okt / Mecab)
+NOUN_TAGS = frozenset({"Noun", "NNG", "NNP"})
+
+TOKENIZER_BACKENDS = ("okt", "mecab", "regex")
+
+# 캐시 크기 (텍스트 수)
+CACHE_SIZE = 256
+
+# 백엔드별 최대 분석기 인스턴스 수 (동시 호출 수)
+POOL_SIZE = 4
+
+
+# 백엔드 구현
+
+def _align(text: str, pairs: Sequence[Tuple[str, str]]) -> TokenStream:
+    """(표층형, 품사) 리스트를 원문에 맞춰 문자 오프셋을 붙인다."""
+    tokens = []
+    cursor = 0
+    for surface, tag in pairs:
+        start = text.find(surface, cursor)
+        if start < 0:
+            # 분석기가 표층형을 바꾼 경우: 현재 위치에 길이 0으로 둔다
+            start = end = cursor
+        else:
+            end = start + len(surface)
+            cursor = end
+        tokens.append(Token(surface, tag, start, end))
+    return tuple(tokens)
+
+
+class AnalyzerPool:
+    """
+    형태소 분석기 인스턴스 풀.
+    인스턴스는 처음 필요할 때 만들고, 동시 호출이 늘면 size개까지 추가로 만든다.
+    """
+
+    def __init__(self, factory: Callable[[], object], size: int = POOL_SIZE):
+        self._factory = factory
+        self._size = size
+        self._idle: "queue.LifoQueue[object]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self) -> Iterator[object]:
+        try:
+            analyzer = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self._size
+                if create:
+                    self._created += 1
+
+            if create:
+                try:
+                    analyzer = self._factory()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                # 모든 인스턴스가 사용 중이면 반납될 때까지 대기
+                analyzer = self._idle.get()
+
+        try:
+            yield analyzer
+        finally:
+            self._idle.put(analyzer)
+
+
+def _make_okt():
+    from konlpy.tag import Okt
+    return Okt()
+
+
+def _make_mecab():
+    # python-mecab-ko (사전 포함 wheel) 우선, 없으면 konlpy Mecab — 둘 다 JVM 불필요
+    try:
+        from mecab import MeCab
+        return MeCab()
+    except ImportError:
+        from konlpy.tag import Mecab
+        return Mecab()
+
+
+_POOLS = {
+    "okt": AnalyzerPool(_make_okt),
+    "mecab": AnalyzerPool(_make_mecab),
+}
+
+
+def _pooled_pos(backend: str, text: str) -> TokenStream:
+    with _POOLS[backend].acquire() as analyzer:
+        pairs = analyzer.pos(text)
+    return _align(text, pairs)
+
+
+def _okt_pos(text: str) -> TokenStream:
+    return _pooled_pos("okt", text)
+
+
+def _mecab_pos(text: str) -> TokenStream:
+    return _pooled_pos("mecab", text)
+
+
+# 순수 Python 근사 분석기 (JVM / 사전 없이 동작)
+_REGEX_TOKEN = re.compile(r"[가-힣]+|[A-Za-z]+|[0-9]+|[^\s가-힣A-Za-z0-9]")
+
+# 용언 어미 (긴 것부터 매칭)
+_PREDICATE_ENDINGS = sorted([
+    "했습니다", "합니다", "습니다", "었습니다", "였습니다", "됩니다", "되었습니다",
+    "했다", "한다", "된다", "되었다", "였다", "었다",
+    "하여", "하며", "하고", "하는", "하던", "했던", "하기", "해서",
+    "되어", "되는", "되고", "되며", "되었던",
+    "하면서", "하면", "하게", "하지",
+], key=len, reverse=True)
+
+# 체언 뒤 조사 (긴 것부터 매칭)
+_JOSA = sorted([
+    "에서는", "에서도", "으로써", "으로서", "으로도", "에게서", "까지도", "이라는", "라는", "에도", "이나",
+    "으로", "에서", "에게", "까지", "부터", "처럼", "보다", "으로는", "에는", "와의", "과의",
+    "와", "과", "을", "를", "이", "가", "은", "는", "의", "에", "도", "로", "만",
+], key=len, reverse=True)
+
+
+# '하다/되다' 파생 용언 어미 → 앞부분은 명사 (예: 해결 + 했습니다)
+_DERIVED_PREFIXES = ("하", "했", "합", "해", "되", "됩")
+
+# 그 밖의 용언 연결/종결 어미 (예: 나누며, 어려웠지만) → 어절 전체를 용언으로
+# 명사 끝 글자와 겹치기 쉬운 한 글자 어미(고, 다, 서, ...)는 넣지 않는다 (최고, 바다, 도서)
+_VERB_ENDINGS = (
+    "습니다", "니다", "었다", "았다", "였다", "겠다",
+    "었던", "았던", "었고", "았고", "면서", "지만", "는데", "어서", "아서", "며",
+)
+
+# 체언 뒤 서술격 조사 (용언 어미보다 먼저 본다: 학생이며, 목표이지만)
+_COPULA = ("이지만", "이며")
+
+# 조사를 떼어낸 뒤 남는 체언의 최소 음절 수
+# (한 음절 체언 + 조사보다 조사처럼 끝나는 두 음절 명사가 훨씬 흔함: 평가, 결과, 회의)
+_MIN_STEM_LEN = 2
+
+# 예외로 조사를 떼는 자주 쓰는 한 음절 체언 (저는, 팀을, 일에)
+_SHORT_STEMS = frozenset({"저", "나", "제", "내", "팀", "일", "중", "것", "수", "때", "곳", "점", "등", "꿈", "힘"})
+
+
+def _has_stem(word: str, suffix: str) -> bool:
+    stem = word[: -len(suffix)]
+    return len(stem) >= _MIN_STEM_LEN or stem in _SHORT_STEMS
+
+
+def _split_eojeol(word: str) -> List[Tuple[str, str]]:
+    for ending in _PREDICATE_ENDINGS:
+        if word.endswith(ending) and len(word) > len(ending):
+            if not ending.startswith(_DERIVED_PREFIXES):
+                return [(word, "Verb")]
+            return [(word[: -len(ending)], "Noun"), (ending, "Verb")]
+
+    for josa in _COPULA:
+        if word.endswith(josa) and _has_stem(word, josa):
+            return [(word[: -len(josa)], "Noun"), (josa, "Josa")]
+
+    if len(word) > 1 and word.endswith(_VERB_ENDINGS):
+        return [(word, "Verb")]
+
+    for josa in _JOSA:
+        if word.endswith(josa) and _has_stem(word, josa):
+            return [(word[: -len(josa)], "Noun"), (josa, "Josa")]
+
+    return [(word, "Noun")]
+
+
+def _regex_pos(text: str) -> TokenStream:
+    pairs = []
+    for word in _REGEX_TOKEN.findall(text):
+        if "가" <= word[0] <= "힣":
+            pairs.extend(_split_eojeol(word))
+        elif word[0].isascii() and word[0].isalpha():
+            pairs.append((word, "Alpha"))
+        elif word[0].isdigit():
+            pairs.append((word, "Number"))
+        else:
+            pairs.append((word, "Punctuation"))
+    return _align(text, pairs)
+
+
+_BACKENDS: Dict[str, Callable[[str], TokenStream]] = {
+    "okt": _okt_pos,
+    "mecab": _mecab_pos,
+    "regex": _regex_pos,
+}
+
+def available_backends() -> List[str]:
+    """설치된 라이브러리 기준으로 사용 가능한 백엔드 (분석기는 만들지 않음)"""
+    found = []
+    if importlib.util.find_spec("konlpy") is not None:
+        found.append("okt")
+    if (
+        importlib.util.find_spec("mecab") is not None
+        or importlib.util.find_spec("MeCab") is not None
+    ):
+        found.append("mecab")
+    found.append("regex")
+    return found
+
+
+DEFAULT_BACKEND = os.environ.get("NLP_TOKENIZER_BACKEND", "okt")
+
+
+def set_default_backend(backend: str):
+    global DEFAULT_BACKEND
+    if backend not in _BACKENDS:
+        raise ValueError(f"지원하지 않는 tokenizer backend: {backend}")
+    DEFAULT_BACKEND = backend
+
+
+# 캐시 + 진입점
+
+_CACHE: "OrderedDict[Tuple[str, str], TokenStream]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def tokenize(text: str, backend: Optional[str] = None) -> TokenStream:
+    """
+    텍스트를 한 번만 형태소 분석해 Token 튜플로 반환한다.
+    (backend, 텍스트 해시)로 캐시하므로 같은 요청 안의 여러 단계가 공유한다.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend not in _BACKENDS:
+        raise ValueError(f"지원하지 않는 tokenizer backend: {backend}")
+
+    if not text:
+        return ()
+
+    key = (backend, _text_key(text))
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+        if cached is not None:
+            _CACHE.move_to_end(key)
+            return cached
+
+    tokens = _BACKENDS[backend](text)
+
+    with _CACHE_LOCK:
+        _CACHE[key] = tokens
+        if len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)
+
+    return tokens
+
+
+def clear_cache():
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+# 토큰 배열 읽기 유틸
+
+def nouns(tokens: Sequence[Token]) -> List[str]:
+    """okt.nouns()와 같은 결과 (명사 표층형 리스트)"""
+    return [t.surface for t in tokens if t.tag in NOUN_TAGS]
+
+
+def morphs(tokens: Sequence[Token]) -> List[str]:
+    """okt.morphs()와 같은 결과 (전체 형태소 표층형 리스트)"""
+    return [t.surface for t in tokens]
@@ -0,0 +1,58 @@
+# selfintro_app/scripts/append_record.py
+#
+# 기업 / 직무 레코드를 전체 재빌드 없이 추가 (nlp.online_store)
+#
+# 1) JSON 레코드 로드 (파일 경로 또는 '-' = 표준입력, 객체 하나 또는 리스트)
+#    - 기업: company_profiles.json 과 같은 필드 (company_id, company_name, industry, summary, ...)
+#    - 직무: career_job_vectors.json 과 같은 필드 (job_cd, job_nm, work_summary, skills, ...)
+# 2) 새 레코드만 SBERT 임베딩 (빌드 스크립트와 같은 모델 / 병합 문장)
+# 3) data/<종류>_delta.npz 에 원자적으로 추가 (임시 파일 → rename)
+#    → 실행 중인 앱은 다음 요청에서 새 버전 인덱스로 교체 (재시작 불필요)
+#
+# 사용법: python append_record.py company new_company.json
+#         cat new_job.json | python append_record.py job -
+
+import json
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+PROJECT_ROOT = BASE_DIR.parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.loaders import load_company_index, load_job_index  # noqa: E402
+from nlp.online_store import DELTA_PATHS, ID_KEYS, append_record  # noqa: E402
+
+
+def load_records(source):
+    if source == "-":
+        data = json.load(sys.stdin)
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    return data if isinstance(data, list) else [data]
+
+
+def main():
+    if len(sys.argv) != 3 or sys.argv[1] not in DELTA_PATHS:
+        print("사용법: python append_record.py [job|company] <레코드 JSON 경로 또는 ->")
+        sys.exit(1)
+
+    kind, source = sys.argv[1], sys.argv[2]
+    index = load_job_index() if kind == "job" else load_company_index()
+
+    for record in load_records(source):
+        try:
+            version = append_record(kind, record, existing_ids=index, expected_dim=index.store.dim)
+        except ValueError as e:
+            print(f"추가 실패: {e}")
+            sys.exit(1)
+        print(f"{ID_KEYS[kind]}={record.get(ID_KEYS[kind])} 추가 완료 (version {version})")
+
+    print(f"저장 위치 → {DELTA_PATHS[kind]}")
+
+
+if __name__ == "__main__":
+    main()
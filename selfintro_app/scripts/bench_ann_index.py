@@ -0,0 +1,123 @@
+# selfintro_app/scripts/bench_ann_index.py
+#
+# IVF(+PQ) 근사 검색의 recall@K / 지연을 정확 검색(ExactIndex)과 비교
+#
+# - 대상: 직무 임베딩, 카탈로그 키워드 어휘
+# - 질의: data/reference_essays.json 문장 임베딩 (없으면 대상 벡터에 잡음을 섞은 합성 질의)
+# - nprobe 후보마다 IVF-Flat / IVF-PQ recall@K, 질의당 평균 지연(ms)
+# - recall@K가 TARGET_RECALL 이상인 가장 작은 nprobe를 추천
+#   → build_ann_index.py [nprobe] [pq_m] 로 인덱스 생성
+#
+# 결과: data/ann_benchmark.json
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+PROJECT_ROOT = BASE_DIR.parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.ann_index import ExactIndex, IVFIndex, recall_at_k  # noqa: E402
+from nlp.calibration import load_reference_essays  # noqa: E402
+from nlp.keyword_catalog import load_keyword_catalog  # noqa: E402
+from nlp.loaders import load_job_index  # noqa: E402
+
+OUTPUT_PATH = DATA_DIR / "ann_benchmark.json"
+
+K = 10
+NPROBES = (1, 2, 4, 8, 16, 32)
+PQ_M = 96
+TARGET_RECALL = 0.95
+
+MAX_QUERIES = 500
+NOISE = 0.5
+
+
+def load_queries(matrix: np.ndarray, rng) -> np.ndarray:
+    """참고 자소서 문장 임베딩 (없으면 합성 질의)"""
+    essays = load_reference_essays()
+    if essays:
+        from nlp.embedding import embed_sentences
+        from nlp.preprocessing import preprocess
+
+        sentences = []
+        for text in essays:
+            sentences.extend(preprocess(text)["sentences"])
+            if len(sentences) >= MAX_QUERIES:
+                break
+        if sentences:
+            return embed_sentences(sentences[:MAX_QUERIES], normalize=True)
+
+    picks = rng.choice(len(matrix), min(MAX_QUERIES, len(matrix)), replace=False)
+    noise = rng.standard_normal((len(picks), matrix.shape[1])).astype(np.float32)
+    noise /= np.linalg.norm(noise, axis=1, keepdims=True)
+    return matrix[picks] + NOISE * noise
+
+
+def timed_search(index, queries, **kwargs):
+    start = time.perf_counter()
+    _, positions = index.search(queries, k=K, **kwargs)
+    ms = (time.perf_counter() - start) * 1000 / max(len(queries), 1)
+    return positions, ms
+
+
+def bench(name: str, matrix: np.ndarray, rng) -> dict:
+    queries = load_queries(matrix, rng)
+    exact_pos, exact_ms = timed_search(ExactIndex(matrix), queries)
+    print(f"\n[{name}] 벡터 {len(matrix)}개 | 질의 {len(queries)}개 | 정확 검색 {exact_ms:.3f}ms/질의")
+
+    variants = {"ivf_flat": 0}
+    if matrix.shape[1] % PQ_M == 0:
+        variants["ivf_pq"] = PQ_M
+
+    result = {"size": len(matrix), "queries": len(queries), "exact_ms": round(exact_ms, 4)}
+    for variant, pq_m in variants.items():
+        start = time.perf_counter()
+        index = IVFIndex.build(matrix, pq_m=pq_m)
+        build_s = time.perf_counter() - start
+
+        rows = []
+        for nprobe in NPROBES:
+            if nprobe > index.nlist:
+                break
+            approx_pos, ms = timed_search(index, queries, nprobe=nprobe)
+            recall = recall_at_k(approx_pos, exact_pos)
+            rows.append({"nprobe": nprobe, f"recall@{K}": round(recall, 4), "ms": round(ms, 4)})
+            print(f"  {variant:<8} nlist={index.nlist:<4} nprobe={nprobe:<3} recall@{K}={recall:.3f}  {ms:.3f}ms/질의")
+
+        ok = [r["nprobe"] for r in rows if r[f"recall@{K}"] >= TARGET_RECALL]
+        result[variant] = {
+            "nlist": index.nlist,
+            "build_s": round(build_s, 2),
+            "runs": rows,
+            "recommended_nprobe": ok[0] if ok else None,
+        }
+
+    return result
+
+
+def main():
+    rng = np.random.default_rng(0)
+    report = {}
+
+    job_index = load_job_index()
+    if len(job_index):
+        report["jobs"] = bench("직무", job_index.matrix, rng)
+
+    catalog = load_keyword_catalog()
+    if catalog is not None and catalog.vocab:
+        report["keywords"] = bench("키워드", catalog.matrix, rng)
+
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장 → {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# selfintro_app/scripts/bench_tokenizers.py
+#
+# 형태소 분석 백엔드(okt / mecab / regex) 처리량 + 반복 표현 fixture 통과 여부 비교
+#
+# - 백엔드별 초기화 시간 (JVM 기동 포함), 자소서당 분석 시간, 초당 문자 수
+# - 스레드 N개 동시 호출 시 처리량 (분석기 풀 효과 확인)
+# - analyze_repetition fixture 통과 여부 (잡아야 하는 반복 단어 / 명사로 잡으면 안 되는 어절)
+# - fixture를 모두 통과한 백엔드 중 가장 빠른 것을 추천
+#   → 배포 환경에서 NLP_TOKENIZER_BACKEND=<backend> 로 지정
+#
+# 결과: data/tokenizer_benchmark.json
+
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+PROJECT_ROOT = BASE_DIR.parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp import tokenization  # noqa: E402
+from nlp.repetition_detector import analyze_repetition  # noqa: E402
+
+OUTPUT_PATH = DATA_DIR / "tokenizer_benchmark.json"
+
+ROUNDS = 20
+THREADS = 4
+
+
+# 실제 자소서 분량/문체의 예시 + 반드시 잡아야 하는 반복 단어
+FIXTURES = [
+    {
+        "text": (
+            "저는 프로젝트를 수행하며 다양한 경험을 쌓았습니다. "
+            "해당 프로젝트에서 문제를 해결했습니다. "
+            "또 다른 프로젝트에서도 협업을 통해 문제를 해결했습니다. "
+            "저는 문제 해결 능력을 키우기 위해 노력했습니다."
+        ),
+        "expect_words": ["프로젝트", "문제"],
+    },
+    {
+        "text": (
+            "현재 금융권 취업 동아리 활동 중이며, 노년층의 디지털 문맹을 해소하기 위한 활동을 진행한 경험이 있습니다. "
+            "노년층분들이 자주 방문하는 노인정, 요양원 등 직접 방문하여 은행 앱 사용법을 친절히 알려드렸습니다. "
+            "이 경험을 통해 실질적인 금융 지원의 필요성을 체감했고, 지역 사회에 기여하는 금융 서비스의 중요성을 느꼈습니다. "
+            "신협은 사람 중심의 금융을 실천하며, 지역사회와 조합원의 삶의 질 향상에 기여하는 금융기관입니다."
+        ),
+        "expect_words": ["금융"],
+    },
+    {
+        "text": (
+            "팀 프로젝트에서 API 서버 오류가 반복되는 상황이었습니다. "
+            "저는 원인 분석과 복구 역할을 맡았습니다. 로그 분석을 통해 문제 구간을 찾았습니다. "
+            "분석 결과를 팀원과 공유하고 서버 설정을 수정했습니다. "
+            "그 결과 서버 장애를 해결할 수 있었고, 이후 분석 자동화를 도입했습니다."
+        ),
+        "expect_words": ["분석", "서버"],
+    },
+    {
+        # 조사처럼 끝나는 두 음절 명사(평가, 결과, 회의)를 쪼개지 않고,
+        # '하다'가 아닌 용언(나누며)을 명사로 잡지 않는지
+        "text": (
+            "프로젝트 결과 평가 회의에서 팀원들과 의견을 나누며 개선점을 찾았습니다. "
+            "중간 평가 결과 일정 지연이 가장 큰 문제였습니다. "
+            "평가 기준을 다시 세우고 매주 회의 결과를 공유했습니다. "
+            "동료들과 역할을 나누며 준비한 끝에 최종 회의 평가 결과 1위를 차지했습니다."
+        ),
+        "expect_words": ["평가", "결과", "회의"],
+        "reject_words": ["나누며"],
+    },
+]
+
+
+def check_fixtures(backend: str):
+    failures = []
+    for idx, fx in enumerate(FIXTURES):
+        tokenization.clear_cache()
+        words = analyze_repetition(fx["text"], backend=backend)["repeated_words"]
+        missing = [w for w in fx["expect_words"] if w not in words]
+        unexpected = [w for w in fx.get("reject_words", []) if w in words]
+        if missing or unexpected:
+            failures.append({"fixture": idx, "missing": missing, "unexpected": unexpected})
+    return failures
+
+
+def bench_backend(backend: str):
+    texts = [fx["text"] for fx in FIXTURES]
+    total_chars = sum(len(t) for t in texts) * ROUNDS
+
+    # 초기화 (Okt는 여기서 JVM 기동)
+    start = time.perf_counter()
+    tokenization.clear_cache()
+    tokenization.tokenize(texts[0], backend=backend)
+    init_ms = (time.perf_counter() - start) * 1000
+
+    # 단일 스레드 (캐시를 비워 매번 실제 분석)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        tokenization.clear_cache()
+        for t in texts:
+            tokenization.tokenize(t, backend=backend)
+    single = time.perf_counter() - start
+
+    # 멀티 스레드 (분석기 풀)
+    def work(_):
+        for t in texts:
+            tokenization._BACKENDS[backend](t)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as ex:
+        list(ex.map(work, range(ROUNDS)))
+    threaded = time.perf_counter() - start
+
+    return {
+        "init_ms": round(init_ms, 1),
+        "ms_per_essay": round(single / (ROUNDS * len(texts)) * 1000, 3),
+        "chars_per_sec": round(total_chars / single),
+        f"chars_per_sec_{THREADS}_threads": round(total_chars / threaded),
+    }
+
+
+def run_benchmark():
+    results = {}
+
+    for backend in tokenization.available_backends():
+        try:
+            stats = bench_backend(backend)
+        except Exception as e:
+            print(f"[{backend}] 사용 불가: {e}")
+            continue
+
+        stats["fixture_failures"] = check_fixtures(backend)
+        stats["passes_fixtures"] = not stats["fixture_failures"]
+        results[backend] = stats
+
+        print(
+            f"[{backend}] init {stats['init_ms']}ms | "
+            f"{stats['ms_per_essay']}ms/essay | "
+            f"{stats['chars_per_sec']} chars/s | "
+            f"fixtures {'통과' if stats['passes_fixtures'] else '실패'}"
+        )
+
+    passing = [b for b, st in results.items() if st["passes_fixtures"]]
+    recommended = min(passing, key=lambda b: results[b]["ms_per_essay"]) if passing else None
+
+    report = {"backends": results, "recommended": recommended}
+
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"\n추천 백엔드: {recommended}  (NLP_TOKENIZER_BACKEND={recommended})")
+    print(f"벤치마크 저장 완료 → {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
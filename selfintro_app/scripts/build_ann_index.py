@@ -0,0 +1,68 @@
+# selfintro_app/scripts/build_ann_index.py
+#
+# 직무 임베딩 / 카탈로그 키워드 어휘용 IVF(+PQ) 근사 최근접 이웃 인덱스 생성
+#
+# 1) 정규화된 직무 임베딩 인덱스(nlp.loaders), 키워드 카탈로그(nlp.keyword_catalog) 로드
+# 2) 구면 k-means로 nlist개 리스트 학습 (기본 sqrt(n)), PQ_M > 0 이면 PQ 코드로 압축
+# 3) data/job_ann_index.npz, data/keyword_ann_index.npz 로 저장 (nlp.ann_index에서 로드)
+#
+# 사용법: python build_ann_index.py [nprobe] [pq_m]
+#   예) python build_ann_index.py 8 0    → IVF-Flat, nprobe 8
+#       python build_ann_index.py 16 96  → IVF-PQ (768 / 96 = 8차원 부분 공간)
+# nprobe 선택은 bench_ann_index.py 결과(recall@K / 지연)를 보고 정한다.
+
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+PROJECT_ROOT = BASE_DIR.parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.ann_index import (  # noqa: E402
+    DEFAULT_NPROBE,
+    JOB_ANN_PATH,
+    KEYWORD_ANN_PATH,
+    IVFIndex,
+    save_ann_index,
+)
+from nlp.keyword_catalog import load_keyword_catalog  # noqa: E402
+from nlp.loaders import load_job_index  # noqa: E402
+
+
+def build_one(name, matrix, ids, path, nprobe, pq_m):
+    if len(ids) == 0:
+        print(f"[{name}] 벡터가 없어 건너뜀")
+        return
+
+    start = time.perf_counter()
+    index = IVFIndex.build(matrix, pq_m=pq_m, nprobe=nprobe, ids=ids)
+    elapsed = time.perf_counter() - start
+
+    save_ann_index(index, path)
+    size_kb = path.stat().st_size / 1024
+    kind = f"IVF-PQ(m={pq_m})" if index.uses_pq else "IVF-Flat"
+    print(
+        f"[{name}] {len(ids)}개 | {kind} nlist={index.nlist} nprobe={nprobe} | "
+        f"{elapsed:.1f}s | {size_kb:.1f}KB → {path}"
+    )
+
+
+def main():
+    nprobe = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NPROBE
+    pq_m = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    job_index = load_job_index()
+    build_one("직무", job_index.matrix, job_index.ids, JOB_ANN_PATH, nprobe, pq_m)
+
+    catalog = load_keyword_catalog()
+    if catalog is None:
+        print("keyword_catalog.npz 가 없어 키워드 인덱스는 건너뜁니다 (build_keyword_catalog.py 먼저 실행).")
+        return
+    build_one("키워드", catalog.matrix, catalog.vocab, KEYWORD_ANN_PATH, nprobe, pq_m)
+
+
+if __name__ == "__main__":
+    main()
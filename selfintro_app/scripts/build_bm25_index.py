@@ -0,0 +1,41 @@
+# selfintro_app/scripts/build_bm25_index.py
+#
+# 직무 설명(work_summary / skills / knowledge) BM25 역색인 생성
+#
+# 1) career_job_vectors.json 직무별 문서 구성
+# 2) 문자 n-gram(기본) 또는 형태소 토큰으로 용어 추출
+#    python build_bm25_index.py mecab  → mecab 백엔드 명사 토큰 사용
+# 3) CSR posting 배열 + 미리 계산한 BM25 항 가중치를 data/bm25_index.npz 로 저장
+#    (nlp.sparse_index에서 로드)
+
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+PROJECT_ROOT = BASE_DIR.parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.sparse_index import BM25_INDEX_PATH, build_bm25_index, save_bm25_index  # noqa: E402
+
+
+def main():
+    analyzer = sys.argv[1] if len(sys.argv) > 1 else "char"
+
+    start = time.perf_counter()
+    index = build_bm25_index(analyzer=analyzer)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(
+        f"[{analyzer}] 직무 {len(index)}개 | 용어 {len(index.terms)}개 | "
+        f"posting {len(index.posting_docs)}개 | {elapsed:.1f}ms"
+    )
+
+    save_bm25_index(index)
+    print(f"BM25 색인 저장 완료 → {BM25_INDEX_PATH}")
+
+
+if __name__ == "__main__":
+    main()
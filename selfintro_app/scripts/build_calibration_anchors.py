@@ -0,0 +1,77 @@
+# selfintro_app/scripts/build_calibration_anchors.py
+#
+# 직무·기업별 calibration anchor(low / mid / high) 생성
+#
+# 1) 참조 자소서 집합 로드 (data/reference_essays.json: 문자열 또는 {"text": ...} 리스트)
+#    - 파일이 없거나 MIN_REFERENCE_ESSAYS개 미만이면 anchor를 게시하지 않고 종료
+#      (다른 분포로 만든 anchor는 모든 적합도 점수를 바꾸므로 DEFAULT anchor를 유지한다)
+# 2) 전체 문장을 한 번에 임베딩 → 자소서별 평균 벡터 (report_builder와 같은 방식)
+# 3) (자소서 수, 직무 수) / (자소서 수, 기업 수) raw 코사인 행렬을 행렬곱 한 번씩으로 계산
+# 4) 대상별 10 / 50 / 90 분위수 → low / mid / high
+# 5) data/calibration_anchors.npz 로 저장 (nlp.calibration에서 로드)
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+PROJECT_ROOT = BASE_DIR.parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.calibration import (  # noqa: E402
+    ANCHOR_QUANTILES,
+    CALIBRATION_PATH,
+    REFERENCE_PATH,
+    AnchorTable,
+    derive_anchors,
+    load_reference_essays,
+    save_anchor_tables,
+)
+from nlp.embedding import embed_documents_mean  # noqa: E402
+from nlp.loaders import load_company_index, load_job_index  # noqa: E402
+from nlp.similarity import DEFAULT_ANCHOR  # noqa: E402
+
+# 분위수를 믿을 수 있는 최소 참조 자소서 수
+MIN_REFERENCE_ESSAYS = 20
+
+
+def build_anchor_tables():
+    essays = load_reference_essays()
+    if not essays:
+        print(f"{REFERENCE_PATH} 가 없어 anchor를 만들지 않습니다 (DEFAULT anchor 유지).")
+        sys.exit(1)
+
+    print(f"참조 자소서 {len(essays)}개 ({REFERENCE_PATH.name})")
+    if len(essays) < MIN_REFERENCE_ESSAYS:
+        print(f"참조 자소서가 {MIN_REFERENCE_ESSAYS}개 미만이라 anchor를 만들지 않습니다.")
+        sys.exit(1)
+
+    essay_matrix = embed_documents_mean(essays)
+
+    tables = {}
+    for kind, index in (("job", load_job_index()), ("company", load_company_index())):
+        sims = essay_matrix @ index.matrix.T
+        anchors = derive_anchors(sims)
+        tables[kind] = AnchorTable(index.ids, anchors)
+
+        print(
+            f"[{kind}] {len(index)}개 | "
+            f"low 중앙값 {np.median(anchors[:, 0]):.4f} / "
+            f"mid 중앙값 {np.median(anchors[:, 1]):.4f} / "
+            f"high 중앙값 {np.median(anchors[:, 2]):.4f} "
+            f"(DEFAULT {DEFAULT_ANCHOR['low']} / {DEFAULT_ANCHOR['mid']} / {DEFAULT_ANCHOR['high']})"
+        )
+
+    save_anchor_tables(
+        tables,
+        reference_count=len(essays),
+        quantiles=np.asarray(ANCHOR_QUANTILES),
+    )
+    print(f"anchor 테이블 저장 완료 → {CALIBRATION_PATH}")
+
+
+if __name__ == "__main__":
+    build_anchor_tables()
@@ -1,14 +1,17 @@
 import json
+import sys
 from pathlib import Path
-from sentence_transformers import SentenceTransformer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from nlp.artifacts import atomic_write  # noqa: E402
+from nlp.online_store import embed_records  # noqa: E402
 
 BASE_DIR = Path(__file__).resolve().parent / "data"
 
 INPUT_PATH = BASE_DIR / "career_job_vectors.json"
 OUTPUT_PATH = BASE_DIR / "career_job_vectors_embed.json"
 
-model = SentenceTransformer("jhgan/ko-sbert-multitask")
-
 def build_embeddings():
     print("career_job_vectors.json 로딩 중")
     with open(INPUT_PATH, "r", encoding="utf-8") as f:
@@ -16,29 +19,16 @@ def build_embeddings():
 
     print(f" 총 {len(jobs)}개 직업 임베딩 생성 시작")
 
-    results = []
-
-    for idx, job in enumerate(jobs, start=1):
-        job_cd = job.get("job_cd")
-        job_nm = job.get("job_nm")
-
-        merged_text = (
-            f"직업명: {job_nm}. "
-            f"설명: {job.get('work_summary', '')}. "
-            f"핵심능력: {', '.join(job.get('main_abilities', []))}. "
-            f"스킬: {', '.join(job.get('skills', []))}. "
-            f"지식요소: {', '.join(job.get('knowledge', []))}. "
-        )
-
-        print(f"[{idx}/{len(jobs)}] job_cd={job_cd} SBERT 임베딩 생성 중...")
-        embedding = model.encode(merged_text).tolist()
+    # online_store.append_record와 같은 병합 문장 · 같은 인코딩 (online_store.embed_records)
+    embeddings = embed_records("job", jobs)
 
-        results.append({
-            **job,
-            "embedding": embedding
-        })
+    results = [
+        {**job, "embedding": embedding.tolist()}
+        for job, embedding in zip(jobs, embeddings)
+    ]
 
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+    # 실행 중인 앱이 반쯤 쓴 파일을 읽지 않도록 임시 파일 → rename 으로 게시
+    with atomic_write(OUTPUT_PATH, "w", encoding="utf-8") as f:
         json.dump(results, f, ensure_ascii=False, indent=2)
 
     print(f"SBERT 임베딩 생성 완료 → {OUTPUT_PATH}")
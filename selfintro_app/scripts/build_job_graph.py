@@ -0,0 +1,49 @@
+# selfintro_app/scripts/build_job_graph.py
+#
+# 직무 × 기업 정합도 행렬 + 직무 최근접 이웃 그래프 생성
+#
+# 1) 정규화된 직무 / 기업 임베딩 인덱스 로드 (nlp.loaders)
+# 2) 직무 × 기업 raw 코사인 행렬 (행렬곱 한 번) → float16
+# 3) 직무 × 직무 유사도를 청크 단위로 계산해 직무별 top-K 이웃 → int32 위치 + float16 유사도
+# 4) data/job_graph.npz 로 저장 (nlp.job_graph에서 로드)
+#    - 임베딩 원본 서명을 함께 저장 → 원본이 다시 게시되면 로더가 낡은 그래프 대신 다시 계산
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+PROJECT_ROOT = BASE_DIR.parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.job_graph import JOB_GRAPH_PATH, NEIGHBOR_K, build_job_graph, graph_sources, save_job_graph  # noqa: E402
+from nlp.loaders import load_company_index, load_job_index  # noqa: E402
+
+
+def main():
+    # 로드 전에 원본 서명을 잡아 둔다 (빌드 중 원본이 다시 게시되면 다음 로드에서 다시 계산)
+    sources = graph_sources()
+    job_index = load_job_index()
+    company_index = load_company_index()
+    print(f"직무 {len(job_index)}개 × 기업 {len(company_index)}개, 이웃 K={NEIGHBOR_K}")
+
+    start = time.perf_counter()
+    graph = build_job_graph(job_index, company_index, k=NEIGHBOR_K, sources=sources)
+    print(f"계산 완료 ({(time.perf_counter() - start) * 1000:.1f}ms)")
+
+    # float16 저장 오차 확인
+    exact = job_index.matrix @ company_index.matrix.T
+    max_err = float(np.abs(exact - graph.alignment.astype(np.float32)).max()) if exact.size else 0.0
+    print(f"정합도 행렬 float16 최대 오차: {max_err:.5f}")
+
+    save_job_graph(graph)
+    size_kb = JOB_GRAPH_PATH.stat().st_size / 1024
+    print(f"그래프 저장 완료 → {JOB_GRAPH_PATH} ({size_kb:.1f}KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,15 @@
 # selfintro_app/scripts/build_job_vectors.py
 import json
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
+PROJECT_ROOT = BASE_DIR.parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.artifacts import atomic_write  # noqa: E402
 
 JOB_LIST_PATH = DATA_DIR / "career_job_list.json"
 JOB_DETAIL_PATH = DATA_DIR / "career_job_details.json"
@@ -107,7 +113,8 @@ def build_vectors():
 
     print(f" 변환 완료 : 직무 벡터 {len(results)}개 생성")
 
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+    # 실행 중인 앱이 반쯤 쓴 파일을 읽지 않도록 임시 파일 → rename 으로 게시
+    with atomic_write(OUTPUT_PATH, "w", encoding="utf-8") as f:
         json.dump(results, f, ensure_ascii=False, indent=2)
 
     print(f" 저장 완료 → {OUTPUT_PATH}")
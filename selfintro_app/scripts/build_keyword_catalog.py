@@ -0,0 +1,38 @@
+# selfintro_app/scripts/build_keyword_catalog.py
+#
+# 직무 카탈로그 전체 키워드 임베딩 행렬 생성 (카탈로그 단위 커버리지 랭킹용)
+#
+# 1) RAW 직무 데이터에서 직무별 Skills / Knowledge / Abilities 키워드 수집
+# 2) 고유 키워드만 한 번 임베딩 → 정규화 float32 행렬
+# 3) (직무, 그룹, 키워드) 항목 배열과 함께 data/keyword_catalog.npz 로 저장
+#    (nlp.keyword_catalog에서 로드)
+
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+PROJECT_ROOT = BASE_DIR.parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.keyword_catalog import KEYWORD_CATALOG_PATH, build_keyword_catalog, save_keyword_catalog  # noqa: E402
+
+
+def main():
+    start = time.perf_counter()
+    catalog = build_keyword_catalog()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"직무 {len(catalog)}개 | 키워드 항목 {len(catalog.entry_keyword)}개 | "
+        f"고유 키워드 {len(catalog.vocab)}개 | {elapsed:.1f}s"
+    )
+
+    save_keyword_catalog(catalog)
+    print(f"키워드 카탈로그 저장 완료 → {KEYWORD_CATALOG_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# selfintro_app/scripts/build_quantized_embeddings.py
+#
+# 직무 / 기업 / 키워드 임베딩의 압축 저장 변형(float16 / int8 / pca) 생성 + 정확도 리포트
+#
+# 1) float32 원본 로드 (career_job_vectors_embed.json, company_profiles_embed.json, keyword_catalog.npz)
+#    - 이미 만든 임베딩을 변환만 하므로 SBERT 재인코딩은 없다
+# 2) 형식별로 변환해 원본 옆에 <이름>.<형식>.npz 로 저장 (nlp.quantization)
+#    - pca는 투영 행렬(dim, r)을 같은 파일에 함께 저장
+#    - 원본 내용 서명도 함께 저장 → 원본을 다시 게시하면 로더는 이 변형 대신 원본을 쓴다
+# 3) 참조 자소서(data/reference_essays.json, nlp.calibration과 같은 집합)로
+#    형식별 raw 코사인 / 보정(calibrated) 적합도 점수 변화와 상위 직무 일치율 측정
+#    → data/quantization_report.json
+#    - 참조 자소서가 없으면 변형 파일과 크기만 기록하고 정확도 비교는 건너뛴다
+#
+# 사용법: python build_quantized_embeddings.py [형식 ...] (기본: float16 int8 pca)
+# 배포에서는 NLP_EMBED_STORAGE=<형식> 으로 변형을 사용한다.
+# 원본에서 변환해야 하므로 이 스크립트는 NLP_EMBED_STORAGE를 지정하지 않고 실행한다.
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+PROJECT_ROOT = BASE_DIR.parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.calibration import REFERENCE_PATH, calibrate_batch, load_reference_essays  # noqa: E402
+from nlp.embedding import embed_documents_mean  # noqa: E402
+from nlp.keyword_catalog import KEYWORD_CATALOG_PATH, load_keyword_catalog  # noqa: E402
+from nlp.loaders import (  # noqa: E402
+    COMPANY_EMBED_PATH,
+    JOB_EMBED_PATH,
+    load_company_index,
+    load_job_index,
+)
+from nlp.quantization import (  # noqa: E402
+    DEFAULT_PCA_DIM,
+    EMBED_STORAGE,
+    STORAGE_KINDS,
+    quantize,
+    quantized_path,
+    save_quantized,
+)
+
+REPORT_PATH = DATA_DIR / "quantization_report.json"
+
+DEFAULT_KINDS = ("float16", "int8", "pca")
+
+# 리포트에 쓸 최대 참조 자소서 수
+MAX_REPORT_ESSAYS = 200
+
+# 상위 직무 일치율 기준
+TOP_K = 10
+
+
+def top_k_overlap(exact: np.ndarray, approx: np.ndarray, k: int) -> float:
+    k = min(k, exact.shape[1])
+    if k == 0:
+        return 1.0
+    exact_top = np.argsort(-exact, axis=1)[:, :k]
+    approx_top = np.argsort(-approx, axis=1)[:, :k]
+    return float(np.mean([len(set(e) & set(a)) / k for e, a in zip(exact_top, approx_top)]))
+
+
+def compare(name, ids, matrix, store, queries, kind):
+    """원본 대비 raw 코사인 / 보정 점수 변화 (참조 자소서가 없으면 크기만)"""
+    row = {
+        "bytes": int(store.nbytes),
+        "compression": round(matrix.nbytes / max(store.nbytes, 1), 2),
+    }
+
+    if len(queries):
+        row.update(_accuracy(ids, matrix, store, queries, kind))
+
+    print(f"  [{name}] " + ", ".join(f"{k}={v}" for k, v in row.items()))
+    return row
+
+
+def _accuracy(ids, matrix, store, queries, kind):
+    exact = queries @ matrix.T
+    approx = store.scores(queries)
+
+    row = {
+        "raw_mean_abs_diff": round(float(np.abs(exact - approx).mean()), 5),
+        "raw_max_abs_diff": round(float(np.abs(exact - approx).max()), 5),
+    }
+
+    if kind is not None:
+        fit_exact = calibrate_batch(exact, ids, kind=kind)
+        fit_approx = calibrate_batch(approx, ids, kind=kind)
+        diff = np.abs(fit_exact - fit_approx)
+        row.update({
+            "fit_mean_abs_diff": round(float(diff.mean()), 3),
+            "fit_max_abs_diff": round(float(diff.max()), 3),
+            f"top{TOP_K}_overlap": round(top_k_overlap(exact, approx, TOP_K), 4),
+        })
+    return row
+
+
+def main():
+    if EMBED_STORAGE != "float32":
+        print(f"NLP_EMBED_STORAGE={EMBED_STORAGE} 로 설정되어 있습니다. 원본(float32) 기준으로 실행하세요.")
+        sys.exit(1)
+
+    kinds = sys.argv[1:] or list(DEFAULT_KINDS)
+    unknown = [k for k in kinds if k not in STORAGE_KINDS]
+    if unknown:
+        print(f"지원하지 않는 형식: {unknown} (가능: {STORAGE_KINDS})")
+        sys.exit(1)
+
+    job_index = load_job_index()
+    company_index = load_company_index()
+    catalog = load_keyword_catalog()
+
+    targets = [
+        ("job", job_index.ids, job_index.matrix, JOB_EMBED_PATH, "job"),
+        ("company", company_index.ids, company_index.matrix, COMPANY_EMBED_PATH, "company"),
+    ]
+    if catalog is not None:
+        targets.append(("keyword", catalog.vocab, catalog.matrix, KEYWORD_CATALOG_PATH, None))
+    else:
+        print("keyword_catalog.npz 가 없어 키워드 변형은 건너뜁니다 (build_keyword_catalog.py 먼저 실행).")
+
+    essays = load_reference_essays()[:MAX_REPORT_ESSAYS]
+    if essays:
+        print("참조 자소서 임베딩 중...")
+        queries = embed_documents_mean(essays)
+        print(f"참조 자소서 {len(queries)}개")
+    else:
+        print(f"{REFERENCE_PATH} 가 없어 정확도 비교는 건너뜁니다 (변형 파일만 생성).")
+        queries = np.zeros((0, 0), dtype=np.float32)
+
+    report = {"queries": len(queries), "pca_dim": DEFAULT_PCA_DIM, "variants": {}}
+    for kind in kinds:
+        print(f"\n[{kind}]")
+        report["variants"][kind] = {}
+
+        for name, ids, matrix, source_path, anchor_kind in targets:
+            if len(ids) == 0:
+                continue
+
+            store = quantize(matrix, kind)
+            out_path = quantized_path(source_path, kind)
+            save_quantized(store, ids, out_path, source=source_path)
+            print(f"  {name} {len(ids)}개 → {out_path.name} ({out_path.stat().st_size / 1024:.1f}KB)")
+
+            report["variants"][kind][name] = compare(name, ids, matrix, store, queries, anchor_kind)
+
+    with open(REPORT_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n정확도 리포트 저장 → {REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# selfintro_app/scripts/build_static_embeddings.py
+#
+# ko-sroberta-multitask → 정적 토큰 임베딩 테이블 증류 (실시간 미리보기용)
+#
+# 1) 직무 / 기업 / STAR·의미 라벨 예시 문장 코퍼스를 모델 토크나이저로 토큰화
+# 2) 코퍼스에 등장한 WordPiece 토큰 각각을 SBERT로 인코딩 → 토큰 벡터
+#    (빈도로 거르지 않는다 — 토큰마다 따로 인코딩하므로 한 번 나온 토큰도 벡터 품질이 같고,
+#     코퍼스 어휘가 작아 테이블 크기 부담도 없다)
+# 3) 코퍼스 빈도로 SIF 가중치 a / (a + p(token)) 계산
+# 4) data/static_embedding.npz 로 저장 (nlp.static_embedding에서 로드)
+
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+PROJECT_ROOT = BASE_DIR.parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.static_embedding import StaticEmbeddingModel, STATIC_MODEL_PATH, SUBWORD_PREFIX  # noqa: E402
+
+JOB_PATH = DATA_DIR / "career_job_vectors.json"
+COMPANY_PATH = DATA_DIR / "company_profiles.json"
+
+MODEL_NAME = "jhgan/ko-sroberta-multitask"
+
+# SIF 가중치 상수
+SIF_A = 1e-3
+
+
+def load_corpus():
+    """직무·기업·예시 문장 코퍼스 수집"""
+    texts = []
+
+    with open(JOB_PATH, "r", encoding="utf-8") as f:
+        jobs = json.load(f)
+    for job in jobs:
+        texts.append(job.get("job_nm") or "")
+        texts.append(job.get("work_summary") or "")
+        for field in ("main_abilities", "skills", "knowledge"):
+            texts.extend(job.get(field) or [])
+
+    with open(COMPANY_PATH, "r", encoding="utf-8") as f:
+        companies = json.load(f)
+    for c in companies:
+        for field in ("company_name", "industry", "summary", "values", "talent", "tech_keywords"):
+            texts.append(c.get(field) or "")
+
+    # STAR / 의미 라벨 예시 문장 (star_detector는 import 시 SBERT를 로드하므로 여기서 import)
+    from nlp.star_detector import S_examples, T_examples, A_examples, R_examples
+    from nlp.preprocessing import SEMANTIC_CANONICALS
+
+    texts.extend(S_examples + T_examples + A_examples + R_examples)
+    texts.extend(SEMANTIC_CANONICALS.values())
+
+    return [t for t in texts if t and t.strip()]
+
+
+def build_static_embeddings():
+    corpus = load_corpus()
+    print(f"코퍼스 문장 수: {len(corpus)}개")
+
+    model = SentenceTransformer(MODEL_NAME)
+    tokenizer = model.tokenizer
+
+    counter = Counter()
+    for text in corpus:
+        counter.update(tokenizer.tokenize(text))
+
+    tokens = [tok for tok in counter if tok not in tokenizer.all_special_tokens]
+    print(f"증류 대상 토큰 수: {len(tokens)}개")
+
+    # '##' 이어지는 토큰은 접두사를 떼고 그 조각 자체의 의미 벡터로 근사
+    surfaces = [tok[len(SUBWORD_PREFIX):] if tok.startswith(SUBWORD_PREFIX) else tok for tok in tokens]
+    table = model.encode(surfaces, batch_size=256, convert_to_numpy=True, show_progress_bar=True)
+
+    total = sum(counter[tok] for tok in tokens)
+    weights = np.array(
+        [SIF_A / (SIF_A + counter[tok] / total) for tok in tokens],
+        dtype=np.float32,
+    )
+
+    static_model = StaticEmbeddingModel(tokens, table, weights)
+    static_model.save(STATIC_MODEL_PATH)
+
+    print(f"정적 임베딩 저장 완료 → {STATIC_MODEL_PATH}")
+
+
+if __name__ == "__main__":
+    build_static_embeddings()
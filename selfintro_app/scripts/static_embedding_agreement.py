@@ -0,0 +1,111 @@
+# selfintro_app/scripts/static_embedding_agreement.py
+#
+# 정적 임베딩(미리보기) vs SBERT(전체 모델) 일치도 리포트
+#
+# 평가 문장: 직무 work_summary 문장 + STAR 예시 문장
+# 비교 항목:
+#   - 문장 × 직무 raw 코사인 유사도의 Pearson / Spearman 상관
+#   - 문장별 top-1 직무 일치율, top-10 직무 겹침 비율
+#   - calibration 후 적합도 점수 평균 절대 오차
+#   - 문장당 인코딩 시간
+# 결과: data/static_embedding_agreement.json
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+PROJECT_ROOT = BASE_DIR.parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlp.embedding import embed_sentences, DEFAULT_MODEL_NAME, STATIC_MODEL_NAME  # noqa: E402
+from nlp.loaders import load_job_index, load_raw_job_vectors  # noqa: E402
+from nlp.preprocessing import split_sentences  # noqa: E402
+from nlp.similarity import DEFAULT_ANCHOR, calibrate_scores, cosine_scores  # noqa: E402
+
+OUTPUT_PATH = DATA_DIR / "static_embedding_agreement.json"
+
+MAX_EVAL_SENTENCES = 500
+TOP_K = 10
+
+
+def load_eval_sentences():
+    from nlp.star_detector import S_examples, T_examples, A_examples, R_examples
+
+    sents = S_examples + T_examples + A_examples + R_examples
+    for job in load_raw_job_vectors().values():
+        sents.extend(split_sentences(job.get("work_summary") or ""))
+        if len(sents) >= MAX_EVAL_SENTENCES:
+            break
+    return sents[:MAX_EVAL_SENTENCES]
+
+
+def rankdata(x: np.ndarray) -> np.ndarray:
+    ranks = np.empty(len(x), dtype=float)
+    ranks[np.argsort(x)] = np.arange(len(x))
+    return ranks
+
+
+def timed_encode(sentences, model_name):
+    start = time.perf_counter()
+    embs = embed_sentences(sentences, model_name=model_name)
+    return embs, (time.perf_counter() - start) / max(len(sentences), 1) * 1e6
+
+
+def build_agreement_report():
+    sentences = load_eval_sentences()
+    job_matrix = load_job_index().matrix
+    print(f"평가 문장 {len(sentences)}개 × 직무 {len(job_matrix)}개")
+
+    full_embs, full_us = timed_encode(sentences, DEFAULT_MODEL_NAME)
+    static_embs, static_us = timed_encode(sentences, STATIC_MODEL_NAME)
+
+    full_sims = cosine_scores(full_embs, job_matrix)
+    static_sims = cosine_scores(static_embs, job_matrix)
+
+    flat_full = full_sims.ravel()
+    flat_static = static_sims.ravel()
+
+    pearson = float(np.corrcoef(flat_full, flat_static)[0, 1])
+    spearman = float(np.corrcoef(rankdata(flat_full), rankdata(flat_static))[0, 1])
+
+    top1 = float(np.mean(full_sims.argmax(axis=1) == static_sims.argmax(axis=1)))
+
+    full_topk = np.argsort(-full_sims, axis=1)[:, :TOP_K]
+    static_topk = np.argsort(-static_sims, axis=1)[:, :TOP_K]
+    overlap = float(np.mean([
+        len(set(f) & set(s)) / TOP_K for f, s in zip(full_topk, static_topk)
+    ]))
+
+    score_err = float(np.mean(np.abs(
+        calibrate_scores(flat_full, **DEFAULT_ANCHOR) - calibrate_scores(flat_static, **DEFAULT_ANCHOR)
+    )))
+
+    report = {
+        "num_sentences": len(sentences),
+        "num_jobs": int(len(job_matrix)),
+        "pearson": round(pearson, 4),
+        "spearman": round(spearman, 4),
+        "top1_agreement": round(top1, 4),
+        f"top{TOP_K}_overlap": round(overlap, 4),
+        "calibrated_score_mae": round(score_err, 2),
+        "encode_us_per_sentence": {
+            "sbert": round(full_us, 1),
+            "static": round(static_us, 1),
+        },
+    }
+
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    print(f"일치도 리포트 저장 완료 → {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    build_agreement_report()
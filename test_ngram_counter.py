@@ -0,0 +1,93 @@
+"""
+test_ngram_counter.py
+
+단일 패스 n-gram 카운터(nlp.ngram_counter)가 기존 방식
+(차수별로 " ".join 문자열 n-gram을 만들어 Counter로 세기)과 같은 결과를 내는지 확인하는 스크립트.
+샘플 자기소개서와 무작위 토큰열에서 구절, 등장 횟수, 반환 순서를 모두 비교한다.
+"""
+
+import random
+from collections import Counter
+
+from nlp.ngram_counter import count_repeated_ngrams
+
+
+# ----------------------------------------
+# 1) 기존 방식 (repetition_detector.detect_repeated_phrases 원래 구현)
+# ----------------------------------------
+def baseline_repeated_ngrams(tokens, threshold=2):
+    phrase_counter = Counter()
+    for n in range(2, 5):  # 2~4 gram
+        for i in range(len(tokens) - n + 1):
+            phrase_counter[" ".join(tokens[i:i + n])] += 1
+
+    return {
+        phrase: cnt for phrase, cnt in phrase_counter.items()
+        if cnt >= threshold
+    }
+
+
+# ----------------------------------------
+# 2) 샘플 자기소개서
+# ----------------------------------------
+essays = [
+    """
+    저는 대학 시절 팀 프로젝트를 통해 협업의 중요성을 배웠습니다.
+    팀 프로젝트에서 팀장을 맡아 일정 관리와 역할 분담을 주도했습니다.
+    일정 관리와 역할 분담을 통해 프로젝트를 기한 내에 마칠 수 있었습니다.
+    저는 이 경험을 통해 협업의 중요성을 다시 한번 배웠습니다.
+    """,
+    """
+    고객 상담 업무를 하며 고객의 불편 사항을 빠르게 파악했습니다.
+    고객의 불편 사항을 정리해 매뉴얼을 만들었고, 상담 시간을 줄였습니다.
+    상담 시간을 줄인 경험은 문제 해결 능력을 키우는 계기가 되었습니다.
+    """,
+    "",
+    "반복 없음",
+]
+
+# 형태소 분석기 없이도 돌도록 공백 토큰 + 2글자 이상 필터 (detect_repeated_phrases와 같은 필터)
+for idx, essay in enumerate(essays):
+    tokens = [t for t in essay.split() if len(t) > 1]
+    for threshold in (1, 2, 3):
+        expected = baseline_repeated_ngrams(tokens, threshold)
+        actual = count_repeated_ngrams(tokens, min_n=2, max_n=4, threshold=threshold)
+        assert list(actual.items()) == list(expected.items()), (idx, threshold, expected, actual)
+
+    print(f"[TEST] 샘플 {idx}: 토큰 {len(tokens)}개, 반복 구절 {len(count_repeated_ngrams(tokens))}개 일치")
+
+
+# ----------------------------------------
+# 3) 무작위 토큰열 (어휘 수 / 길이 / threshold 조합)
+# ----------------------------------------
+rng = random.Random(0)
+for trial in range(500):
+    vocab_size = rng.randint(1, 40)
+    tokens = [f"w{rng.randrange(vocab_size)}" for _ in range(rng.randint(0, 80))]
+    threshold = rng.randint(1, 3)
+
+    expected = baseline_repeated_ngrams(tokens, threshold)
+    actual = count_repeated_ngrams(tokens, threshold=threshold)
+    assert list(actual.items()) == list(expected.items()), (tokens, threshold)
+
+print("[TEST] 무작위 토큰열 500개: 구절 / 횟수 / 순서 모두 일치")
+
+
+# ----------------------------------------
+# 4) suppress_subsumed: 빠진 구절은 같은 횟수의 더 긴 반복 구절에 포함되어 있어야 한다
+# ----------------------------------------
+tokens = [t for t in essays[0].split() if len(t) > 1]
+full = count_repeated_ngrams(tokens)
+kept = count_repeated_ngrams(tokens, suppress_subsumed=True)
+
+assert set(kept) <= set(full)
+for phrase in set(full) - set(kept):
+    assert any(
+        len(longer.split()) > len(phrase.split())
+        and f" {phrase} " in f" {longer} "
+        and full[longer] == full[phrase]
+        for longer in kept
+    ), phrase
+
+print(f"[TEST] suppress_subsumed: {len(full)}개 → {len(kept)}개")
+print("\n===== ngram_counter OK =====")
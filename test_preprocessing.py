@@ -0,0 +1,96 @@
+"""
+test_preprocessing.py
+
+정제 단계 최적화(nlp.preprocessing)가 기존 결과를 바꾸지 않았는지 확인하는 스크립트.
+
+- clean_fast  == clean_basic → enforce_sentence_end → remove_noise
+- compile_rules(NORMALIZATION_RULES) == 규칙마다 re.sub을 차례로 적용하던 기존 방식
+샘플 자기소개서(Word 복붙 공백, 줄바꿈, 특수문자 포함)와 무작위 조각 조합에서 비교한다.
+"""
+
+import random
+import re
+
+from nlp.preprocessing import (
+    NORMALIZATION_RULES,
+    clean_basic,
+    clean_fast,
+    compile_rules,
+    enforce_sentence_end,
+    normalize_text_rule_based,
+    remove_noise,
+)
+
+
+# ----------------------------------------
+# 1) 기존 방식
+# ----------------------------------------
+def baseline_clean(text):
+    return remove_noise(enforce_sentence_end(clean_basic(text)))
+
+
+def baseline_normalize(text):
+    # 원래 normalize_text_rule_based: 규칙을 순서대로 re.sub
+    rules = [
+        (r"하였습니다", "했습니다"),
+        (r"하였다", "했다"),
+        (r"해결함으로써", "해결하여"),
+        (r"수행하였습니다", "수행했습니다"),
+    ]
+    for pattern, repl in rules:
+        text = re.sub(pattern, repl, text)
+    return text
+
+
+# ----------------------------------------
+# 2) 샘플 자기소개서
+# ----------------------------------------
+essays = [
+    """
+    저는 대학 시절&nbsp;팀 프로젝트를 수행하였습니다.\r\n\r\n
+    문제 해결
+    데이터를 분석하여 원인을 찾았고, 해결함으로써 일정을 지켰습니다!
+    """,
+    "고객 상담(CS) 업무를 담당하였다 → 만족도 ★ 20% 향상…\n\n\t“감사합니다”라는 말을 들었습니다?",
+    "Spring Boot & MySQL 기반 REST API 설계 — 장애 대응 경험 (2023.03~2023.08)",
+    "",
+    "   \n\n  ",
+]
+
+for idx, essay in enumerate(essays):
+    expected = baseline_clean(essay)
+    actual = clean_fast(essay)
+    assert actual == expected, (idx, expected, actual)
+    assert normalize_text_rule_based(actual) == baseline_normalize(expected), idx
+
+    print(f"[TEST] 샘플 {idx}: {actual[:40]!r}")
+
+
+# ----------------------------------------
+# 3) 무작위 조각 조합 (HTML 공백, 개행, 전각/특수 공백, 이모지, 규칙 경계 포함)
+# ----------------------------------------
+pieces = [
+    "하였습니다", "하였다", "해결함으로써", "수행하였습니다", "수행", "하였", "습니다", "함으로써",
+    "&nbsp;", "&emsp;", "&ensp;", "\r", "\n", "\n\n", " ", "\t", "　", "\xa0", "\x1c",
+    "가", "a", "Z", "9", ".", ",", "!", "?", "'", "“", "-", "·", "é", "😀",
+]
+
+rng = random.Random(0)
+for trial in range(20000):
+    text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 25)))
+
+    assert clean_fast(text) == baseline_clean(text), repr(text)
+    assert normalize_text_rule_based(text) == baseline_normalize(text), repr(text)
+
+print("[TEST] 무작위 텍스트 20000개: clean_fast / 규칙 정규화 모두 일치")
+
+
+# ----------------------------------------
+# 4) compile_rules: 긴 규칙 우선, 중복 규칙은 처음 것 유지
+# ----------------------------------------
+replace = compile_rules(NORMALIZATION_RULES + [("하였습니다", "무시됨")])
+assert replace("수행하였습니다") == "수행했습니다"
+assert replace("노력하였습니다") == "노력했습니다"
+assert compile_rules([])("그대로") == "그대로"
+
+print("\n===== preprocessing OK =====")
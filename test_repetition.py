@@ -0,0 +1,69 @@
+"""
+test_repetition.py
+
+의미상 중복 문장 탐지의 LSH 경로가 전체 비교(exact)와 같은 쌍을 찾는지 확인하는 스크립트.
+SBERT처럼 평균이 0이 아닌 합성 임베딩에 threshold 바로 위 유사도의 쌍을 심어
+_near_duplicate_pairs_lsh 의 recall을 _near_duplicate_pairs_exact 기준으로 측정한다.
+"""
+
+import numpy as np
+
+from nlp.repetition_detector import (
+    LSH_TARGET_RECALL,
+    NEAR_DUPLICATE_THRESHOLD,
+    _near_duplicate_pairs_exact,
+    _near_duplicate_pairs_lsh,
+    detect_semantic_duplicates,
+)
+
+# ----------------------------------------
+# 1) 합성 문장 임베딩 (공통 평균 방향 + 심어 둔 근접 중복 쌍)
+# ----------------------------------------
+rng = np.random.default_rng(0)
+dim, n_base, n_pairs = 768, 400, 200
+mean_norm, pair_cos = 0.6, 0.86
+
+mu = rng.standard_normal(dim)
+mu /= np.linalg.norm(mu)
+base = rng.standard_normal((n_base, dim))
+base /= np.linalg.norm(base, axis=1, keepdims=True)
+base = mean_norm * mu + np.sqrt(1 - mean_norm ** 2) * base
+base /= np.linalg.norm(base, axis=1, keepdims=True)
+
+partners = []
+for i in range(n_pairs):
+    r = rng.standard_normal(dim)
+    r -= (r @ base[i]) * base[i]
+    r /= np.linalg.norm(r)
+    partners.append(pair_cos * base[i] + np.sqrt(1 - pair_cos ** 2) * r)
+
+unit = np.vstack([base, partners]).astype(np.float32)
+print(f"[TEST] 문장 {len(unit)}개, 심어 둔 쌍 {n_pairs}개 (코사인 {pair_cos})")
+
+# ----------------------------------------
+# 2) exact vs LSH
+# ----------------------------------------
+rows, cols, _ = _near_duplicate_pairs_exact(unit, NEAR_DUPLICATE_THRESHOLD)
+exact_pairs = set(zip(rows.tolist(), cols.tolist()))
+
+recalls = []
+for seed in range(5):
+    rows, cols, sims = _near_duplicate_pairs_lsh(unit, NEAR_DUPLICATE_THRESHOLD, seed=seed)
+    lsh_pairs = set(zip(rows.tolist(), cols.tolist()))
+    assert lsh_pairs <= exact_pairs, "LSH가 threshold 미만 쌍을 반환"
+    assert (sims >= NEAR_DUPLICATE_THRESHOLD).all()
+    recalls.append(len(lsh_pairs) / len(exact_pairs))
+
+recall = float(np.mean(recalls))
+print(f"exact {len(exact_pairs)}쌍 | LSH 평균 recall {recall:.3f} (목표 {LSH_TARGET_RECALL})")
+assert recall >= LSH_TARGET_RECALL - 0.02, "LSH recall이 목표보다 낮음"
+
+# ----------------------------------------
+# 3) 클러스터 결과 비교
+# ----------------------------------------
+sentences = [f"문장 {i}" for i in range(len(unit))]
+exact_clusters = detect_semantic_duplicates(sentences, unit, use_lsh=False)
+lsh_clusters = detect_semantic_duplicates(sentences, unit, use_lsh=True)
+print(f"클러스터 exact {len(exact_clusters)}개 / LSH {len(lsh_clusters)}개")
+
+print("\n===================================")